@@ -27,7 +27,7 @@ import traceback
 import pickle
 
 # PyQt imports
-from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication, Qt, pyqtSignal, QVariant
+from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication, Qt, pyqtSignal
 from qgis.PyQt.QtGui import QIcon, QColor
 from qgis.PyQt.QtWidgets import (
     QAction, QFileDialog, QMessageBox, QTableWidgetItem, 
@@ -37,8 +37,7 @@ from qgis.PyQt.QtWidgets import (
 # QGIS Core imports - modern pattern
 from qgis.core import (
     QgsProject, QgsRasterLayer, QgsVectorLayer, QgsPointXY, QgsGeometry, 
-    QgsFeature, QgsField, QgsCoordinateReferenceSystem, QgsSymbol,
-    QgsSingleSymbolRenderer, QgsMarkerSymbol, QgsCoordinateTransform,
+    QgsCoordinateReferenceSystem, QgsSymbol, QgsCoordinateTransform,
     QgsRectangle, QgsRasterDataProvider, QgsRaster, QgsWkbTypes,
     QgsApplication, QgsSettings, QgsRasterIdentifyResult
 )
@@ -47,23 +46,12 @@ from qgis.core import (
 from qgis.gui import QgsMapToolEmitPoint
 from qgis.utils import iface
 
-# Plugin resources and dialogs
+# Plugin resources
 from .resources import *
-from .flood_prediction_plugin_dialog import FloodPredictionPluginDialog
-from .point_tool import PointTool
-
-# Try to import optional libraries
-try:
-    import numpy as np
-    HAS_NUMPY = True
-except ImportError:
-    HAS_NUMPY = False
-    
-try:
-    import pandas as pd
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
+from .prediction_layer import PredictionLayer
+
+# The dialog, the point tool and optional libraries (numpy) are imported
+# lazily where they are first needed so they do not slow down QGIS startup.
 
 
 class FloodPredictionPlugin:
@@ -109,7 +97,9 @@ class FloodPredictionPlugin:
         self.scaler = None
         self.feature_names = None
         self.model_info = None
-        self.result_layer = None
+        self.result_layer = PredictionLayer()  # Persistent layer of selected/predicted points
+        self.result_point_id = None  # Feature id of the selected point in result_layer
+        self.result_point_predicted = False
 
     # noinspection PyMethodMayBeStatic
     def tr(self, message):
@@ -225,6 +215,7 @@ class FloodPredictionPlugin:
         # Only create GUI ONCE in callback, so that it will only load when the plugin is started
         if self.first_start == True:
             self.first_start = False
+            from .flood_prediction_plugin_dialog import FloodPredictionPluginDialog
             self.dlg = FloodPredictionPluginDialog()
             
             # Connect signals
@@ -250,6 +241,7 @@ class FloodPredictionPlugin:
         """Activate point selection tool"""
         try:
             if not self.point_tool:
+                from .point_tool import PointTool
                 self.point_tool = PointTool(self.iface.mapCanvas())
                 self.point_tool.point_selected.connect(self.on_point_selected)
             
@@ -274,44 +266,17 @@ class FloodPredictionPlugin:
             QMessageBox.critical(self.dlg, "Error", f"Failed to process selected point: {str(e)}")
 
     def create_point_visualization(self, point):
-        """Create a visual representation of the selected point"""
+        """Show the selected point on the persistent results layer"""
         try:
-            # Remove existing result layer
-            if self.result_layer:
-                QgsProject.instance().removeMapLayer(self.result_layer)
-            
-            # Create new point layer
-            crs = self.iface.mapCanvas().mapSettings().destinationCrs().authid()
-            self.result_layer = QgsVectorLayer(f'Point?crs={crs}', 'Selected Point', 'memory')
-            
-            provider = self.result_layer.dataProvider()
-            provider.addAttributes([
-                QgsField('x_coord', QVariant.Double),
-                QgsField('y_coord', QVariant.Double),
-                QgsField('prediction', QVariant.String),
-                QgsField('probability', QVariant.Double)
-            ])
-            self.result_layer.updateFields()
-            
-            # Add point feature
-            feature = QgsFeature()
-            feature.setGeometry(QgsGeometry.fromPointXY(point))
-            feature.setAttributes([point.x(), point.y(), 'Not predicted', 0.0])
-            provider.addFeature(feature)
-            
-            # Style the point
-            symbol = QgsMarkerSymbol.createSimple({
-                'name': 'circle',
-                'color': 'red',
-                'size': '6',
-                'outline_color': 'black',
-                'outline_width': '1'
-            })
-            renderer = QgsSingleSymbolRenderer(symbol)
-            self.result_layer.setRenderer(renderer)
-            
-            # Add to map
-            QgsProject.instance().addMapLayer(self.result_layer)
+            crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+            
+            # Move a selection that has no prediction yet, keep predicted points
+            if (self.result_point_id is not None and not self.result_point_predicted
+                    and self.result_layer.move_point(self.result_point_id, point, crs)):
+                return
+            
+            self.result_point_id = self.result_layer.add_points([point], crs)[0]
+            self.result_point_predicted = False
             
         except Exception as e:
             QMessageBox.warning(self.dlg, "Warning", f"Could not create point visualization: {str(e)}")
@@ -475,6 +440,7 @@ class FloodPredictionPlugin:
                             self.dlg.tableWidget_data.setItem(row, 2, feature_item)
                             # Value column - read only
                             value_item = QTableWidgetItem(f"{value:.6f}")
+                            value_item.setData(Qt.UserRole, float(value))  # Full precision for the prediction
                             value_item.setFlags(value_item.flags() & ~Qt.ItemIsEditable)
                             self.dlg.tableWidget_data.setItem(row, 3, value_item)
                             row += 1
@@ -506,6 +472,7 @@ class FloodPredictionPlugin:
                             self.dlg.tableWidget_data.setItem(row, 2, feature_item)
                             # Value column - read only
                             value_item = QTableWidgetItem(str(value))
+                            value_item.setData(Qt.UserRole, value)
                             value_item.setFlags(value_item.flags() & ~Qt.ItemIsEditable)
                             self.dlg.tableWidget_data.setItem(row, 3, value_item)
                             row += 1
@@ -728,11 +695,14 @@ class FloodPredictionPlugin:
                 
                 if feature_name_item and value_item:
                     feature_name = feature_name_item.text().strip()
-                    value_text = value_item.text().strip()
+                    # Value as extracted, not the rounded text shown in the table
+                    raw_value = value_item.data(Qt.UserRole)
+                    if raw_value is None:
+                        raw_value = value_item.text().strip()
                     
                     # Convert value to numeric
                     try:
-                        value = float(value_text)
+                        value = float(raw_value)
                         features_dict[feature_name] = value
                         features.append(value)
                         feature_names.append(feature_name)
@@ -749,9 +719,10 @@ class FloodPredictionPlugin:
             print(f"Using features: {features_dict}")
             
             # Convert to format expected by model
-            if HAS_NUMPY:
+            try:
+                import numpy as np
                 features_array = np.array(features).reshape(1, -1)
-            else:
+            except ImportError:
                 # Use nested list format for sklearn models when numpy not available
                 features_array = [features]
             
@@ -778,25 +749,10 @@ class FloodPredictionPlugin:
             self.dlg.label_prediction_result.setText(f"Prediction: {prediction_text}")
             self.dlg.label_probability.setText(f"Flood Probability: {flood_probability:.4f}")
             
-            # Update visualization
-            if self.result_layer:
-                feature = next(self.result_layer.getFeatures())
-                self.result_layer.dataProvider().changeAttributeValues({
-                    feature.id(): {2: prediction_text, 3: flood_probability}
-                })
-                
-                # Update symbol color based on prediction
-                color = 'red' if prediction == 1 else 'green'
-                symbol = QgsMarkerSymbol.createSimple({
-                    'name': 'circle',
-                    'color': color,
-                    'size': str(6 + flood_probability * 4),  # Size based on probability
-                    'outline_color': 'black',
-                    'outline_width': '1'
-                })
-                renderer = QgsSingleSymbolRenderer(symbol)
-                self.result_layer.setRenderer(renderer)
-                self.result_layer.triggerRepaint()
+            # Update visualization: colour and size follow the probability field
+            if self.result_point_id is not None:
+                self.result_layer.set_predictions({self.result_point_id: (prediction_text, flood_probability)})
+                self.result_point_predicted = True
             
             # Show detailed info about features used
             features_summary = f"Used {len(features)} features: {', '.join(feature_names[:3])}{'...' if len(feature_names) > 3 else ''}"
@@ -820,10 +776,10 @@ class FloodPredictionPlugin:
             self.dlg.label_prediction_result.setText("Prediction: Not available")
             self.dlg.label_probability.setText("Probability: Not available")
             
-            # Remove visualization layer
-            if self.result_layer:
-                QgsProject.instance().removeMapLayer(self.result_layer)
-                self.result_layer = None
+            # Remove all points; the layer and its style are kept for reuse
+            self.result_layer.clear()
+            self.result_point_id = None
+            self.result_point_predicted = False
             
             # Clear extracted data
             if hasattr(self, 'extracted_data'):
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ FloodPredictionPluginV2 core
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Prediction core of the plugin. Modules in this package work on NumPy arrays
+ and file paths only and never touch Qt widgets, so they can be used from the
+ dialog, from background tasks and from scripts alike.
+"""
@@ -0,0 +1,650 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Area prediction
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Whole-raster flood prediction, tile by tile.
+
+ For every tile the feature cube is read once, the model is called once and
+ the probability and class rasters are written from the same probabilities.
+ With a ModelEnsemble every model is evaluated on that same tile and the
+ probability raster gets one band per ensemble output. For RandomForest-style
+ models the same tree traversal also yields tree-spread uncertainty bands.
+
+ Tiles can be predicted in the calling process or in a pool of worker
+ processes. Pure-Python model code (sklearn SVM, MLP, ...) holds the GIL, so
+ threads do not scale; worker processes do. Every worker loads the model
+ once, and feature tiles and results travel through shared memory slots:
+ the main process reads tile N+1 while workers predict tiles N-k..N.
+ In the calling process, reading, predicting and writing run as a pipeline
+ of threads with bounded queues (see core.pipeline). Either way only a fixed
+ number of tiles is in memory, which can be capped with ``memory_limit``.
+
+ Outputs are tiled GeoTIFFs or, on request, Cloud-Optimized GeoTIFFs whose
+ overviews are built from the same tiles while they are written (see
+ core.cog). Probabilities can be stored as float32 or quantized to uint8.
+
+ Incremental runs keep a manifest of per-tile input fingerprints next to the
+ output (see core.manifest). When no input file changed size or
+ modification time, a rerun copies every tile from the previous output
+ without reading the inputs. Otherwise each tile is hashed as the pipeline
+ reads it: unchanged tiles are copied from the previous output and changed
+ tiles are predicted from the features already read, so no tile is read
+ twice. If such a run fails or is canceled the previous outputs are put
+ back. Checkpointed runs
+ flush the outputs and the manifest's tile completion bitmap every
+ CHECKPOINT_SECONDS; after a cancel or a crash the same call continues with
+ the missing tiles and produces the same pixels as an uninterrupted run.
+
+ ``feedback`` arguments follow the QgsFeedback / QgsTask interface
+ (``setProgress(percent)`` and ``isCanceled()``) without importing QGIS, so
+ a QgsTask, a QgsProcessingFeedback or any small object with those two
+ methods can be passed.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+from osgeo import gdal
+
+from .cog import QUANTIZED_MAX, QUANTIZED_NODATA, TiledRasterWriter, quantize_probability, writer_target
+from .ensemble import ModelEnsemble, load_predictor
+from .inference import DEFAULT_THRESHOLD, PROBABILITY_NODATA, CLASS_NODATA, predict_block
+from .manifest import (STATE_CANCELED, STATE_COMPLETE, STATE_RUNNING, TileManifest, input_stamps,
+                       manifest_path_for, model_fingerprint, settings_fingerprint, tile_fingerprint)
+from .parallel import SharedBuffer, process_pool, slot_view
+from .pipeline import DEFAULT_DEPTH, PREDICT_DEPTH, TileGauge, pipeline_depth, pipelined, worker_slots
+from .profiling import StageTimer
+from .raster import iter_windows, open_raster
+from .tiling import model_scratch_per_pixel, plan_tile_size
+from .uncertainty import UNCERTAINTY_BAND_NAMES, predict_block_with_uncertainty, supports_tree_uncertainty
+
+# Default tile edge in pixels for tile loops without a planner (area
+# prediction plans its tiles, see core.tiling)
+DEFAULT_TILE_SIZE = 512
+
+# Tiles in flight per worker process: one being predicted, one being read
+SLOTS_PER_WORKER = 2
+
+# Seconds between checkpoints of a resumable job (flush outputs, save bitmap)
+CHECKPOINT_SECONDS = 30.0
+
+
+def is_canceled(feedback):
+    """True if ``feedback`` exists and reports cancellation"""
+    return feedback is not None and feedback.isCanceled()
+
+
+def report_progress(feedback, done, total):
+    """Report ``done`` out of ``total`` steps as a percentage"""
+    if feedback is not None and total:
+        feedback.setProgress(100.0 * done / total)
+
+
+def output_band_names(model, uncertainty=False):
+    """Descriptions of the probability raster bands produced for ``model``"""
+    if isinstance(model, ModelEnsemble):
+        return model.band_names()
+    if uncertainty:
+        return ['flood_probability'] + UNCERTAINTY_BAND_NAMES
+    return ['flood_probability']
+
+
+def predict_tile(model, features, valid_mask, threshold, uncertainty=False):
+    """Predict one tile.
+
+    :returns: Tuple (bands, labels): float32 (n_bands, rows, cols) and uint8
+        (rows, cols), see output_band_names().
+    :rtype: tuple
+    """
+    if isinstance(model, ModelEnsemble):
+        return model.evaluate_block(features, valid_mask, threshold)
+    if uncertainty:
+        return predict_block_with_uncertainty(model, features, valid_mask, threshold)
+    probability, labels = predict_block(model, features, valid_mask, threshold)
+    return probability[np.newaxis], labels
+
+
+def _iter_serial(model, stack, windows, threshold, uncertainty, depth=DEFAULT_DEPTH, timer=None, reuse=None,
+                 gauge=None):
+    """Yield (window, bands, labels, valid_pixels) predicted in this process.
+
+    A reader thread runs up to ``depth`` tiles ahead of a predictor thread,
+    which runs PREDICT_DEPTH tiles ahead of the consumer, which writes; see
+    core.pipeline. Tile reads and model calls are timed as 'area.read' and
+    'area.predict' on ``timer``. ``gauge`` counts a tile from the start of
+    its read until the consumer asks for the next one.
+
+    ``reuse(window, features)`` is called in the reader thread; for tiles it
+    accepts, (window, None, None, None) is yielded instead of a prediction.
+    """
+    timer = timer or StageTimer()
+
+    def read(window):
+        if gauge is not None:
+            gauge.enter()
+        with timer.span('area.read'):
+            features, valid_mask = stack.read_window(*window)
+        if reuse is not None and reuse(window, features):
+            return window, None, None
+        return window, features, valid_mask
+
+    def predict(tile):
+        window, features, valid_mask = tile
+        if features is None:
+            return window, None, None, None
+        with timer.span('area.predict'):
+            bands, labels = predict_tile(model, features, valid_mask, threshold, uncertainty)
+        return window, bands, labels, int(valid_mask.sum())
+
+    tiles = pipelined(windows, read, depth, 'flood-read')
+    for result in pipelined(tiles, predict, PREDICT_DEPTH, 'flood-predict'):
+        yield result
+        if gauge is not None:
+            gauge.leave()
+
+
+# Worker-process state set by _init_tile_worker
+_tile_worker = {}
+
+
+def _init_tile_worker(model_paths, feature_spec, band_spec, label_spec):
+    """Worker initializer: load the model once and attach the shared slots"""
+    _tile_worker['model'] = load_predictor(model_paths)
+    _tile_worker['features'] = SharedBuffer.attach(feature_spec)
+    _tile_worker['bands'] = SharedBuffer.attach(band_spec)
+    _tile_worker['labels'] = SharedBuffer.attach(label_spec)
+
+
+def _predict_tile_slot(slot, n_features, n_bands, rows, cols, threshold, uncertainty):
+    """Predict the tile stored in shared ``slot`` and write results in place"""
+    features = slot_view(_tile_worker['features'].array[slot], (n_features, rows, cols))
+    valid_mask = np.all(np.isfinite(features), axis=0)
+    bands, labels = predict_tile(_tile_worker['model'], features, valid_mask, threshold, uncertainty)
+    slot_view(_tile_worker['bands'].array[slot], (n_bands, rows, cols))[...] = bands
+    slot_view(_tile_worker['labels'].array[slot], (rows, cols))[...] = labels
+    return int(valid_mask.sum())
+
+
+def _iter_parallel(model_paths, stack, windows, n_bands, threshold, uncertainty, tile_size, workers, n_slots=None,
+                   reuse=None):
+    """Yield (window, bands, labels, valid_pixels) predicted by worker processes.
+
+    ``bands`` and ``labels`` are views into shared memory that stay valid
+    until the generator is resumed. Tiles may complete out of order. At
+    most ``n_slots`` tiles (default SLOTS_PER_WORKER per worker) are in flight.
+    Tiles accepted by ``reuse(window, features)`` are yielded as
+    (window, None, None, None) without being sent to a worker.
+    """
+    n_features = stack.n_features
+    n_slots = max(1, n_slots or workers * SLOTS_PER_WORKER)
+    tile_pixels = tile_size * tile_size
+
+    feature_buffer = SharedBuffer((n_slots, n_features * tile_pixels), np.float32)
+    band_buffer = SharedBuffer((n_slots, n_bands * tile_pixels), np.float32)
+    label_buffer = SharedBuffer((n_slots, tile_pixels), np.uint8)
+    pool = None
+
+    try:
+        pool = process_pool(workers, _init_tile_worker, (
+            list(model_paths), feature_buffer.spec(), band_buffer.spec(), label_buffer.spec()))
+
+        free_slots = list(range(n_slots))
+        pending = {}
+        remaining = iter(windows)
+        exhausted = False
+
+        while True:
+            # Keep every free slot busy: read the next tiles into shared memory
+            while free_slots and not exhausted:
+                window = next(remaining, None)
+                if window is None:
+                    exhausted = True
+                    break
+                xoff, yoff, xsize, ysize = window
+                slot = free_slots.pop()
+                features = slot_view(feature_buffer.array[slot], (n_features, ysize, xsize))
+                stack.read_window(xoff, yoff, xsize, ysize, out=features)
+                if reuse is not None and reuse(window, features):
+                    free_slots.append(slot)
+                    yield window, None, None, None
+                    continue
+                future = pool.submit(_predict_tile_slot, slot, n_features, n_bands, ysize, xsize, threshold, uncertainty)
+                pending[future] = (slot, window)
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                slot, window = pending.pop(future)
+                valid_pixels = future.result()
+                _, _, xsize, ysize = window
+                yield (window,
+                       slot_view(band_buffer.array[slot], (n_bands, ysize, xsize)),
+                       slot_view(label_buffer.array[slot], (ysize, xsize)),
+                       valid_pixels)
+                free_slots.append(slot)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+        feature_buffer.unlink()
+        band_buffer.unlink()
+        label_buffer.unlink()
+
+
+def previous_output_path(path):
+    """Where an incremental run keeps the earlier version of an output"""
+    return os.path.splitext(path)[0] + '.previous.tif'
+
+
+def inputs_unchanged(earlier, manifest):
+    """True if every input file has the size and modification time recorded by ``earlier``"""
+    return (bool(manifest.inputs) and earlier.inputs == manifest.inputs
+            and all(size is not None for _, size, _ in manifest.inputs))
+
+
+def plan_incremental(earlier, manifest, output_paths):
+    """Decide how an incremental run can use the outputs of an earlier run.
+
+    The earlier run must be closed and have the same grid, tiling and
+    settings, and all its outputs must be on disk. Its outputs are then
+    moved aside (previous_output_path) so the new outputs can be written in
+    their place; restore_previous() puts them back if the run fails.
+
+    When no input file changed (inputs_unchanged()), the earlier tile
+    fingerprints are taken over and every completed tile is reusable
+    without reading it. Otherwise tiles are fingerprinted as they are read,
+    see incremental_reuse().
+
+    :param earlier: Manifest of the current outputs, or None.
+    :type earlier: TileManifest
+
+    :param manifest: New manifest; receives the fingerprints taken over.
+    :type manifest: TileManifest
+
+    :param output_paths: Probability output, then the class output if any.
+    :type output_paths: list
+
+    :returns: Tuple (reference, reusable, previous): the earlier manifest
+        to compare read tiles with (None when nothing can be reused or all
+        reusable tiles are known), the set of tile indices known to be
+        reusable, and the moved earlier outputs.
+    :rtype: tuple
+    """
+    if (earlier is None or earlier.state == STATE_RUNNING
+            or not earlier.matches(manifest.grid, manifest.tile_size, manifest.settings)
+            or earlier.n_tiles != manifest.n_tiles
+            or not earlier.completed.any()
+            or not all(os.path.exists(path) for path in output_paths)):
+        return None, set(), []
+
+    previous = []
+    for path in output_paths:
+        os.replace(path, previous_output_path(path))
+        previous.append(previous_output_path(path))
+
+    if inputs_unchanged(earlier, manifest):
+        reusable = {int(index) for index in np.flatnonzero(earlier.completed)}
+        for index in reusable:
+            manifest.fingerprints[index] = earlier.fingerprints[index]
+            manifest.counts[index] = earlier.counts[index]
+        return None, reusable, previous
+    return earlier, set(), previous
+
+
+def incremental_reuse(reference, manifest, tile_index):
+    """Reader-stage callback: fingerprint a tile and say if ``reference`` has it.
+
+    Stores the fingerprint of every tile it sees in ``manifest`` (and the
+    earlier pixel counts of reusable tiles), so the tile is read only once
+    whether it is then copied or predicted.
+    """
+    digest = settings_fingerprint(manifest.settings)
+
+    def reuse(window, features):
+        index = tile_index[window]
+        fingerprint = tile_fingerprint(features, digest)
+        manifest.fingerprints[index] = fingerprint
+        if (reference is not None and reference.completed[index]
+                and reference.fingerprints[index] == fingerprint):
+            manifest.counts[index] = reference.counts[index]
+            return True
+        return False
+    return reuse
+
+
+def restore_previous(previous, output_paths, earlier):
+    """Put the earlier outputs and their manifest back after a failed run"""
+    for moved, path in zip(previous, output_paths):
+        # Replaces the partial output of the failed run
+        os.replace(moved, path)
+    earlier.save()
+
+
+def can_resume(earlier, stack, tile_size, settings, output_paths, cog=False):
+    """True if ``earlier`` is an unfinished job that can continue.
+
+    The job must have the same grid, tiling and settings, unchanged input
+    files, and the files its writers were writing into must still exist.
+    """
+    return (earlier is not None and earlier.state == STATE_RUNNING
+            and earlier.matches(stack.grid, tile_size, settings)
+            and earlier.inputs == input_stamps(stack.paths)
+            and all(os.path.exists(writer_target(path, cog)) for path in output_paths))
+
+
+def resumable_job(probability_path):
+    """Manifest of an unfinished job writing ``probability_path``, or None"""
+    earlier = TileManifest.load(manifest_path_for(probability_path))
+    if earlier is None or earlier.state != STATE_RUNNING or not earlier.completed.any():
+        return None
+    return earlier
+
+
+def _copy_tile(source, output, window):
+    """Copy all bands of one window from an earlier output, as stored"""
+    xoff, yoff, xsize, ysize = window
+    output.write(source.ReadAsArray(xoff, yoff, xsize, ysize), xoff, yoff)
+
+
+def predict_area(model, stack, probability_path, class_path=None,
+                 threshold=DEFAULT_THRESHOLD, tile_size=None, feedback=None,
+                 workers=None, model_paths=None, uncertainty=None, cog=False, quantize=False,
+                 incremental=False, checkpoint=False, checkpoint_seconds=CHECKPOINT_SECONDS,
+                 memory_limit=None, timer=None):
+    """Predict flood probability (and class) rasters over a whole feature stack.
+
+    :param model: A fitted model, called once per tile, or a ModelEnsemble.
+        For an ensemble the probability raster has the bands listed by
+        ModelEnsemble.band_names() and the class raster holds the class of
+        the mean probability.
+
+    :param stack: Feature rasters in model feature order.
+    :type stack: FeatureStack
+
+    :param probability_path: Output GeoTIFF for the float32 probability.
+    :type probability_path: str
+
+    :param class_path: Optional output GeoTIFF for the uint8 class raster.
+    :type class_path: str
+
+    :param threshold: Decision threshold for the flood class.
+    :type threshold: float
+
+    :param tile_size: Tile edge in pixels; None lets core.tiling pick it
+        from ``memory_limit``, the inputs' block sizes and the model.
+    :type tile_size: int
+
+    :param feedback: Progress/cancellation object (QgsFeedback interface).
+
+    :param workers: Number of worker processes. None or 1 predicts in the
+        calling process, 0 uses one process per CPU core.
+    :type workers: int
+
+    :param model_paths: Model files the workers load; defaults to the paths
+        of an ensemble. Required for a single model when using workers.
+    :type model_paths: list
+
+    :param uncertainty: Add tree-spread uncertainty bands (see
+        core.uncertainty) to the probability raster. None adds them whenever
+        the model supports it.
+    :type uncertainty: bool
+
+    :param cog: Write Cloud-Optimized GeoTIFFs with internal overviews.
+    :type cog: bool
+
+    :param quantize: Store probabilities as uint8 (0-254, scale 1/254,
+        255 = nodata) instead of float32.
+    :type quantize: bool
+
+    :param incremental: Record per-tile fingerprints in a manifest and
+        predict only the tiles whose inputs or model changed since the run
+        that wrote the current outputs.
+    :type incremental: bool
+
+    :param checkpoint: Make the job resumable: save the tile completion
+        bitmap every ``checkpoint_seconds`` and keep unfinished outputs on
+        cancel. A later call with the same arguments resumes the job if the
+        inputs and the model are unchanged.
+    :type checkpoint: bool
+
+    :param checkpoint_seconds: Seconds between checkpoints.
+    :type checkpoint_seconds: float
+
+    :param memory_limit: Ceiling in bytes for the tiles in flight and their
+        prediction scratch (see core.pipeline). Sets the pipeline depth, or
+        the worker slots (and if needed fewer workers) with worker
+        processes. None uses the default depth.
+    :type memory_limit: int
+
+    :param timer: Receives 'area.read', 'area.predict' (in-process only)
+        and 'area.write' spans per tile.
+    :type timer: StageTimer
+
+    :returns: Run summary with tile, pixel and timing counts;
+        ``tiles_reused`` counts tiles copied from the previous output,
+        ``tiles_resumed`` tiles completed by an interrupted run and
+        ``tiles_in_flight`` the most tiles held at once in this process
+        (None with worker processes).
+    :rtype: dict
+    """
+    start_time = time.perf_counter()
+    timer = timer or StageTimer()
+    grid = stack.grid
+    if uncertainty is None:
+        uncertainty = supports_tree_uncertainty(model)
+    elif uncertainty and not supports_tree_uncertainty(model):
+        raise ValueError(f"Tree uncertainty is not available for {type(model).__name__} models")
+    band_names = output_band_names(model, uncertainty)
+
+    parallel = workers is not None and workers != 1
+    if parallel:
+        from .parallel import default_workers
+        workers = workers or default_workers()
+    else:
+        workers = 1
+    model_scratch = model_scratch_per_pixel(model)
+    if tile_size is None:
+        tile_size = plan_tile_size(model, stack, len(band_names), memory_limit, workers)['tile_size']
+
+    windows = list(iter_windows(grid.width, grid.height, tile_size))
+    model_paths = model_paths or getattr(model, 'model_paths', None)
+    if parallel and not model_paths:
+        raise ValueError("Worker processes need the model file paths")
+    output_paths = [probability_path] + ([class_path] if class_path else [])
+
+    manifest, reusable, previous, resumed = None, set(), [], False
+    earlier, reference = None, None
+    if incremental or checkpoint:
+        settings = {
+            'model': model_fingerprint(model, model_paths),
+            'features': stack.n_features,
+            'bands': band_names,
+            'threshold': float(threshold),
+            'quantize': bool(quantize),
+            'cog': bool(cog),
+            'classes': bool(class_path),
+        }
+        earlier = TileManifest.load(manifest_path_for(probability_path))
+        if checkpoint and can_resume(earlier, stack, tile_size, settings, output_paths, cog):
+            manifest, resumed = earlier, True
+        else:
+            manifest = TileManifest(manifest_path_for(probability_path), grid, tile_size, len(windows), settings)
+            manifest.inputs = input_stamps(stack.paths)
+            if incremental:
+                reference, reusable, previous = plan_incremental(earlier, manifest, output_paths)
+    if resumed:
+        # Earlier outputs kept by a paused incremental run; deleted once it finishes
+        previous = [path for path in map(previous_output_path, output_paths) if os.path.exists(path)]
+    tile_index = {window: index for index, window in enumerate(windows)}
+    pending = [window for index, window in enumerate(windows)
+               if index not in reusable and not (resumed and manifest.completed[index])]
+    # Fingerprint tiles as they are read; tiles the earlier run has are copied
+    reuse = incremental_reuse(reference, manifest, tile_index) if incremental else None
+
+    probability_out = class_out = None
+    gauge = None
+    try:
+        if parallel:
+            workers = min(workers, max(len(pending), 1))
+            n_slots = None
+            if memory_limit:
+                workers, n_slots = worker_slots(memory_limit, workers, stack.n_features, len(band_names), tile_size,
+                                                model_scratch)
+                n_slots = min(n_slots, workers * SLOTS_PER_WORKER)
+            results = _iter_parallel(model_paths, stack, pending, len(band_names), threshold, uncertainty, tile_size,
+                                     workers, n_slots, reuse)
+        else:
+            depth = DEFAULT_DEPTH
+            if memory_limit:
+                depth = min(pipeline_depth(memory_limit, stack.n_features, len(band_names), tile_size, model_scratch),
+                            DEFAULT_DEPTH)
+            gauge = TileGauge()
+            results = _iter_serial(model, stack, pending, threshold, uncertainty, depth, timer, reuse, gauge)
+
+        if quantize:
+            probability_out = TiledRasterWriter(
+                probability_path, grid, gdal.GDT_Byte, QUANTIZED_NODATA, len(band_names), band_names,
+                cog=cog, tile_size=tile_size, scale=1.0 / QUANTIZED_MAX, resume=resumed)
+        else:
+            probability_out = TiledRasterWriter(
+                probability_path, grid, gdal.GDT_Float32, PROBABILITY_NODATA, len(band_names), band_names,
+                cog=cog, tile_size=tile_size, resume=resumed)
+        if class_path:
+            class_out = TiledRasterWriter(class_path, grid, gdal.GDT_Byte, CLASS_NODATA,
+                                          cog=cog, tile_size=tile_size, resampling='nearest', resume=resumed)
+    except BaseException:
+        # Nothing was written yet: put the earlier outputs back
+        for writer in (probability_out, class_out):
+            if writer is not None:
+                writer.close(finalize=False)
+        if previous and not resumed:
+            restore_previous(previous, output_paths, earlier)
+        raise
+    if manifest is not None and not resumed:
+        # Replaces the manifest of the earlier outputs: they are being overwritten
+        manifest.save()
+
+    summary = {
+        'tiles': len(windows),
+        'tile_size': tile_size,
+        'tiles_done': 0,
+        'tiles_reused': 0,
+        'tiles_resumed': 0,
+        'valid_pixels': 0,
+        'flood_pixels': 0,
+        'workers': workers,
+        'canceled': False,
+    }
+    if resumed:
+        for index in np.flatnonzero(manifest.completed):
+            valid_pixels, flood_pixels = manifest.counts[index]
+            summary['tiles_resumed'] += 1
+            summary['tiles_done'] += 1
+            summary['valid_pixels'] += valid_pixels
+            summary['flood_pixels'] += flood_pixels
+
+    def finish_tile(index, valid_pixels, flood_pixels):
+        if manifest is not None:
+            manifest.mark_done(index, valid_pixels, flood_pixels)
+        summary['tiles_done'] += 1
+        summary['valid_pixels'] += valid_pixels
+        summary['flood_pixels'] += flood_pixels
+        report_progress(feedback, summary['tiles_done'], len(windows))
+
+    def save_checkpoint():
+        # Tiles first, then the bitmap that declares them written
+        probability_out.flush()
+        if class_out is not None:
+            class_out.flush()
+        manifest.save()
+
+    # Opened inside the try below, so a failed open still restores and closes
+    previous_sources = []
+
+    def copy_previous(index):
+        with timer.span('area.write'):
+            _copy_tile(previous_sources[0], probability_out, windows[index])
+            if class_out is not None:
+                _copy_tile(previous_sources[1], class_out, windows[index])
+        summary['tiles_reused'] += 1
+        finish_tile(index, *manifest.counts[index])
+
+    finished = False
+    last_checkpoint = time.monotonic()
+    try:
+        if reusable or reference is not None:
+            for path in previous:
+                previous_sources.append(open_raster(path))
+        for index in sorted(reusable):
+            copy_previous(index)
+
+        for window, bands, labels, valid_pixels in results:
+            if bands is None:
+                # Fingerprint unchanged since the earlier run
+                copy_previous(tile_index[window])
+            else:
+                xoff, yoff, _, _ = window
+                with timer.span('area.write'):
+                    if quantize:
+                        bands = quantize_probability(bands, PROBABILITY_NODATA)
+                    probability_out.write(bands, xoff, yoff)
+                    if class_out is not None:
+                        class_out.write(labels, xoff, yoff)
+                finish_tile(tile_index[window], valid_pixels, int((labels == 1).sum()))
+
+            if checkpoint and time.monotonic() - last_checkpoint >= checkpoint_seconds:
+                save_checkpoint()
+                last_checkpoint = time.monotonic()
+
+            if is_canceled(feedback):
+                summary['canceled'] = summary['tiles_done'] < len(windows)
+                break
+        finished = not summary['canceled']
+    finally:
+        # Stops worker processes and frees shared memory when interrupted
+        results.close()
+        # Flushes the files; COG outputs are laid out here unless a
+        # checkpointed job stops early and keeps its staging files to resume
+        previous_sources = None
+        keep_open = checkpoint and not finished
+        probability_out.close(finalize=not keep_open)
+        if class_out is not None:
+            class_out.close(finalize=not keep_open)
+        # The earlier outputs are deleted only after a complete run. A failed
+        # or canceled run puts them (and their manifest) back; a paused
+        # resumable run keeps them next to its manifest.
+        restore = bool(previous) and not finished and not keep_open and not resumed
+        if manifest is not None and not restore:
+            if finished:
+                manifest.state = STATE_COMPLETE
+            elif not keep_open:
+                manifest.state = STATE_CANCELED
+            manifest.save()
+        if finished:
+            for path in previous:
+                gdal.GetDriverByName('GTiff').Delete(path)
+        elif restore:
+            restore_previous(previous, output_paths, earlier)
+
+    summary['tiles_in_flight'] = gauge.peak if gauge is not None else None
+    summary['seconds'] = time.perf_counter() - start_time
+    return summary
@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Tiled raster output
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ GeoTIFF and Cloud-Optimized GeoTIFF output written tile by tile.
+
+ For a COG the overview pyramid is built from the tiles while they stream
+ out: every tile is reduced 2x, 4x, 8x, ... in memory and written into
+ overview levels that were allocated up front, so no gdaladdo-style pass
+ reads the raster back to compute overviews. The file is still copied
+ once: a COG keeps its directories and smallest overviews ahead of the
+ full-resolution tiles, which GDAL can only write through CreateCopy, so
+ close() reads the staging GeoTIFF and writes the COG with the COG driver
+ (OVERVIEWS=FORCE_USE_EXISTING, the overviews are reused, not recomputed).
+
+ A writer can also reopen the file an interrupted job left behind (the
+ GeoTIFF itself, or the COG staging file) and continue writing into it.
+
+ Probabilities can also be stored quantized to uint8 (0-254, 255 =
+ nodata) with a band scale of 1/254, a quarter of the float32 size.
+"""
+
+import os
+
+import numpy as np
+from osgeo import gdal
+
+from .raster import GTIFF_OPTIONS, _gdal_error, create_raster, write_window
+
+# COG block size; overviews are added until a level fits in one block
+COG_BLOCK_SIZE = 512
+
+# Quantized probabilities: 0..QUANTIZED_MAX, QUANTIZED_NODATA for nodata
+QUANTIZED_MAX = 254
+QUANTIZED_NODATA = 255
+
+# Intermediate GeoTIFF: fast compression, it only lives until the COG copy
+_STAGING_OPTIONS = ['TILED=YES', f'BLOCKXSIZE={COG_BLOCK_SIZE}', f'BLOCKYSIZE={COG_BLOCK_SIZE}',
+                    'COMPRESS=DEFLATE', 'ZLEVEL=1', 'BIGTIFF=IF_SAFER']
+
+COG_OPTIONS = [f'BLOCKSIZE={COG_BLOCK_SIZE}', 'COMPRESS=DEFLATE', 'PREDICTOR=YES',
+               'OVERVIEWS=FORCE_USE_EXISTING', 'BIGTIFF=IF_SAFER']
+
+
+def cog_available():
+    """True if the GDAL COG driver (GDAL >= 3.1) is available"""
+    return gdal.GetDriverByName('COG') is not None
+
+
+def staging_path(path):
+    """Intermediate GeoTIFF a COG is assembled in"""
+    return os.path.splitext(path)[0] + '.staging.tif'
+
+
+def writer_target(path, cog=False):
+    """File a TiledRasterWriter writes tiles into until it is closed"""
+    return staging_path(path) if cog else path
+
+
+def overview_factors(width, height, tile_size, block_size=COG_BLOCK_SIZE):
+    """Overview decimation factors (2, 4, 8, ...) for a raster.
+
+    Levels are added until one fits in a single block. Factors are limited
+    to divisors of ``tile_size`` so every tile maps onto whole overview
+    pixels and can be reduced on its own.
+    """
+    factors = []
+    factor = 2
+    while max(width, height) > block_size * factor // 2 and factor <= tile_size and tile_size % factor == 0:
+        factors.append(factor)
+        factor *= 2
+    return factors
+
+
+def quantize_probability(values, nodata):
+    """Map probabilities in [0, 1] to uint8 0..254; ``nodata`` becomes 255"""
+    values = np.asarray(values)
+    quantized = np.rint(np.clip(values, 0.0, 1.0) * QUANTIZED_MAX).astype(np.uint8)
+    quantized[(values == nodata) | ~np.isfinite(values)] = QUANTIZED_NODATA
+    return quantized
+
+
+def _pad_to_multiple(array, factor, fill):
+    """Pad a 2-D array on the bottom/right to a multiple of ``factor``"""
+    rows, cols = array.shape
+    pad_rows = -rows % factor
+    pad_cols = -cols % factor
+    if pad_rows or pad_cols:
+        array = np.pad(array, ((0, pad_rows), (0, pad_cols)), constant_values=fill)
+    return array
+
+
+def _sum_2x2(array):
+    """Sum every 2x2 block of an array with even dimensions"""
+    rows, cols = array.shape
+    return array.reshape(rows // 2, 2, cols // 2, 2).sum(axis=(1, 3))
+
+
+def average_pyramid(tile, nodata, levels):
+    """Nodata-aware 2x, 4x, ... averages of one tile.
+
+    Sums and valid-pixel counts are carried from level to level, so every
+    level is the exact mean of the valid full-resolution pixels it covers.
+
+    :returns: One float64 array per level, ``nodata`` where no pixel was valid.
+    :rtype: list
+    """
+    valid = np.isfinite(tile) & (tile != nodata)
+    sums = np.where(valid, tile, 0.0).astype(np.float64)
+    counts = valid.astype(np.int32)
+
+    pyramid = []
+    for _ in range(levels):
+        sums = _sum_2x2(_pad_to_multiple(sums, 2, 0.0))
+        counts = _sum_2x2(_pad_to_multiple(counts, 2, 0))
+        level = np.full(sums.shape, nodata, dtype=np.float64)
+        np.divide(sums, counts, out=level, where=counts > 0)
+        pyramid.append(level)
+    return pyramid
+
+
+def nearest_pyramid(tile, factors):
+    """Nearest-neighbour (top-left pixel) reductions, for class rasters"""
+    return [tile[::factor, ::factor] for factor in factors]
+
+
+class TiledRasterWriter:
+    """Writes tiles into a GeoTIFF or a Cloud-Optimized GeoTIFF.
+
+    ``write()`` accepts tiles in any order. With ``cog=True`` the tiles go
+    to a staging GeoTIFF next to ``path`` together with their overview
+    reductions, and ``close()`` copies the result into the COG layout,
+    one read and write of the whole file.
+    """
+
+    def __init__(self, path, grid, data_type, nodata, bands=1, band_names=None, cog=False,
+                 tile_size=COG_BLOCK_SIZE, resampling='average', scale=None, resume=False):
+        """Constructor.
+
+        :param path: Output file.
+        :type path: str
+
+        :param grid: Output grid.
+        :type grid: RasterGrid
+
+        :param data_type: GDAL data type, e.g. gdal.GDT_Float32.
+
+        :param nodata: Nodata value of every band.
+
+        :param bands: Number of bands.
+        :type bands: int
+
+        :param band_names: Band descriptions.
+        :type band_names: list
+
+        :param cog: Write a Cloud-Optimized GeoTIFF with internal overviews.
+        :type cog: bool
+
+        :param tile_size: Edge of the tiles passed to write(); windows must
+            start at multiples of it.
+        :type tile_size: int
+
+        :param resampling: 'average' for continuous values, 'nearest' for classes.
+        :type resampling: str
+
+        :param scale: Band scale, e.g. 1/254 for quantized probabilities.
+        :type scale: float
+
+        :param resume: Open the file left by an unfinished writer with the
+            same arguments (see writer_target) instead of creating it.
+        :type resume: bool
+        """
+        if cog and not cog_available():
+            raise RuntimeError("Cloud-Optimized GeoTIFF output needs GDAL 3.1 or newer")
+
+        self.path = path
+        self.cog = cog
+        self.nodata = nodata
+        self.resampling = resampling
+        self._staging_path = staging_path(path) if cog else None
+        self.factors = overview_factors(grid.width, grid.height, tile_size) if cog else []
+
+        target = writer_target(path, cog)
+        if resume:
+            self._dataset = gdal.Open(target, gdal.GA_Update)
+            if self._dataset is None:
+                raise _gdal_error(f"Cannot reopen {target} to resume writing")
+            return
+
+        self._dataset = create_raster(target, grid, data_type, nodata, bands,
+                                      options=_STAGING_OPTIONS if cog else GTIFF_OPTIONS)
+        for band_number in range(1, bands + 1):
+            band = self._dataset.GetRasterBand(band_number)
+            if band_names:
+                band.SetDescription(band_names[band_number - 1])
+            if scale is not None:
+                band.SetScale(scale)
+                band.SetOffset(0.0)
+
+        if self.factors:
+            # Allocate empty overview levels; they are filled tile by tile
+            if self._dataset.BuildOverviews('NONE', self.factors) != 0:
+                raise _gdal_error("Cannot allocate overview levels")
+
+    def write(self, array, xoff, yoff):
+        """Write one tile of shape (rows, cols) or (bands, rows, cols)"""
+        if array.ndim == 2:
+            array = array[np.newaxis]
+        for band_number, tile in enumerate(array, start=1):
+            write_window(self._dataset, tile, xoff, yoff, band_number)
+            if self.factors:
+                self._write_overviews(band_number, tile, xoff, yoff)
+
+    def _write_overviews(self, band_number, tile, xoff, yoff):
+        band = self._dataset.GetRasterBand(band_number)
+        if self.resampling == 'nearest':
+            pyramid = nearest_pyramid(tile, self.factors)
+        else:
+            pyramid = average_pyramid(tile, self.nodata, len(self.factors))
+
+        for index, (factor, level) in enumerate(zip(self.factors, pyramid)):
+            overview = band.GetOverview(index)
+            level_xoff, level_yoff = xoff // factor, yoff // factor
+            # Clip to the overview size GDAL allocated
+            level = level[:overview.YSize - level_yoff, :overview.XSize - level_xoff]
+            if np.issubdtype(tile.dtype, np.integer):
+                level = np.rint(level)
+            if overview.WriteArray(level.astype(tile.dtype, copy=False), level_xoff, level_yoff) != 0:
+                raise _gdal_error("Failed to write overview window")
+
+    def flush(self):
+        """Write cached tiles and the file directory to disk"""
+        self._dataset.FlushCache()
+
+    def close(self, finalize=True):
+        """Flush the output; for a COG, copy the staging file into the final layout.
+
+        :param finalize: False keeps a COG's staging file instead of laying
+            out the COG, so a later writer can resume it.
+        :type finalize: bool
+        """
+        if self._dataset is None:
+            return
+        self._dataset.FlushCache()
+        self._dataset = None
+
+        if self.cog and finalize:
+            staging = gdal.Open(self._staging_path)
+            try:
+                result = gdal.GetDriverByName('COG').CreateCopy(self.path, staging, options=COG_OPTIONS)
+                if result is None:
+                    raise _gdal_error(f"Cannot write Cloud-Optimized GeoTIFF {self.path}")
+                result = None
+            finally:
+                staging = None
+                gdal.GetDriverByName('GTiff').Delete(self._staging_path)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Feature cube
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Feature rasters stacked into one multi-band GeoTIFF.
+
+ The feature rasters are aligned to the grid of the reference raster (see
+ FeatureStack) and written as float32 bands in model feature order, named
+ after the features. Pixels where any feature has no data are nodata in
+ every band, so the cube can be handed to other tools, or predicted again,
+ without repeating the alignment.
+"""
+
+import time
+
+import numpy as np
+from osgeo import gdal
+
+from .area import DEFAULT_TILE_SIZE, is_canceled, report_progress
+from .cog import TiledRasterWriter
+from .inference import PROBABILITY_NODATA
+from .pipeline import pipelined
+from .raster import iter_windows
+
+# Nodata of the cube bands
+FEATURE_NODATA = PROBABILITY_NODATA
+
+
+def build_feature_cube(stack, output_path, tile_size=DEFAULT_TILE_SIZE, feedback=None, cog=False):
+    """Write the aligned features of a stack into one multi-band raster.
+
+    :param stack: Feature rasters in model feature order.
+    :type stack: FeatureStack
+
+    :param output_path: Output GeoTIFF, one float32 band per feature.
+    :type output_path: str
+
+    :param tile_size: Tile edge in pixels.
+    :type tile_size: int
+
+    :param feedback: Progress/cancellation object (QgsFeedback interface).
+
+    :param cog: Write a Cloud-Optimized GeoTIFF.
+    :type cog: bool
+
+    :returns: Run summary with tile, pixel and timing counts.
+    :rtype: dict
+    """
+    start_time = time.perf_counter()
+    grid = stack.grid
+    windows = list(iter_windows(grid.width, grid.height, tile_size))
+
+    output = TiledRasterWriter(output_path, grid, gdal.GDT_Float32, FEATURE_NODATA, stack.n_features,
+                               stack.names, cog=cog, tile_size=tile_size)
+    summary = {
+        'tiles': len(windows),
+        'tiles_done': 0,
+        'bands': stack.n_features,
+        'valid_pixels': 0,
+        'canceled': False,
+    }
+
+    def read(window):
+        features, valid_mask = stack.read_window(*window)
+        return window, features, valid_mask
+
+    try:
+        # Reading the next tile overlaps with writing this one
+        for (xoff, yoff, _, _), features, valid_mask in pipelined(windows, read, name='cube-read'):
+            features[:, ~valid_mask] = FEATURE_NODATA
+            output.write(features, xoff, yoff)
+            summary['valid_pixels'] += int(np.count_nonzero(valid_mask))
+            summary['tiles_done'] += 1
+            report_progress(feedback, summary['tiles_done'], len(windows))
+            if is_canceled(feedback):
+                summary['canceled'] = summary['tiles_done'] < len(windows)
+                break
+    finally:
+        output.close()
+
+    summary['seconds'] = time.perf_counter() - start_time
+    return summary
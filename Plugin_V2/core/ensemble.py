@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Model ensembles
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Several models evaluated over the same feature block.
+
+ Features are extracted (rasters read) once and handed to every model. The
+ ensemble reports the mean flood probability, the share of models that
+ agree with the ensemble class, and each model's own probability.
+"""
+
+import numpy as np
+
+from .inference import (
+    DEFAULT_THRESHOLD, PROBABILITY_NODATA, CLASS_NODATA, FLOOD_CLASS,
+    classify, predict_batch, predict_probabilities
+)
+from .models import load_model_file, model_id_from_path
+from .parallel import process_pool
+
+# Models loaded in a worker process by _init_worker, indexed like the ensemble
+_worker_models = None
+
+
+def _init_worker(model_paths):
+    """Worker initializer: load every model once per process"""
+    global _worker_models
+    _worker_models = [load_model_file(path) for path in model_paths]
+
+
+def _worker_probabilities(index, features):
+    """Evaluate model ``index`` in a worker process"""
+    return predict_probabilities(_worker_models[index], features)
+
+
+class ModelEnsemble:
+    """N models that share one feature matrix per evaluation.
+
+    A ModelEnsemble also behaves like a single binary classifier
+    (``predict``/``predict_proba`` on the mean probability), so it can be
+    used anywhere a model is expected.
+    """
+
+    classes_ = np.array([0, FLOOD_CLASS])
+
+    def __init__(self, models, model_ids=None, model_paths=None, workers=None):
+        """Constructor.
+
+        :param models: Fitted models.
+        :type models: list
+
+        :param model_ids: Names used for per-model outputs.
+        :type model_ids: list
+
+        :param model_paths: Model files; required to evaluate in worker
+            processes, where every worker loads the models once.
+        :type model_paths: list
+
+        :param workers: Number of worker processes. None or 1 evaluates the
+            models in the calling process, 0 uses one process per core.
+        :type workers: int
+        """
+        if not models:
+            raise ValueError("An ensemble needs at least one model")
+        self.models = list(models)
+        self.model_ids = list(model_ids) if model_ids else [f"model_{i + 1}" for i in range(len(self.models))]
+        self.model_paths = list(model_paths) if model_paths else None
+        self.workers = workers
+        self._pool = None
+
+        if self.uses_workers and not self.model_paths:
+            raise ValueError("Worker processes need the model file paths")
+
+    @classmethod
+    def from_files(cls, paths, workers=None):
+        """Load an ensemble from model files"""
+        models = [load_model_file(path) for path in paths]
+        return cls(models, [model_id_from_path(p) for p in paths], paths, workers)
+
+    def __len__(self):
+        return len(self.models)
+
+    @property
+    def uses_workers(self):
+        return self.workers is not None and self.workers != 1 and len(self.models) > 1
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = process_pool(
+                min(self.workers, len(self.models)) if self.workers else len(self.models),
+                _init_worker, (self.model_paths,))
+        return self._pool
+
+    def model_probabilities(self, features):
+        """Flood probability of every model.
+
+        :param features: Feature matrix of shape (n_samples, n_features).
+        :type features: numpy.ndarray
+
+        :returns: Array of shape (n_models, n_samples).
+        :rtype: numpy.ndarray
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim == 1:
+            features = features.reshape(1, -1)
+
+        if self.uses_workers:
+            pool = self._get_pool()
+            futures = [pool.submit(_worker_probabilities, index, features) for index in range(len(self.models))]
+            return np.vstack([future.result() for future in futures])
+
+        return np.vstack([predict_probabilities(model, features) for model in self.models])
+
+    def evaluate(self, features, threshold=DEFAULT_THRESHOLD):
+        """Evaluate all models on one feature matrix.
+
+        :returns: Dictionary with
+
+            * ``mean_probability`` - (n_samples,) mean of the model probabilities
+            * ``labels`` - (n_samples,) class of the mean probability
+            * ``agreement`` - (n_samples,) share of models whose own class
+              equals the ensemble class (1.0 = unanimous)
+            * ``model_probabilities`` - (n_models, n_samples)
+        :rtype: dict
+        """
+        model_probabilities = self.model_probabilities(features)
+        mean_probability = model_probabilities.mean(axis=0)
+        labels = classify(mean_probability, threshold)
+
+        flood_votes = classify(model_probabilities, threshold).sum(axis=0)
+        n_models = len(self.models)
+        agreement = np.where(labels == 1, flood_votes, n_models - flood_votes) / n_models
+
+        return {
+            'mean_probability': mean_probability,
+            'labels': labels,
+            'agreement': agreement,
+            'model_probabilities': model_probabilities,
+        }
+
+    def evaluate_block(self, feature_block, valid_mask=None, threshold=DEFAULT_THRESHOLD):
+        """Evaluate all models on one raster block.
+
+        :param feature_block: Feature values of shape (n_features, rows, cols).
+        :type feature_block: numpy.ndarray
+
+        :returns: Tuple (bands, labels). ``bands`` is float32 of shape
+            (2 + n_models, rows, cols): mean probability, agreement, then one
+            probability band per model, PROBABILITY_NODATA where invalid.
+            ``labels`` is uint8 with CLASS_NODATA where invalid.
+        :rtype: tuple
+        """
+        _, rows, cols = feature_block.shape
+        if valid_mask is None:
+            valid_mask = np.all(np.isfinite(feature_block), axis=0)
+
+        bands = np.full((2 + len(self.models), rows, cols), PROBABILITY_NODATA, dtype=np.float32)
+        labels = np.full((rows, cols), CLASS_NODATA, dtype=np.uint8)
+
+        if valid_mask.any():
+            result = self.evaluate(feature_block[:, valid_mask].T, threshold)
+            bands[0][valid_mask] = result['mean_probability']
+            bands[1][valid_mask] = result['agreement']
+            bands[2:, valid_mask] = result['model_probabilities']
+            labels[valid_mask] = result['labels']
+
+        return bands, labels
+
+    def band_names(self):
+        """Descriptions of the bands produced by evaluate_block"""
+        return ['mean_probability', 'agreement'] + [f"probability_{model_id}" for model_id in self.model_ids]
+
+    # Single-model interface -------------------------------------------------
+
+    def predict_proba(self, features):
+        """Mean probability as a (n_samples, 2) sklearn-style array"""
+        mean_probability = self.model_probabilities(features).mean(axis=0)
+        return np.column_stack([1.0 - mean_probability, mean_probability])
+
+    def predict(self, features):
+        """Ensemble class at the default threshold"""
+        return classify(self.predict_proba(features)[:, 1])
+
+    def close(self):
+        """Shut down worker processes, if any"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def load_predictor(model_paths):
+    """Load one model file, or an in-process ModelEnsemble for several.
+
+    :param model_paths: Model files.
+    :type model_paths: list
+    """
+    if len(model_paths) == 1:
+        return load_model_file(model_paths[0])
+    return ModelEnsemble.from_files(model_paths)
+
+
+def predict_points(model, features, threshold=DEFAULT_THRESHOLD):
+    """Flood probability and class for point feature rows, in one model call.
+
+    Rows with a missing (NaN) feature are not sent to the model.
+
+    :param model: A fitted model or ModelEnsemble (mean probability).
+
+    :param features: Feature matrix of shape (n_points, n_features).
+    :type features: numpy.ndarray
+
+    :returns: Tuple (probabilities, labels, valid); NaN probability and
+        label 0 where ``valid`` is False.
+    :rtype: tuple
+    """
+    features = np.asarray(features, dtype=np.float64)
+    valid = np.all(np.isfinite(features), axis=1)
+    probabilities = np.full(len(features), np.nan)
+    labels = np.zeros(len(features), dtype=np.uint8)
+    if valid.any():
+        if isinstance(model, ModelEnsemble):
+            result = model.evaluate(features[valid], threshold)
+            probabilities[valid], labels[valid] = result['mean_probability'], result['labels']
+        else:
+            probabilities[valid], labels[valid] = predict_batch(model, features[valid], threshold)
+    return probabilities, labels, valid
@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Prediction export
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Streaming writers for point predictions.
+
+ Predictions are appended chunk by chunk: every chunk is written and
+ released before the next one arrives, so memory stays flat whatever the
+ number of points. Each row holds the coordinates, the feature vector, the
+ predicted label, the flood probability and the model id.
+
+ * GeoPackage (.gpkg) through OGR, one transaction per chunk
+ * Parquet (.parquet) or Feather (.feather / .arrow) through pyarrow, one
+   row group / record batch per chunk, if pyarrow is installed
+"""
+
+import importlib.util
+import os
+import re
+
+import numpy as np
+
+# Rows per GeoPackage transaction / Parquet row group
+DEFAULT_CHUNK_SIZE = 10000
+
+# Output layer name inside a GeoPackage
+GPKG_LAYER_NAME = 'flood_predictions'
+
+# File extension -> format name
+EXPORT_FORMATS = {
+    '.gpkg': 'GPKG',
+    '.parquet': 'Parquet',
+    '.feather': 'Feather',
+    '.arrow': 'Feather',
+}
+
+
+def pyarrow_available():
+    """True if pyarrow can be imported (without importing it)"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def export_format(path):
+    """Format name for ``path`` from its extension.
+
+    :raises ValueError: For unsupported extensions.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{extension}' - use one of {', '.join(EXPORT_FORMATS)}")
+    return EXPORT_FORMATS[extension]
+
+
+def field_names(feature_names):
+    """Column names for the feature vector: safe, unique and not clashing
+    with the fixed prediction columns"""
+    reserved = {'fid', 'geom', 'x', 'y', 'label', 'probability', 'model_id'}
+    names = []
+    for index, name in enumerate(feature_names):
+        field = re.sub(r'\W+', '_', str(name)).strip('_').lower() or f"feature_{index}"
+        if field[0].isdigit():
+            field = f"f_{field}"
+        candidate = field
+        suffix = 1
+        while candidate in reserved or candidate in names:
+            suffix += 1
+            candidate = f"{field}_{suffix}"
+        names.append(candidate)
+    return names
+
+
+class PredictionWriter:
+    """Base class of the streaming writers.
+
+    Use as a context manager, or call ``close()`` when done::
+
+        with open_prediction_writer(path, feature_names, model_id) as writer:
+            for chunk in chunks:
+                writer.write(x, y, features, labels, probabilities)
+    """
+
+    def __init__(self, path, feature_names, model_id=None, crs_wkt=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Constructor.
+
+        :param path: Output file; an existing file is replaced.
+        :type path: str
+
+        :param feature_names: Model feature names, in feature vector order.
+        :type feature_names: list
+
+        :param model_id: Identifier stored with every row.
+        :type model_id: str
+
+        :param crs_wkt: CRS of the coordinates as WKT.
+        :type crs_wkt: str
+
+        :param chunk_size: Maximum rows per transaction / row group.
+        :type chunk_size: int
+        """
+        self.path = path
+        self.feature_names = list(feature_names)
+        self.fields = field_names(self.feature_names)
+        self.model_id = model_id or ''
+        self.crs_wkt = crs_wkt
+        self.chunk_size = max(1, int(chunk_size))
+        self.rows_written = 0
+
+    def write(self, x, y, features, labels, probabilities, model_ids=None):
+        """Append one batch of predictions.
+
+        :param x: X coordinates, shape (n,).
+        :param y: Y coordinates, shape (n,).
+        :param features: Feature matrix, shape (n, n_features).
+        :param labels: Predicted classes, shape (n,).
+        :param probabilities: Flood probabilities, shape (n,).
+        :param model_ids: Optional model id per row; defaults to the
+            writer's model id.
+        """
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float64).ravel()
+        features = np.asarray(features, dtype=np.float64).reshape(len(x), -1)
+        labels = np.asarray(labels).ravel()
+        probabilities = np.asarray(probabilities, dtype=np.float64).ravel()
+        if model_ids is None:
+            model_ids = np.full(len(x), self.model_id, dtype=object)
+        else:
+            model_ids = np.asarray(model_ids, dtype=object).ravel()
+
+        if features.shape[1] != len(self.fields):
+            raise ValueError(f"Expected {len(self.fields)} features per row, got {features.shape[1]}")
+        if not (len(y) == len(labels) == len(probabilities) == len(model_ids) == len(x)):
+            raise ValueError("Coordinates, labels, probabilities and model ids must have the same length")
+
+        # Large batches are split so a transaction / row group stays bounded
+        for start in range(0, len(x), self.chunk_size):
+            stop = start + self.chunk_size
+            self._write_chunk(x[start:stop], y[start:stop], features[start:stop],
+                              labels[start:stop], probabilities[start:stop], model_ids[start:stop])
+            self.rows_written += min(stop, len(x)) - start
+
+    def _write_chunk(self, x, y, features, labels, probabilities, model_ids):
+        raise NotImplementedError
+
+    def close(self):
+        """Flush and close the output file"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class GeoPackageWriter(PredictionWriter):
+    """Point layer in a GeoPackage, written with one transaction per chunk"""
+
+    def __init__(self, path, feature_names, model_id=None, crs_wkt=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        super().__init__(path, feature_names, model_id, crs_wkt, chunk_size)
+        from osgeo import ogr, osr
+        from .raster import _gdal_error
+        self._ogr = ogr
+        self._gdal_error = _gdal_error
+
+        driver = ogr.GetDriverByName('GPKG')
+        if os.path.exists(path) and driver.DeleteDataSource(path) != 0:
+            raise _gdal_error(f"Cannot replace GeoPackage {path}")
+        self._dataset = driver.CreateDataSource(path)
+        if self._dataset is None:
+            raise _gdal_error(f"Cannot create GeoPackage {path}")
+
+        srs = None
+        if crs_wkt:
+            srs = osr.SpatialReference()
+            srs.ImportFromWkt(crs_wkt)
+            srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        self._layer = self._dataset.CreateLayer(GPKG_LAYER_NAME, srs, ogr.wkbPoint, ['SPATIAL_INDEX=YES'])
+        if self._layer is None:
+            self.close()
+            raise _gdal_error(f"Cannot create layer {GPKG_LAYER_NAME} in {path}")
+
+        columns = ([('x', ogr.OFTReal), ('y', ogr.OFTReal)] + [(field, ogr.OFTReal) for field in self.fields]
+                   + [('label', ogr.OFTInteger), ('probability', ogr.OFTReal), ('model_id', ogr.OFTString)])
+        for name, field_type in columns:
+            if self._layer.CreateField(ogr.FieldDefn(name, field_type)) != 0:
+                self.close()
+                raise _gdal_error(f"Cannot create field {name} in {path}")
+        self._definition = self._layer.GetLayerDefn()
+
+    def _write_chunk(self, x, y, features, labels, probabilities, model_ids):
+        ogr = self._ogr
+        n_features = len(self.fields)
+        label_index = 2 + n_features
+
+        if self._layer.StartTransaction() != 0:
+            raise self._gdal_error("Cannot start a GeoPackage transaction")
+        try:
+            for row in range(len(x)):
+                feature = ogr.Feature(self._definition)
+                point = ogr.Geometry(ogr.wkbPoint)
+                point.AddPoint_2D(float(x[row]), float(y[row]))
+                feature.SetGeometryDirectly(point)
+                feature.SetField(0, float(x[row]))
+                feature.SetField(1, float(y[row]))
+                for column in range(n_features):
+                    value = features[row, column]
+                    if np.isfinite(value):
+                        feature.SetField(2 + column, float(value))
+                feature.SetField(label_index, int(labels[row]))
+                feature.SetField(label_index + 1, float(probabilities[row]))
+                feature.SetField(label_index + 2, str(model_ids[row]))
+                if self._layer.CreateFeature(feature) != 0:
+                    raise self._gdal_error(f"Failed to write point {self.rows_written + row}")
+            if self._layer.CommitTransaction() != 0:
+                raise self._gdal_error("Cannot commit a GeoPackage transaction")
+        except Exception:
+            self._layer.RollbackTransaction()
+            raise
+
+    def close(self):
+        if self._dataset is not None:
+            self._dataset.FlushCache()
+            self._layer = None
+            self._dataset = None
+
+
+class ArrowWriter(PredictionWriter):
+    """Columnar Parquet or Feather file written through pyarrow.
+
+    Every chunk becomes one Parquet row group or one Feather record batch.
+    The CRS is stored as schema metadata (``crs_wkt``).
+    """
+
+    def __init__(self, path, feature_names, model_id=None, crs_wkt=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 file_format='Parquet'):
+        super().__init__(path, feature_names, model_id, crs_wkt, chunk_size)
+        import pyarrow as pa
+        self._pa = pa
+
+        columns = [('x', pa.float64()), ('y', pa.float64())]
+        columns += [(field, pa.float64()) for field in self.fields]
+        columns += [('label', pa.uint8()), ('probability', pa.float64()), ('model_id', pa.string())]
+        metadata = {'feature_names': ','.join(self.feature_names)}
+        if crs_wkt:
+            metadata['crs_wkt'] = crs_wkt
+        self._schema = pa.schema(columns, metadata=metadata)
+
+        if file_format == 'Parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self._schema, compression='snappy')
+        else:
+            import pyarrow.ipc as ipc
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = ipc.new_file(self._sink, self._schema)
+        self.file_format = file_format
+
+    def _write_chunk(self, x, y, features, labels, probabilities, model_ids):
+        pa = self._pa
+        arrays = [pa.array(x), pa.array(y)]
+        # NaN feature values (nodata) are stored as nulls
+        arrays += [pa.array(features[:, column], from_pandas=True) for column in range(len(self.fields))]
+        arrays += [
+            pa.array(labels.astype(np.uint8)),
+            pa.array(probabilities),
+            pa.array([str(model_id) for model_id in model_ids], type=pa.string()),
+        ]
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+        if self.file_format == 'Parquet':
+            self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            if self.file_format != 'Parquet':
+                self._sink.close()
+
+
+def open_prediction_writer(path, feature_names, model_id=None, crs_wkt=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Open a streaming writer chosen from the file extension.
+
+    :param path: Output .gpkg, .parquet, .feather or .arrow file.
+    :type path: str
+
+    :returns: A GeoPackageWriter or ArrowWriter.
+    :rtype: PredictionWriter
+
+    :raises ValueError: For unsupported extensions.
+    :raises ImportError: For Parquet/Feather output without pyarrow.
+    """
+    file_format = export_format(path)
+    if file_format == 'GPKG':
+        return GeoPackageWriter(path, feature_names, model_id, crs_wkt, chunk_size)
+    if not pyarrow_available():
+        raise ImportError(f"{file_format} export needs pyarrow - install it or export to GeoPackage (.gpkg)")
+    return ArrowWriter(path, feature_names, model_id, crs_wkt, chunk_size, file_format)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Feature assembly
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Feature names and feature vectors for the model.
+
+ Layer names are mapped to the feature names models are usually trained
+ with, the names and feature count a model expects are read from the
+ model, and named values are assembled into the (n_samples, n_features)
+ float64 matrix the model takes. Values stay floats from sampling to the
+ model; nothing is formatted and parsed back on the way.
+"""
+
+import numpy as np
+
+# Substring of a layer name -> feature name, checked in this order
+FEATURE_NAME_HINTS = {
+    'dem': 'dem1',
+    'elevation': 'dem1',
+    'slope': 'slope1',
+    'aspect': 'aspect1',
+    'twi': 'twi1',
+    'spi': 'spi1',
+    'ndvi': 'ndvi1',
+    'flow': 'flow_accumulation1',
+    'accumulation': 'flow_accumulation1',
+    'weight': 'weights',
+    'weights': 'weights',
+    # Fallback mappings
+    'curvature': 'curvature',
+    'drainage': 'drainage_density',
+    'distance': 'distance_to_water',
+    'soil': 'soil_type',
+    'geology': 'geology',
+    'land': 'landuse',
+    'cover': 'landcover',
+}
+
+
+def suggest_feature_name(layer_name):
+    """Feature name for a layer: a known flood feature or the cleaned name"""
+    clean_name = layer_name.lower().replace(' ', '_').replace('-', '_')
+    for key, value in FEATURE_NAME_HINTS.items():
+        if key in clean_name:
+            return value
+    return clean_name
+
+
+def model_feature_names(model):
+    """Feature names a model was trained with, or None if it does not store them"""
+    if hasattr(model, 'feature_names_in_'):
+        return [str(name) for name in model.feature_names_in_]
+    if hasattr(model, 'feature_names_'):
+        return [str(name) for name in model.feature_names_]
+    booster = getattr(model, 'booster_', None)
+    if booster is not None and hasattr(booster, 'feature_names'):
+        # LightGBM
+        return [str(name) for name in booster.feature_names]
+    return None
+
+
+def model_feature_count(model):
+    """Number of features a model expects, or None if unknown"""
+    names = model_feature_names(model)
+    if names:
+        return len(names)
+    count = getattr(model, 'n_features_in_', None) or getattr(model, 'n_features_', None)
+    return int(count) if count else None
+
+
+def feature_order(names, model):
+    """Column order that puts features called ``names`` into the model's order.
+
+    Every entry point (clicked, queued, served, Processing and area
+    prediction) goes through this, so the same point and layers always get
+    the same probability. The order is only changed when the model stores
+    its feature names and ``names`` are exactly those names, each once, in
+    another order; generic names such as Column_0 carry no order information.
+
+    :returns: Indices into ``names`` in model order, or None to keep the order.
+    :rtype: list
+    """
+    names = list(names)
+    expected = model_feature_names(model) if model is not None else None
+    if expected and names != expected and sorted(names) == sorted(expected) and len(set(names)) == len(names):
+        return [names.index(name) for name in expected]
+    return None
+
+
+def order_for_model(names, items, model):
+    """``names`` and the parallel ``items`` (raster paths, layers, ...) in model feature order.
+
+    :returns: Tuple (names, items) as lists.
+    :rtype: tuple
+    """
+    names, items = list(names), list(items)
+    order = feature_order(names, model)
+    if order is None:
+        return names, items
+    return [names[index] for index in order], [items[index] for index in order]
+
+
+def assemble_features(names, values, model=None):
+    """Feature matrix from named values, in the model's feature order if possible.
+
+    Columns are reordered to the model's feature order as described in
+    feature_order().
+
+    :param names: Feature names, one per column.
+    :type names: list
+
+    :param values: Values of shape (n_features,) or (n_samples, n_features).
+
+    :param model: Fitted model whose feature order is used.
+
+    :returns: Tuple (names, features) with features of shape
+        (n_samples, n_features), float64.
+    :rtype: tuple
+
+    :raises ValueError: if the number of names and columns differ.
+    """
+    names = list(names)
+    features = np.asarray(values, dtype=np.float64)
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+    if features.shape[1] != len(names):
+        raise ValueError(f"{len(names)} feature names for {features.shape[1]} feature values")
+
+    order = feature_order(names, model)
+    if order is not None:
+        return [names[index] for index in order], features[:, order]
+    return names, features
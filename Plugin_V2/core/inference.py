@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Inference
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Single-pass model inference.
+
+ The flood probability is computed with ONE model call and the class label is
+ derived from it with a user-configurable decision threshold, so there is no
+ second predict() call and no silent 0.5 fallback.
+
+ This module imports NumPy at import time; the plugin only imports it from
+ the methods that need it.
+"""
+
+import numpy as np
+
+# Label of the flood class in binary flood models
+FLOOD_CLASS = 1
+
+# Default probability above which a sample is classified as "Flood Risk"
+DEFAULT_THRESHOLD = 0.5
+
+# Rows per model call in predict_batch, bounds the temporary memory per call
+DEFAULT_BATCH_SIZE = 65536
+
+# Nodata values written to the probability and class rasters
+PROBABILITY_NODATA = -9999.0
+CLASS_NODATA = 255
+
+
+def is_lightgbm_model(model):
+    """Return True for LightGBM sklearn-API models"""
+    model_type = type(model).__name__.upper()
+    return 'LGB' in model_type or 'LIGHTGBM' in model_type
+
+
+def positive_class_index(model):
+    """Column of predict_proba() output that holds the flood class probability.
+
+    Uses the model's ``classes_`` when available so that models trained with
+    labels like [0, 1], [False, True] or ['0', '1'] are all handled. Falls back
+    to the last column, which is the positive class for binary classifiers.
+
+    :param model: A fitted classifier.
+
+    :returns: Column index, or -1 when it cannot be determined.
+    :rtype: int
+    """
+    classes = getattr(model, 'classes_', None)
+    if classes is not None:
+        for index, label in enumerate(list(classes)):
+            if label is True or str(label) == str(FLOOD_CLASS):
+                return index
+    return -1
+
+
+def _probability_column(proba, model):
+    """Reduce raw predict_proba output to a 1-D flood probability array"""
+    proba = np.asarray(proba, dtype=np.float64)
+    if proba.ndim == 1:
+        # Boosters of binary models return the positive class probability only
+        return proba
+    if proba.ndim == 2 and proba.shape[1] == 1:
+        return proba[:, 0]
+    if proba.ndim == 2:
+        return proba[:, positive_class_index(model)]
+    raise ValueError(f"Unexpected predict_proba output shape: {proba.shape}")
+
+
+def predict_probabilities(model, features):
+    """Compute the flood probability for every row of ``features``.
+
+    The probability comes from a single model call:
+
+    * ``predict_proba`` for classifiers (with the LightGBM booster as fallback
+      when the sklearn wrapper fails, see v2.4.0 LightGBM fixes)
+    * ``predict`` for models without ``predict_proba`` (regressors, or
+      classifiers trained without probability support); the output is
+      clipped to [0, 1]
+
+    :param model: A fitted model.
+
+    :param features: Feature matrix of shape (n_samples, n_features).
+    :type features: numpy.ndarray
+
+    :returns: Flood probabilities of shape (n_samples,).
+    :rtype: numpy.ndarray
+
+    :raises RuntimeError: If the model call fails. Failures are never hidden
+        behind a default probability.
+    """
+    features = np.asarray(features, dtype=np.float64)
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+    n_samples = features.shape[0]
+    if n_samples == 0:
+        return np.empty(0, dtype=np.float64)
+
+    predict_proba = getattr(model, 'predict_proba', None)
+    try:
+        if callable(predict_proba):
+            try:
+                probabilities = _probability_column(predict_proba(features), model)
+            except Exception:
+                booster = getattr(model, 'booster_', None)
+                if not is_lightgbm_model(model) or booster is None:
+                    raise
+                # LightGBM wrapper can fail on models pickled with another
+                # version; the booster predicts the probability directly
+                probabilities = _probability_column(booster.predict(features), model)
+        else:
+            probabilities = np.clip(np.asarray(model.predict(features), dtype=np.float64).ravel(), 0.0, 1.0)
+    except Exception as e:
+        raise RuntimeError(f"Model prediction failed: {str(e)}") from e
+
+    if probabilities.shape[0] != n_samples:
+        raise RuntimeError(
+            f"Model returned {probabilities.shape[0]} probabilities for {n_samples} samples")
+    return probabilities
+
+
+def classify(probabilities, threshold=DEFAULT_THRESHOLD):
+    """Derive class labels from probabilities.
+
+    :param probabilities: Flood probabilities.
+    :type probabilities: numpy.ndarray
+
+    :param threshold: Probabilities greater than or equal to this value are
+        labelled as flood (1).
+    :type threshold: float
+
+    :returns: uint8 labels (0 = no flood, 1 = flood), same shape as input.
+    :rtype: numpy.ndarray
+    """
+    if not 0.0 <= threshold <= 1.0:
+        raise ValueError(f"Decision threshold must be between 0 and 1, got {threshold}")
+    return (np.asarray(probabilities) >= threshold).astype(np.uint8)
+
+
+def predict_batch(model, features, threshold=DEFAULT_THRESHOLD, batch_size=DEFAULT_BATCH_SIZE):
+    """Vectorized probability and class prediction for many samples.
+
+    Rows are fed to the model in chunks of ``batch_size`` so that very large
+    batches do not create model-internal temporaries of the full size.
+
+    :param model: A fitted model.
+
+    :param features: Feature matrix of shape (n_samples, n_features).
+    :type features: numpy.ndarray
+
+    :param threshold: Decision threshold for the flood class.
+    :type threshold: float
+
+    :param batch_size: Maximum number of rows per model call.
+    :type batch_size: int
+
+    :returns: Tuple (probabilities, labels), both of shape (n_samples,).
+    :rtype: tuple
+    """
+    features = np.asarray(features, dtype=np.float64)
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+
+    probabilities = np.empty(features.shape[0], dtype=np.float64)
+    for start in range(0, features.shape[0], batch_size):
+        stop = start + batch_size
+        probabilities[start:stop] = predict_probabilities(model, features[start:stop])
+
+    return probabilities, classify(probabilities, threshold)
+
+
+def predict_block(model, feature_block, valid_mask=None, threshold=DEFAULT_THRESHOLD):
+    """Predict probability and class rasters for one block of pixels.
+
+    Only valid pixels are sent to the model. Both outputs are produced from
+    the same probabilities, i.e. in the same pass.
+
+    :param model: A fitted model.
+
+    :param feature_block: Feature values of shape (n_features, rows, cols).
+    :type feature_block: numpy.ndarray
+
+    :param valid_mask: Boolean array of shape (rows, cols); False marks
+        nodata pixels. Defaults to pixels where every feature is finite.
+    :type valid_mask: numpy.ndarray
+
+    :param threshold: Decision threshold for the flood class.
+    :type threshold: float
+
+    :returns: Tuple (probability, labels): a float32 raster using
+        PROBABILITY_NODATA and a uint8 raster using CLASS_NODATA for
+        invalid pixels.
+    :rtype: tuple
+    """
+    n_features, rows, cols = feature_block.shape
+    if valid_mask is None:
+        valid_mask = np.all(np.isfinite(feature_block), axis=0)
+
+    probability = np.full((rows, cols), PROBABILITY_NODATA, dtype=np.float32)
+    labels = np.full((rows, cols), CLASS_NODATA, dtype=np.uint8)
+
+    if valid_mask.any():
+        # (n_features, n_valid) -> (n_valid, n_features)
+        samples = feature_block[:, valid_mask].T
+        block_probabilities, block_labels = predict_batch(model, samples, threshold)
+        probability[valid_mask] = block_probabilities
+        labels[valid_mask] = block_labels
+
+    return probability, labels
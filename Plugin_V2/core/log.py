@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Structured logging
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Level-gated logging with per-run summaries and a ring buffer.
+
+ Messages take %-style arguments and key=value fields and are only formatted
+ when their level is enabled. Every event, enabled or not, is kept
+ unformatted in a ring buffer of recent events that is formatted and sent to
+ the sink when something fails. Loops count into a RunLog and emit one
+ summary line at the end instead of one line per layer or point.
+
+ The sink is a callable (level, message); the plugin passes one that writes
+ to QgsMessageLog, so this module does not import QGIS.
+"""
+
+import time
+from collections import Counter, deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+CRITICAL = 40
+
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', WARNING: 'warning', CRITICAL: 'critical'}
+
+# Events kept for dump_recent()
+RECENT_EVENTS = 200
+
+# Notes listed per counter in a run summary, e.g. the names of failed layers
+SUMMARY_NOTES = 5
+
+
+def parse_level(name, default=INFO):
+    """Level constant for a name such as 'debug' (case-insensitive)"""
+    for level, level_name in LEVEL_NAMES.items():
+        if str(name).strip().lower() == level_name:
+            return level
+    return default
+
+
+def format_event(message, args, fields):
+    """``message % args`` followed by the fields as key=value"""
+    text = message % args if args else message
+    if fields:
+        text += " | " + " ".join(f"{key}={value}" for key, value in fields.items())
+    return text
+
+
+class StructuredLogger:
+    """Logger that formats only enabled messages and remembers recent events.
+
+    :param sink: Callable (level, message) receiving enabled messages;
+        None discards them (the ring buffer is still filled).
+
+    :param level: Lowest level sent to the sink.
+    :type level: int
+
+    :param buffer_size: Number of recent events kept for dump_recent().
+    :type buffer_size: int
+    """
+
+    def __init__(self, sink=None, level=INFO, buffer_size=RECENT_EVENTS):
+        self.sink = sink
+        self.level = level
+        self._recent = deque(maxlen=buffer_size)
+
+    def is_enabled(self, level):
+        """Whether messages of ``level`` reach the sink; guard costly arguments with it"""
+        return self.sink is not None and level >= self.level
+
+    def log(self, level, message, *args, **fields):
+        # Unformatted: formatting happens only if the event is emitted or dumped
+        self._recent.append((time.time(), level, message, args, fields))
+        if self.is_enabled(level):
+            self.sink(level, format_event(message, args, fields))
+
+    def debug(self, message, *args, **fields):
+        self.log(DEBUG, message, *args, **fields)
+
+    def info(self, message, *args, **fields):
+        self.log(INFO, message, *args, **fields)
+
+    def warning(self, message, *args, **fields):
+        self.log(WARNING, message, *args, **fields)
+
+    def critical(self, message, *args, **fields):
+        self.log(CRITICAL, message, *args, **fields)
+
+    def recent(self, limit=None):
+        """Formatted lines of the buffered events, oldest first"""
+        events = list(self._recent)[-limit:] if limit else list(self._recent)
+        lines = []
+        for timestamp, level, message, args, fields in events:
+            try:
+                text = format_event(message, args, fields)
+            except (TypeError, ValueError) as e:
+                text = f"{message!r} (could not format: {e})"
+            clock = time.strftime('%H:%M:%S', time.localtime(timestamp)) + f".{int(timestamp * 1000) % 1000:03d}"
+            lines.append(f"{clock} {LEVEL_NAMES.get(level, level):8s} {text}")
+        return lines
+
+    def dump_recent(self, level=INFO, limit=None):
+        """Send the buffered events to the sink as one message, e.g. after an error"""
+        lines = self.recent(limit)
+        if self.sink is not None and lines:
+            self.sink(level, f"Recent events ({len(lines)}):\n" + "\n".join(lines))
+
+    def clear(self):
+        self._recent.clear()
+
+    def run(self, name, **fields):
+        """RunLog collecting counts for one summary line of a run called ``name``"""
+        return RunLog(self, name, **fields)
+
+
+class RunLog:
+    """Counters of one run (extraction, prediction, ...) logged as a single line.
+
+    Used as a context manager or finished explicitly::
+
+        run = logger.run('extract', layers=3)
+        run.count('extracted')
+        run.count('failed', note='slope')
+        run.finish()   # info: "extract done in 4.1 ms | layers=3 extracted=2 failed=1 (slope)"
+
+    Leaving the ``with`` block through an exception logs the summary as
+    critical and dumps the recent events.
+    """
+
+    def __init__(self, logger, name, **fields):
+        self.logger = logger
+        self.name = name
+        self.fields = dict(fields)
+        self.counts = Counter()
+        self.notes = {}
+        self.start = time.perf_counter()
+        self.finished = False
+
+    def count(self, key, n=1, note=None):
+        """Add ``n`` to counter ``key``; ``note`` (e.g. a layer name) is listed in the summary"""
+        self.counts[key] += n
+        if note is not None:
+            notes = self.notes.setdefault(key, [])
+            if len(notes) < SUMMARY_NOTES:
+                notes.append(str(note))
+
+    def set(self, **fields):
+        """Add or replace fields of the summary line"""
+        self.fields.update(fields)
+
+    def summary(self):
+        """Summary fields: the set fields, then the counters (with their notes)"""
+        fields = dict(self.fields)
+        for key, value in self.counts.items():
+            notes = self.notes.get(key)
+            if notes:
+                more = ", ..." if value > len(notes) else ""
+                fields[key] = f"{value} ({', '.join(notes)}{more})"
+            else:
+                fields[key] = value
+        return fields
+
+    def finish(self, level=INFO):
+        """Log the summary line once"""
+        if self.finished:
+            return
+        self.finished = True
+        milliseconds = (time.perf_counter() - self.start) * 1000.0
+        self.logger.log(level, "%s done in %.1f ms", self.name, milliseconds, **self.summary())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.set(error=exc_value)
+            self.finish(CRITICAL)
+            self.logger.dump_recent()
+        else:
+            self.finish()
+        return False
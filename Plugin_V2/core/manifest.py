@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Tile manifests
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Per-tile bookkeeping stored next to an area prediction output.
+
+ A manifest is a small JSON sidecar (``<output>.manifest.json``) that
+ records the grid, the tiling, the run settings (model fingerprint,
+ threshold, output bands, ...) and, for every tile, a fingerprint of the
+ input data it was computed from. A later run over changed inputs can
+ compare fingerprints and recompute only the tiles whose inputs changed.
+
+ The manifest also carries a completion bitmap and the job state. It is
+ rewritten at checkpoints after the outputs were flushed, so a job that was
+ canceled or died with QGIS can resume from the tiles already on disk.
+"""
+
+import base64
+import hashlib
+import json
+import os
+
+import numpy as np
+
+MANIFEST_VERSION = 2
+
+# Job states: outputs in progress (resumable), finished, or canceled and closed
+STATE_RUNNING = 'running'
+STATE_COMPLETE = 'complete'
+STATE_CANCELED = 'canceled'
+
+# Fingerprint digest size in bytes
+DIGEST_SIZE = 16
+
+
+def manifest_path_for(output_path):
+    """Sidecar manifest path of an output raster"""
+    return output_path + '.manifest.json'
+
+
+def file_fingerprint(path, chunk_size=1 << 20):
+    """Digest of a file's contents, read in chunks"""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_fingerprint(model, model_paths=None):
+    """Digest identifying a model: its files if known, else its pickle"""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    if model_paths:
+        for path in model_paths:
+            digest.update(file_fingerprint(path).encode())
+    else:
+        import pickle
+        digest.update(pickle.dumps(model, protocol=4))
+    return digest.hexdigest()
+
+
+def settings_fingerprint(settings):
+    """Digest of a JSON-serializable settings dictionary"""
+    encoded = json.dumps(settings, sort_keys=True).encode()
+    return hashlib.blake2b(encoded, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def tile_fingerprint(features, settings_digest):
+    """Digest of one tile's feature cube under the given run settings.
+
+    NaN (nodata) patterns are part of the data, so a pixel that becomes
+    valid or invalid changes the fingerprint.
+    """
+    digest = hashlib.blake2b(settings_digest.encode(), digest_size=DIGEST_SIZE)
+    digest.update(np.ascontiguousarray(features, dtype=np.float32).data)
+    return digest.hexdigest()
+
+
+def input_stamps(paths):
+    """Size and modification time of every input file (None for non-files).
+
+    A resumed job requires unchanged stamps; completed tiles are not read again.
+    """
+    stamps = []
+    for path in paths:
+        if os.path.isfile(path):
+            status = os.stat(path)
+            stamps.append([path, status.st_size, status.st_mtime_ns])
+        else:
+            stamps.append([path, None, None])
+    return stamps
+
+
+def grid_description(grid):
+    """JSON-serializable description of a RasterGrid"""
+    return {
+        'width': grid.width,
+        'height': grid.height,
+        'geotransform': list(grid.geotransform),
+        'projection': grid.projection,
+    }
+
+
+class TileManifest:
+    """Grid, settings, job state and per-tile records of one output"""
+
+    def __init__(self, path, grid, tile_size, n_tiles, settings):
+        """Constructor.
+
+        :param path: Manifest file path (see manifest_path_for).
+        :type path: str
+
+        :param grid: Output grid (RasterGrid) or its grid_description().
+
+        :param tile_size: Tile edge in pixels.
+        :type tile_size: int
+
+        :param n_tiles: Number of tiles.
+        :type n_tiles: int
+
+        :param settings: JSON-serializable run settings.
+        :type settings: dict
+        """
+        self.path = path
+        self.grid = grid if isinstance(grid, dict) else grid_description(grid)
+        self.tile_size = int(tile_size)
+        self.settings = settings
+        self.fingerprints = [None] * n_tiles
+        # Per-tile [valid_pixels, flood_pixels], so reused tiles keep their counts
+        self.counts = [None] * n_tiles
+        self.completed = np.zeros(n_tiles, dtype=bool)
+        self.state = STATE_RUNNING
+        self.inputs = None
+
+    @property
+    def n_tiles(self):
+        return len(self.fingerprints)
+
+    def mark_done(self, index, valid_pixels, flood_pixels):
+        """Record a tile as written"""
+        self.completed[index] = True
+        self.counts[index] = [int(valid_pixels), int(flood_pixels)]
+
+    def matches(self, grid, tile_size, settings):
+        """True if this manifest describes the same grid, tiling and settings.
+
+        :param grid: RasterGrid or grid_description().
+        """
+        if not isinstance(grid, dict):
+            grid = grid_description(grid)
+        return (self.grid == json.loads(json.dumps(grid))
+                and self.tile_size == int(tile_size)
+                and self.settings == json.loads(json.dumps(settings)))
+
+    def to_dict(self):
+        return {
+            'version': MANIFEST_VERSION,
+            'grid': self.grid,
+            'tile_size': self.tile_size,
+            'settings': self.settings,
+            'fingerprints': self.fingerprints,
+            'counts': self.counts,
+            'completed': base64.b64encode(np.packbits(self.completed).tobytes()).decode('ascii'),
+            'state': self.state,
+            'inputs': self.inputs,
+        }
+
+    def save(self):
+        """Write the manifest atomically (temporary file, then rename).
+
+        Call it only after the outputs were flushed: a tile marked completed
+        must already be on disk.
+        """
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, self.path)
+
+    @classmethod
+    def load(cls, path):
+        """Read a manifest; None if it is missing, unreadable or outdated"""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != MANIFEST_VERSION:
+            return None
+        manifest = cls(path, data['grid'], data['tile_size'], len(data['fingerprints']), data['settings'])
+        manifest.fingerprints = data['fingerprints']
+        manifest.counts = data['counts']
+        packed = np.frombuffer(base64.b64decode(data['completed']), dtype=np.uint8)
+        manifest.completed = np.unpackbits(packed, count=manifest.n_tiles).astype(bool)
+        manifest.state = data['state']
+        manifest.inputs = data['inputs']
+        return manifest
+
+    def remove(self):
+        """Delete the manifest file if it exists"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
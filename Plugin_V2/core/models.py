@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Model files
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Loading and validating trained model files.
+
+ Files written with joblib.dump are loaded with ``mmap_mode='r'``: the
+ NumPy arrays stored uncompressed in the file are memory-mapped instead of
+ copied, so loading skips reading them up front and processes using the
+ same model (QGIS sessions, area prediction workers) share one copy in the
+ page cache. The file must not be replaced while the model is in use.
+ Arrays that a model copies into its own buffers on unpickling (the node
+ arrays of scikit-learn trees) are still copied; compressed joblib files
+ cannot be mapped and are read normally.
+"""
+
+import os
+import pickle
+
+# Extensions always loaded with joblib
+JOBLIB_EXTENSIONS = ('.joblib', '.jbl')
+
+# Class that joblib writes in place of every NumPy array it stores
+_JOBLIB_MARKER = b'NumpyArrayWrapper'
+
+# Leading bytes searched for the marker; model parameters come before the arrays
+_JOBLIB_SNIFF_BYTES = 1 << 20
+
+# Magic numbers of the compressed formats joblib writes
+_COMPRESSED_MAGIC = (b'ZF', b'x\x01', b'x\x5e', b'x\x9c', b'x\xda', b'\x1f\x8b', b'BZh', b'\xfd7zXZ', b'\x5d\x00\x00', b'\x04\x22\x4d\x18')
+
+
+def is_joblib_file(path):
+    """True if ``path`` was written by joblib.dump (whatever its extension)"""
+    if os.path.splitext(path)[1].lower() in JOBLIB_EXTENSIONS:
+        return True
+    with open(path, 'rb') as f:
+        head = f.read(_JOBLIB_SNIFF_BYTES)
+    return head.startswith(_COMPRESSED_MAGIC) or _JOBLIB_MARKER in head
+
+
+def load_model_file(path, mmap=True):
+    """Load a pickled or joblib model and validate its interface.
+
+    Only checks that the model has a callable ``predict`` (see
+    validate_model); no prediction is run.
+
+    :param path: Path to a .pkl or .joblib model file.
+    :type path: str
+
+    :param mmap: Memory-map the arrays of joblib files (read-only).
+    :type mmap: bool
+
+    :returns: The validated model.
+
+    :raises ValueError, AttributeError, TypeError: If the file does not
+        contain a usable model.
+    :raises ImportError: If the file needs joblib and it is not installed.
+    """
+    if is_joblib_file(path):
+        try:
+            import joblib
+        except ImportError:
+            raise ImportError("No module named 'joblib' - it is needed to load joblib model files")
+        model = joblib.load(path, mmap_mode='r' if mmap else None)
+    else:
+        with open(path, 'rb') as f:
+            model = pickle.load(f)
+    validate_model(model)
+    return model
+
+
+def validate_model(model):
+    """Raise if ``model`` has no callable predict method"""
+    if model is None:
+        raise ValueError("Model loaded as None - the file may be corrupted")
+
+    if not hasattr(model, 'predict'):
+        raise AttributeError(f"Loaded model (type: {type(model).__name__}) does not have a predict method")
+
+    if not callable(model.predict):
+        raise TypeError(f"Model predict attribute is not callable (type: {type(model.predict)})")
+
+
+def model_id_from_path(path):
+    """Short model identifier used in outputs: the file name without extension"""
+    return os.path.splitext(os.path.basename(path))[0]
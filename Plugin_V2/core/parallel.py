@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Worker processes
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Process pools that work from inside QGIS.
+
+ Inside QGIS ``sys.executable`` is the QGIS binary, not a Python
+ interpreter, so worker processes must be spawned with the Python
+ interpreter that QGIS embeds. Workers always use the 'spawn' start method:
+ forking a running Qt application is not safe.
+
+ Large arrays are exchanged with workers through SharedBuffer segments
+ instead of being pickled with every task.
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def python_executable():
+    """Path of a Python interpreter usable for worker processes"""
+    executable_name = os.path.basename(sys.executable).lower()
+    if executable_name.startswith('python'):
+        return sys.executable
+
+    # Running embedded (QGIS): look for the interpreter next to the prefix
+    candidates = [
+        os.path.join(sys.exec_prefix, 'python.exe'),
+        os.path.join(sys.exec_prefix, 'python3.exe'),
+        os.path.join(sys.exec_prefix, 'bin', 'python3'),
+        os.path.join(sys.exec_prefix, 'bin', 'python'),
+    ]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    raise RuntimeError(f"No Python interpreter found for worker processes under {sys.exec_prefix}")
+
+
+def spawn_context():
+    """A 'spawn' multiprocessing context that uses python_executable()"""
+    context = multiprocessing.get_context('spawn')
+    context.set_executable(python_executable())
+    return context
+
+
+def default_workers():
+    """Number of worker processes to use when the user asks for 'all cores'"""
+    return max(1, (os.cpu_count() or 1))
+
+
+def process_pool(workers, initializer=None, initargs=()):
+    """Create a ProcessPoolExecutor whose workers run ``initializer`` once.
+
+    :param workers: Number of processes, 0 or None for one per CPU core.
+    :type workers: int
+
+    :param initializer: Called once in every worker, e.g. to load models.
+
+    :param initargs: Arguments for ``initializer``.
+    :type initargs: tuple
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers or default_workers(),
+        mp_context=spawn_context(),
+        initializer=initializer,
+        initargs=initargs)
+
+
+class SharedBuffer:
+    """A NumPy array backed by ``multiprocessing.shared_memory``.
+
+    The creating process owns the segment and must call ``unlink()``; worker
+    processes attach to it by name through ``SharedBuffer.attach(spec)`` and
+    read or write the same memory without any pickling of array data.
+    """
+
+    def __init__(self, shape, dtype, name=None):
+        """Create a new segment, or attach to segment ``name`` if given"""
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._memory.buf)
+
+    @classmethod
+    def attach(cls, spec):
+        """Attach to a segment described by ``spec()`` of its owner"""
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    def spec(self):
+        """Picklable (name, shape, dtype) description for worker processes"""
+        return self._memory.name, self.shape, self.dtype.str
+
+    def close(self):
+        """Detach from the segment (does not free it)"""
+        # Views into the buffer must be released before the mmap can close
+        self.array = None
+        self._memory.close()
+
+    def unlink(self):
+        """Detach and free the segment; only the owner should call this"""
+        self.close()
+        if self.owner:
+            self._memory.unlink()
+
+
+def slot_view(flat_slot, shape):
+    """C-contiguous view of ``shape`` at the start of a flat buffer slot.
+
+    Buffers are allocated as (n_slots, slot_size) so that edge tiles, which
+    are smaller than a full tile, still get a contiguous array to read into.
+    """
+    count = int(np.prod(shape))
+    return flat_slot[:count].reshape(shape)
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Streaming tile pipeline
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Generator stages connected by bounded queues.
+
+ Area prediction streams tiles through read (aligned through warped VRTs
+ where needed) -> assemble features -> predict -> write. Each stage runs
+ ahead of the next one by at most its queue depth, so reading the next tile
+ overlaps with predicting and writing the current one, while the number of
+ tiles held in memory stays fixed regardless of the raster size. GDAL and
+ most model code release the GIL while they work, so threads are enough
+ for this overlap.
+
+ The memory helpers turn a peak-memory ceiling into a pipeline depth (or a
+ number of worker slots). They count tile buffers and per-tile prediction
+ scratch; the loaded model itself is not included. TileGauge measures the
+ tiles actually in flight so the count can be checked against
+ tiles_in_flight().
+"""
+
+import contextlib
+import queue
+import threading
+
+from .profiling import active_capture
+
+# Tiles a stage may run ahead of its consumer by default
+DEFAULT_DEPTH = 2
+
+# Predicted tiles waiting for the writer: the writer is the last stage, a
+# deeper queue would only hold more output tiles in memory
+PREDICT_DEPTH = 1
+
+# Seconds between checks for a stopped consumer while a queue is full
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class _StageError:
+    """Exception raised in a stage thread, re-raised in the consumer"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def pipelined(items, function, depth=DEFAULT_DEPTH, name='pipeline-stage'):
+    """Apply ``function`` to ``items`` in a background thread.
+
+    Results are yielded in input order. At most ``depth`` results wait in
+    the queue; the thread blocks until the consumer takes one. Closing the
+    generator (or leaving a for-loop early) stops the thread and closes
+    ``items`` if it is itself a generator, so chained stages shut down
+    together. Exceptions in ``function`` are raised in the consumer. Under
+    an active core.profiling.ProfileCapture the thread is profiled too.
+
+    :param items: Iterable of inputs, read from the stage thread only.
+
+    :param function: Called once per item.
+
+    :param depth: Queue size, at least 1.
+    :type depth: int
+
+    :param name: Thread name.
+    :type name: str
+    """
+    results = queue.Queue(maxsize=max(1, int(depth)))
+    stop = threading.Event()
+    capture = active_capture()
+
+    def put(result):
+        while not stop.is_set():
+            try:
+                results.put(result, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run():
+        profiling = capture.profile_thread() if capture is not None else contextlib.nullcontext()
+        with profiling:
+            try:
+                for item in items:
+                    if stop.is_set() or not put(function(item)):
+                        return
+                put(_DONE)
+            except BaseException as error:
+                put(_StageError(error))
+            finally:
+                close = getattr(items, 'close', None)
+                if close is not None:
+                    close()
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            result = results.get()
+            if result is _DONE:
+                return
+            if isinstance(result, _StageError):
+                raise result.error
+            yield result
+    finally:
+        stop.set()
+        thread.join()
+
+
+def tile_memory(n_features, n_bands, tile_size):
+    """Bytes of one tile in flight: float32 features and bands, uint8 labels"""
+    return tile_size * tile_size * (4 * n_features + 4 * n_bands + 1)
+
+
+def prediction_scratch(n_features, n_bands, tile_size, model_scratch=0):
+    """Bytes of temporary arrays while one tile is predicted.
+
+    The valid pixel rows are copied out of the feature cube and
+    probabilities come back as float64; ``model_scratch`` adds the model's
+    own bytes per pixel (see core.tiling.model_scratch_per_pixel).
+    """
+    return tile_size * tile_size * (4 * n_features + 8 * n_bands + model_scratch)
+
+
+def tiles_in_flight(depth):
+    """Most tiles between the start of a read and the end of their write.
+
+    One being read, ``depth`` queued for the predictor, one being predicted,
+    PREDICT_DEPTH queued for the writer and one being written.
+    """
+    return depth + PREDICT_DEPTH + 3
+
+
+def pipeline_memory(depth, n_features, n_bands, tile_size, model_scratch=0):
+    """Peak bytes of a read stage of ``depth`` feeding a predict stage of PREDICT_DEPTH.
+
+    Tiles up to and including the one being predicted hold float32
+    features and a validity mask (depth + 2 of them); from there on they
+    hold float32 bands and uint8 labels (PREDICT_DEPTH + 2, counting the
+    predictor's output while it waits for the queue).
+    """
+    pixels = tile_size * tile_size
+    read_tiles = (depth + 2) * pixels * (4 * n_features + 1)
+    predicted_tiles = (PREDICT_DEPTH + 2) * pixels * (4 * n_bands + 1)
+    return read_tiles + predicted_tiles + prediction_scratch(n_features, n_bands, tile_size, model_scratch)
+
+
+def pipeline_depth(memory_limit, n_features, n_bands, tile_size, model_scratch=0):
+    """Largest read-stage depth whose tiles fit into ``memory_limit`` bytes.
+
+    See pipeline_memory() for what is counted.
+
+    :raises ValueError: if not even a depth of 1 fits.
+    """
+    fixed = pipeline_memory(0, n_features, n_bands, tile_size, model_scratch)
+    per_tile = tile_size * tile_size * (4 * n_features + 1)
+    depth = (memory_limit - fixed) // per_tile
+    if depth < 1:
+        minimum = fixed + per_tile
+        raise ValueError(f"A memory limit of {memory_limit / 2 ** 20:.0f} MB is too small for "
+                         f"{tile_size} px tiles of {n_features} features (needs {minimum / 2 ** 20:.0f} MB); "
+                         f"use smaller tiles or a higher limit")
+    return int(depth)
+
+
+class TileGauge:
+    """Thread-safe count of tiles in flight and its peak.
+
+    The reader calls enter() before reading a tile and the consumer calls
+    leave() once it is written; ``peak`` can then be compared with
+    tiles_in_flight().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def enter(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def leave(self):
+        with self._lock:
+            self.current -= 1
+
+
+def worker_slots(memory_limit, workers, n_features, n_bands, tile_size, model_scratch=0):
+    """Shared-memory tile slots for ``workers`` processes within ``memory_limit``.
+
+    Every worker needs at least one slot and its own prediction scratch.
+
+    :returns: Tuple (workers, slots), with workers reduced if needed.
+    :rtype: tuple
+
+    :raises ValueError: if not even one worker fits.
+    """
+    per_tile = tile_memory(n_features, n_bands, tile_size)
+    scratch = prediction_scratch(n_features, n_bands, tile_size, model_scratch)
+    workers = min(workers, memory_limit // (per_tile + scratch))
+    if workers < 1:
+        raise ValueError(f"A memory limit of {memory_limit / 2 ** 20:.0f} MB is too small for "
+                         f"{tile_size} px tiles of {n_features} features; use smaller tiles or a higher limit")
+    slots = (memory_limit - workers * scratch) // per_tile
+    return int(workers), int(slots)
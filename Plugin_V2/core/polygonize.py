@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Flood extent polygons
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Vector flood-extent polygons from a probability raster, out of core.
+
+ 1. Every tile is thresholded and its connected components are labelled
+    (scipy.ndimage.label, linear time). Labels get globally unique ids and
+    are written to a label raster on disk; pixel counts and probability
+    sums are accumulated per id with np.bincount.
+ 2. Components that continue across tile borders are merged with a
+    union-find over the border pixel pairs only.
+ 3. Ids are resolved to their component, components below the minimum area
+    are dropped, and the label raster is rewritten in place tile by tile.
+ 4. gdal.Polygonize vectorizes the label raster (it streams the raster);
+    polygons are simplified and written to a GeoPackage with area and mean
+    probability attributes.
+
+ Only one tile row of labels and the per-component counters are in memory,
+ so rasters larger than memory are supported.
+"""
+
+import os
+import time
+
+import numpy as np
+from osgeo import gdal, ogr
+
+from .area import DEFAULT_TILE_SIZE, is_canceled, report_progress
+from .inference import DEFAULT_THRESHOLD
+from .raster import GTIFF_OPTIONS, RasterGrid, _gdal_error, create_raster, iter_windows, open_raster, read_probability, write_window
+
+# Output layer name inside the GeoPackage
+EXTENT_LAYER_NAME = 'flood_extent'
+
+# Polygons per GeoPackage transaction
+FEATURES_PER_TRANSACTION = 1000
+
+
+class UnionFind:
+    """Disjoint sets over consecutive integer ids; id 0 is the background"""
+
+    def __init__(self, capacity=1024):
+        self.parent = np.arange(max(2, capacity), dtype=np.int64)
+        self.size = 1
+
+    def add(self, count):
+        """Add ``count`` new singleton sets and return the first new id"""
+        first = self.size
+        needed = first + count
+        if needed > len(self.parent):
+            capacity = max(needed, 2 * len(self.parent))
+            grown = np.arange(capacity, dtype=np.int64)
+            grown[:self.size] = self.parent[:self.size]
+            self.parent = grown
+        self.size = needed
+        return first
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            # Path halving
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union_pairs(self, pairs):
+        """Merge the sets of every (a, b) row of ``pairs``"""
+        for a, b in pairs:
+            root_a, root_b = self.find(a), self.find(b)
+            if root_a != root_b:
+                # Keep the smaller id as root so results are deterministic
+                if root_a < root_b:
+                    self.parent[root_b] = root_a
+                else:
+                    self.parent[root_a] = root_b
+
+    def roots(self):
+        """Root of every id, resolved for all ids at once by pointer jumping"""
+        parent = self.parent[:self.size].copy()
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                return parent
+            parent = grandparent
+
+
+class _Accumulator:
+    """Growable per-id pixel counts and probability sums"""
+
+    def __init__(self):
+        self.counts = np.zeros(1024, dtype=np.int64)
+        self.sums = np.zeros(1024, dtype=np.float64)
+
+    def add(self, first, counts, sums):
+        needed = first + len(counts)
+        if needed > len(self.counts):
+            capacity = max(needed, 2 * len(self.counts))
+            self.counts = np.resize(self.counts, capacity)
+            self.sums = np.resize(self.sums, capacity)
+        self.counts[first:needed] = counts
+        self.sums[first:needed] = sums
+
+
+def _border_pairs(current, neighbour, diagonal):
+    """Label pairs of two touching pixel lines that are both foreground.
+
+    ``current`` and ``neighbour`` are aligned 1-D label arrays; with
+    ``diagonal`` the neighbours one position to each side are paired too.
+    """
+    pairs = [np.column_stack([current, neighbour])]
+    if diagonal:
+        pairs.append(np.column_stack([current[1:], neighbour[:-1]]))
+        pairs.append(np.column_stack([current[:-1], neighbour[1:]]))
+    pairs = np.concatenate(pairs)
+    pairs = pairs[(pairs[:, 0] > 0) & (pairs[:, 1] > 0)]
+    return np.unique(pairs, axis=0) if len(pairs) else pairs
+
+
+def _label_tiles(band, label_ds, grid, threshold, tile_size, eight_connected, feedback, progress_steps):
+    """Pass 1: label every tile, stitch tiles, accumulate per-id statistics"""
+    from scipy import ndimage
+
+    structure = np.ones((3, 3), dtype=bool) if eight_connected else None
+    union_find = UnionFind()
+    stats = _Accumulator()
+    # Labels of the last pixel row of the previous tile row, full raster width
+    above = None
+    below = np.zeros(grid.width, dtype=np.int64)
+    left_column = None
+    done = 0
+
+    for xoff, yoff, xsize, ysize in iter_windows(grid.width, grid.height, tile_size):
+        if xoff == 0:
+            above = below if yoff > 0 else None
+            below = np.zeros(grid.width, dtype=np.int64)
+            left_column = None
+
+        probability = read_probability(band, xoff, yoff, xsize, ysize)
+        with np.errstate(invalid='ignore'):
+            mask = probability >= threshold
+        local, count = ndimage.label(mask, structure=structure)
+
+        labels = np.zeros((ysize, xsize), dtype=np.int64)
+        if count:
+            first = union_find.add(count)
+            labels[mask] = local[mask] + (first - 1)
+            flat_local = local.ravel()
+            counts = np.bincount(flat_local, minlength=count + 1)[1:]
+            sums = np.bincount(flat_local, weights=np.where(mask, probability, 0.0).ravel(), minlength=count + 1)[1:]
+            stats.add(first, counts, sums)
+
+            # Stitch with the tile above (including diagonal neighbours across
+            # the tile corners) and with the tile on the left
+            if above is not None:
+                lo = max(0, xoff - 1) if eight_connected else xoff
+                hi = min(grid.width, xoff + xsize + 1) if eight_connected else xoff + xsize
+                padded = np.zeros(xsize + 2, dtype=np.int64)
+                padded[1 + lo - xoff:1 + hi - xoff] = above[lo:hi]
+                union_find.union_pairs(_border_pairs(labels[0], padded[1:-1], False))
+                if eight_connected:
+                    union_find.union_pairs(_border_pairs(labels[0], padded[:-2], False))
+                    union_find.union_pairs(_border_pairs(labels[0], padded[2:], False))
+            if left_column is not None:
+                union_find.union_pairs(_border_pairs(labels[:, 0], left_column, eight_connected))
+
+        below[xoff:xoff + xsize] = labels[-1]
+        left_column = labels[:, -1]
+        write_window(label_ds, labels.astype(np.uint32), xoff, yoff)
+
+        done += 1
+        report_progress(feedback, done, progress_steps)
+        if is_canceled(feedback):
+            return None, None
+    return union_find, stats
+
+
+def _relabel_tiles(label_ds, grid, lookup, tile_size, feedback, done, progress_steps):
+    """Pass 2: replace provisional ids by component ids (0 = dropped)"""
+    band = label_ds.GetRasterBand(1)
+    for xoff, yoff, xsize, ysize in iter_windows(grid.width, grid.height, tile_size):
+        labels = band.ReadAsArray(xoff, yoff, xsize, ysize)
+        write_window(label_ds, lookup[labels], xoff, yoff)
+        done += 1
+        report_progress(feedback, done, progress_steps)
+        if is_canceled(feedback):
+            return False
+    return True
+
+
+def polygonize_extent(probability_path, output_path, threshold=DEFAULT_THRESHOLD, min_area=0.0,
+                      simplify_tolerance=None, band=1, tile_size=DEFAULT_TILE_SIZE,
+                      eight_connected=False, feedback=None):
+    """Write flood-extent polygons for ``probability >= threshold``.
+
+    :param probability_path: Probability raster (float32 or quantized uint8).
+    :type probability_path: str
+
+    :param output_path: Output GeoPackage; an existing file is replaced.
+    :type output_path: str
+
+    :param threshold: Probability threshold of the flood extent.
+    :type threshold: float
+
+    :param min_area: Components smaller than this (map units squared) are dropped.
+    :type min_area: float
+
+    :param simplify_tolerance: Simplification tolerance in map units;
+        defaults to one pixel, 0 disables simplification.
+    :type simplify_tolerance: float
+
+    :param band: Probability band (1-based).
+    :type band: int
+
+    :param tile_size: Tile edge in pixels.
+    :type tile_size: int
+
+    :param eight_connected: Treat diagonal neighbours as connected.
+    :type eight_connected: bool
+
+    :param feedback: Progress/cancellation object (QgsFeedback interface).
+
+    :returns: Run summary with component and polygon counts.
+    :rtype: dict
+    """
+    start_time = time.perf_counter()
+    source = open_raster(probability_path)
+    grid = RasterGrid.from_dataset(source)
+    pixel_width, pixel_height = grid.pixel_size
+    pixel_area = abs(pixel_width * pixel_height)
+    if simplify_tolerance is None:
+        simplify_tolerance = abs(pixel_width)
+
+    n_tiles = sum(1 for _ in iter_windows(grid.width, grid.height, tile_size))
+    # Progress: label pass, relabel pass, then polygon writing
+    progress_steps = 3 * n_tiles
+    summary = {'components': 0, 'kept_components': 0, 'polygons': 0, 'flood_area': 0.0, 'canceled': False}
+
+    label_path = os.path.splitext(output_path)[0] + '_labels.tif'
+    label_ds = create_raster(label_path, grid, gdal.GDT_UInt32, 0, options=GTIFF_OPTIONS)
+    try:
+        union_find, stats = _label_tiles(source.GetRasterBand(band), label_ds, grid, threshold,
+                                         tile_size, eight_connected, feedback, progress_steps)
+        if union_find is None:
+            summary['canceled'] = True
+            return summary
+
+        # Statistics per component: sum the per-id counters over their roots
+        roots = union_find.roots()
+        n_ids = union_find.size
+        counts = np.bincount(roots[1:], weights=stats.counts[1:n_ids], minlength=n_ids)
+        sums = np.bincount(roots[1:], weights=stats.sums[1:n_ids], minlength=n_ids)
+        components = np.flatnonzero(counts)
+        keep = counts * pixel_area >= min_area
+        keep[0] = False
+        lookup = np.where(keep[roots], roots, 0).astype(np.uint32)
+
+        summary['components'] = int(components.size)
+        summary['kept_components'] = int(np.count_nonzero(keep))
+        summary['flood_area'] = float(counts[keep].sum() * pixel_area)
+
+        if not _relabel_tiles(label_ds, grid, lookup, tile_size, feedback, n_tiles, progress_steps):
+            summary['canceled'] = True
+            return summary
+        label_ds.FlushCache()
+
+        summary['polygons'] = _write_polygons(label_ds, output_path, counts, sums, pixel_area,
+                                              simplify_tolerance, eight_connected, feedback, progress_steps)
+        summary['canceled'] = is_canceled(feedback)
+    finally:
+        label_ds = None
+        source = None
+        gdal.GetDriverByName('GTiff').Delete(label_path)
+        summary['seconds'] = time.perf_counter() - start_time
+
+    return summary
+
+
+def _write_polygons(label_ds, output_path, counts, sums, pixel_area, tolerance, eight_connected,
+                    feedback, progress_steps):
+    """Polygonize the component raster and write the attributed GeoPackage"""
+    driver = ogr.GetDriverByName('GPKG')
+    if os.path.exists(output_path):
+        driver.DeleteDataSource(output_path)
+    output = driver.CreateDataSource(output_path)
+    if output is None:
+        raise RuntimeError(f"Cannot create GeoPackage {output_path}")
+
+    srs = label_ds.GetSpatialRef()
+    # Raw polygons go to a scratch GeoPackage, then get simplified and attributed
+    raw_path = os.path.splitext(output_path)[0] + '_raw_polygons.gpkg'
+    if os.path.exists(raw_path):
+        driver.DeleteDataSource(raw_path)
+    raw_source = driver.CreateDataSource(raw_path)
+    if raw_source is None:
+        raise RuntimeError(f"Cannot create GeoPackage {raw_path}")
+    try:
+        return _simplify_polygons(label_ds, raw_source, output, srs, counts, sums, pixel_area, tolerance,
+                                  eight_connected, feedback, progress_steps)
+    finally:
+        raw_source = None
+        output = None
+        driver.DeleteDataSource(raw_path)
+
+
+def _simplify_polygons(label_ds, raw_source, output, srs, counts, sums, pixel_area, tolerance,
+                       eight_connected, feedback, progress_steps):
+    """Polygonize into ``raw_source``, then simplify and attribute into ``output``"""
+    raw_layer = raw_source.CreateLayer('raw_polygons', srs, ogr.wkbPolygon)
+    raw_layer.CreateField(ogr.FieldDefn('component', ogr.OFTInteger64))
+    band = label_ds.GetRasterBand(1)
+    options = ['8CONNECTED=8'] if eight_connected else []
+
+    def polygonize_progress(complete, message, data):
+        report_progress(feedback, progress_steps * (2 + complete) / 3, progress_steps)
+        return 0 if is_canceled(feedback) else 1
+
+    # The label band is its own mask: component 0 (no flood) is skipped
+    raw_layer.StartTransaction()
+    result = gdal.Polygonize(band, band, raw_layer, 0, options, callback=polygonize_progress)
+    raw_layer.CommitTransaction()
+    if is_canceled(feedback):
+        return 0
+    if result != 0:
+        raise _gdal_error("Failed to polygonize the flood extent")
+
+    layer = output.CreateLayer(EXTENT_LAYER_NAME, srs, ogr.wkbMultiPolygon)
+    layer.CreateField(ogr.FieldDefn('component', ogr.OFTInteger64))
+    layer.CreateField(ogr.FieldDefn('pixels', ogr.OFTInteger64))
+    layer.CreateField(ogr.FieldDefn('area', ogr.OFTReal))
+    layer.CreateField(ogr.FieldDefn('mean_probability', ogr.OFTReal))
+    definition = layer.GetLayerDefn()
+
+    written = 0
+    layer.StartTransaction()
+    for raw_feature in raw_layer:
+        component = raw_feature.GetFieldAsInteger64(0)
+        geometry = raw_feature.GetGeometryRef()
+        if tolerance > 0:
+            geometry = geometry.SimplifyPreserveTopology(tolerance)
+        if geometry is None or geometry.IsEmpty():
+            continue
+
+        feature = ogr.Feature(definition)
+        feature.SetGeometry(ogr.ForceToMultiPolygon(geometry))
+        feature.SetField(0, component)
+        feature.SetField(1, int(counts[component]))
+        feature.SetField(2, float(counts[component] * pixel_area))
+        feature.SetField(3, float(sums[component] / counts[component]))
+        layer.CreateFeature(feature)
+        written += 1
+        if written % FEATURES_PER_TRANSACTION == 0:
+            layer.CommitTransaction()
+            if is_canceled(feedback):
+                break
+            layer.StartTransaction()
+    else:
+        layer.CommitTransaction()
+
+    return written
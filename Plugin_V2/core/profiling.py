@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Stage timing
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Timing spans per workflow stage, and a one-shot cProfile capture.
+
+ Stages are dotted names such as 'extract.read' or 'predict.model'. Each
+ span adds its duration to the stage's count, total, min/max, a histogram
+ with half-decade buckets from 1 us to 100 s and a window of recent samples
+ for percentiles. Spans are cheap (two perf_counter calls and a locked
+ update), so they stay on in normal use. Standard library only.
+"""
+
+import bisect
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from collections import deque
+
+# Histogram bucket edges in seconds: 1 us, 3.16 us, 10 us, ... 100 s
+HISTOGRAM_EDGES = tuple(10.0 ** (exponent / 2.0) for exponent in range(-12, 5))
+
+# Recent durations kept per stage for percentiles
+RECENT_SAMPLES = 1000
+
+# Lines of the cProfile report
+PROFILE_LINES = 30
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class StageStats:
+    """Aggregated durations of one stage"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = 0.0
+        # One more bucket than edges: below the first, between edges, above the last
+        self.buckets = [0] * (len(HISTOGRAM_EDGES) + 1)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.minimum = seconds if self.minimum is None else min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        self.buckets[bisect.bisect_right(HISTOGRAM_EDGES, seconds)] += 1
+        self.recent.append(seconds)
+
+    def summary(self):
+        """Statistics in milliseconds as a JSON-serializable dictionary"""
+        recent = sorted(self.recent)
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000.0,
+            'mean_ms': self.total * 1000.0 / self.count if self.count else None,
+            'min_ms': self.minimum * 1000.0 if self.minimum is not None else None,
+            'p50_ms': _percentile(recent, 0.50) * 1000.0 if recent else None,
+            'p95_ms': _percentile(recent, 0.95) * 1000.0 if recent else None,
+            'max_ms': self.maximum * 1000.0,
+            'histogram': list(self.buckets),
+        }
+
+
+class _Span:
+    """Context manager timing one stage, see StageTimer.span()"""
+
+    __slots__ = ('timer', 'stage', 'start')
+
+    def __init__(self, timer, stage):
+        self.timer = timer
+        self.stage = stage
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.timer.record(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class StageTimer:
+    """Per-stage duration statistics; safe to use from several threads.
+
+    Example::
+
+        timer = StageTimer()
+        with timer.span('predict.model'):
+            model.predict_proba(features)
+        timer.summary()['predict.model']['p95_ms']
+    """
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def span(self, stage):
+        """Context manager adding its duration to ``stage``"""
+        return _Span(self, stage)
+
+    def record(self, stage, seconds):
+        """Add one duration in seconds to ``stage``"""
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = StageStats()
+            stats.add(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self.started = time.time()
+
+    def summary(self):
+        """Stage name -> StageStats.summary(), in first-recorded order"""
+        with self._lock:
+            return {stage: stats.summary() for stage, stats in self._stages.items()}
+
+    def to_dict(self):
+        """Summary with the histogram bucket edges, for JSON export"""
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'histogram_edges_ms': [edge * 1000.0 for edge in HISTOGRAM_EDGES],
+            'stages': self.summary(),
+        }
+
+    def write_json(self, path, extra=None):
+        """Write to_dict() (plus ``extra`` entries) to a JSON file"""
+        data = self.to_dict()
+        if extra:
+            data.update(extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+
+# The ProfileCapture being recorded; pipeline stage threads started while it
+# is set profile themselves into it
+_active_capture = None
+
+
+def active_capture():
+    """ProfileCapture currently recording, or None"""
+    return _active_capture
+
+
+class _ThreadProfile:
+    """Context manager profiling the calling thread, see ProfileCapture.profile_thread()"""
+
+    __slots__ = ('capture', 'profile')
+
+    def __init__(self, capture):
+        self.capture = capture
+        self.profile = None
+
+    def __enter__(self):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one profiler at a time, and it already
+            # sees every thread
+            return self
+        self.profile = profile
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.profile is not None:
+            self.profile.disable()
+            self.capture.add(self.profile)
+        return False
+
+
+class ProfileCapture:
+    """cProfile over one run; does nothing unless ``enabled``.
+
+    cProfile only sees the thread it was entered in: for a background task,
+    enter it inside the task function. While it is entered, the reader and
+    predictor threads of core.pipeline profile themselves and are merged
+    into the report. Worker processes are not profiled.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.profile = cProfile.Profile() if enabled else None
+        self.thread_profiles = []
+        self._lock = threading.Lock()
+        self._outer = None
+
+    def __enter__(self):
+        global _active_capture
+        if self.enabled:
+            self._outer = _active_capture
+            _active_capture = self
+            self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active_capture
+        if self.enabled:
+            self.profile.disable()
+            _active_capture = self._outer
+        return False
+
+    def profile_thread(self):
+        """Context manager profiling the calling thread into this capture"""
+        return _ThreadProfile(self)
+
+    def add(self, profile):
+        """Merge a finished cProfile.Profile of another thread into the report"""
+        with self._lock:
+            self.thread_profiles.append(profile)
+
+    def stats(self, stream=None):
+        """pstats.Stats of the run, all profiled threads combined"""
+        stats = pstats.Stats(self.profile, stream=stream)
+        with self._lock:
+            for profile in self.thread_profiles:
+                stats.add(profile)
+        return stats
+
+    def report(self, sort='cumulative', lines=PROFILE_LINES):
+        """pstats text of the ``lines`` most expensive functions"""
+        if not self.enabled:
+            return ''
+        stream = io.StringIO()
+        self.stats(stream).sort_stats(sort).print_stats(lines)
+        return stream.getvalue()
+
+    def dump(self, path):
+        """Save the raw profile (for snakeviz, pstats, ...)"""
+        if self.enabled:
+            self.stats().dump_stats(path)
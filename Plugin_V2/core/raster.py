@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Raster I/O
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Windowed raster reading and writing with GDAL (shipped with every QGIS).
+
+ Feature rasters are read window by window on the grid of a reference
+ raster. Inputs on a different grid or CRS are aligned on the fly through
+ an in-memory warped VRT, so nothing is resampled to disk.
+"""
+
+import itertools
+
+import numpy as np
+from osgeo import gdal
+
+# Default creation options for GeoTIFF outputs
+GTIFF_OPTIONS = ['TILED=YES', 'COMPRESS=DEFLATE', 'BIGTIFF=IF_SAFER']
+
+_vsimem_counter = itertools.count()
+
+
+def _gdal_error(message):
+    """Build a RuntimeError that includes GDAL's last error message"""
+    last_error = gdal.GetLastErrorMsg()
+    return RuntimeError(f"{message}: {last_error}" if last_error else message)
+
+
+def open_raster(path):
+    """Open a raster read-only.
+
+    :raises RuntimeError: If GDAL cannot open the file.
+    """
+    dataset = gdal.Open(path, gdal.GA_ReadOnly)
+    if dataset is None:
+        raise _gdal_error(f"Cannot open raster {path}")
+    return dataset
+
+
+class RasterGrid:
+    """Georeferenced pixel grid: size, geotransform and CRS (WKT)."""
+
+    def __init__(self, width, height, geotransform, projection):
+        self.width = int(width)
+        self.height = int(height)
+        self.geotransform = tuple(geotransform)
+        self.projection = projection or ''
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        """Grid of an open GDAL dataset"""
+        return cls(dataset.RasterXSize, dataset.RasterYSize,
+                   dataset.GetGeoTransform(), dataset.GetProjection())
+
+    @property
+    def bounds(self):
+        """Extent as (xmin, ymin, xmax, ymax)"""
+        x0, dx, _, y0, _, dy = self.geotransform
+        x1 = x0 + dx * self.width
+        y1 = y0 + dy * self.height
+        return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+    @property
+    def pixel_size(self):
+        """Absolute pixel size as (x, y)"""
+        return abs(self.geotransform[1]), abs(self.geotransform[5])
+
+    def same_as(self, other, tolerance=1e-9):
+        """True if both grids are pixel-aligned and use the same CRS"""
+        if (self.width, self.height) != (other.width, other.height):
+            return False
+        if any(abs(a - b) > tolerance for a, b in zip(self.geotransform, other.geotransform)):
+            return False
+        if self.projection == other.projection:
+            return True
+        from osgeo import osr
+        mine, theirs = osr.SpatialReference(), osr.SpatialReference()
+        mine.ImportFromWkt(self.projection)
+        theirs.ImportFromWkt(other.projection)
+        return bool(mine.IsSame(theirs))
+
+    def window_geotransform(self, xoff, yoff):
+        """Geotransform of the window starting at pixel (xoff, yoff)"""
+        x0, dx, rx, y0, ry, dy = self.geotransform
+        return (x0 + xoff * dx + yoff * rx, dx, rx, y0 + xoff * ry + yoff * dy, ry, dy)
+
+    def to_pixel(self, x, y):
+        """Convert map coordinates to fractional (col, row) pixel coordinates.
+
+        Works on scalars and NumPy arrays. Rotated grids are supported.
+        """
+        x0, dx, rx, y0, ry, dy = self.geotransform
+        det = dx * dy - rx * ry
+        x = np.asarray(x, dtype=np.float64) - x0
+        y = np.asarray(y, dtype=np.float64) - y0
+        col = (dy * x - rx * y) / det
+        row = (dx * y - ry * x) / det
+        return col, row
+
+    def to_map(self, col, row):
+        """Convert (col, row) pixel coordinates to map coordinates"""
+        x0, dx, rx, y0, ry, dy = self.geotransform
+        return x0 + col * dx + row * rx, y0 + col * ry + row * dy
+
+
+def iter_windows(width, height, tile_width, tile_height=None):
+    """Yield (xoff, yoff, xsize, ysize) windows covering a raster row by row.
+
+    :param width: Raster width in pixels.
+    :param height: Raster height in pixels.
+    :param tile_width: Window width in pixels.
+    :param tile_height: Window height in pixels, defaults to tile_width.
+    """
+    tile_height = tile_height or tile_width
+    for yoff in range(0, height, tile_height):
+        ysize = min(tile_height, height - yoff)
+        for xoff in range(0, width, tile_width):
+            yield xoff, yoff, min(tile_width, width - xoff), ysize
+
+
+def align_to_grid(dataset, grid, resample='bilinear'):
+    """Return a warped VRT of ``dataset`` on ``grid`` (lazy, in memory).
+
+    The VRT is a /vsimem file named by the dataset's GetDescription(); the
+    caller unlinks it with gdal.Unlink once the dataset is released.
+
+    :param dataset: Source dataset.
+    :param grid: Target RasterGrid.
+    :type grid: RasterGrid
+    :param resample: GDAL resampling algorithm name.
+    :type resample: str
+    """
+    xmin, ymin, xmax, ymax = grid.bounds
+    vrt_path = f'/vsimem/flood_prediction_align_{next(_vsimem_counter)}.vrt'
+    aligned = gdal.Warp(
+        vrt_path, dataset, format='VRT',
+        outputBounds=(xmin, ymin, xmax, ymax),
+        width=grid.width, height=grid.height,
+        dstSRS=grid.projection or None,
+        resampleAlg=resample)
+    if aligned is None:
+        error = _gdal_error("Failed to align raster to reference grid")
+        gdal.Unlink(vrt_path)
+        raise error
+    return aligned
+
+
+class FeatureStack:
+    """A set of single-band rasters read as one (n_features, rows, cols) cube.
+
+    The first raster defines the output grid unless ``reference`` says
+    otherwise. Every window read returns the features plus a validity mask
+    that is False wherever any input is nodata or not finite.
+    """
+
+    def __init__(self, paths, names=None, band=1, reference=0, resample='bilinear'):
+        """Constructor.
+
+        :param paths: Raster file paths, one per model feature, in model order.
+        :type paths: list
+
+        :param names: Feature names, defaults to the file names.
+        :type names: list
+
+        :param band: Band to read from every raster (1-based).
+        :type band: int
+
+        :param reference: Index of the raster that defines the grid.
+        :type reference: int
+
+        :param resample: Resampling used when aligning other rasters.
+        :type resample: str
+        """
+        if not paths:
+            raise ValueError("At least one feature raster is required")
+        self.paths = list(paths)
+        self.names = list(names) if names else [p.replace('\\', '/').split('/')[-1] for p in self.paths]
+        self.band_number = band
+
+        sources = [open_raster(path) for path in self.paths]
+        self.grid = RasterGrid.from_dataset(sources[reference])
+
+        self.datasets = []
+        # In-memory VRTs of the aligned inputs, unlinked by close()
+        self._vrt_paths = []
+        try:
+            for dataset in sources:
+                if not RasterGrid.from_dataset(dataset).same_as(self.grid):
+                    dataset = align_to_grid(dataset, self.grid, resample)
+                    self._vrt_paths.append(dataset.GetDescription())
+                self.datasets.append(dataset)
+        except Exception:
+            self.close()
+            raise
+
+        self.bands = [ds.GetRasterBand(band) for ds in self.datasets]
+        self.nodata = [b.GetNoDataValue() for b in self.bands]
+
+    @property
+    def n_features(self):
+        return len(self.datasets)
+
+    def read_band_window(self, index, xoff, yoff, xsize, ysize, out=None):
+        """Read one feature for a window as float32, nodata set to NaN"""
+        if out is None:
+            out = np.empty((ysize, xsize), dtype=np.float32)
+        data = self.bands[index].ReadAsArray(xoff, yoff, xsize, ysize, buf_obj=out)
+        if data is None:
+            raise _gdal_error(f"Failed to read window from {self.paths[index]}")
+        nodata = self.nodata[index]
+        if nodata is not None:
+            data[data == np.float32(nodata)] = np.nan
+        return data
+
+    def read_window(self, xoff, yoff, xsize, ysize, out=None):
+        """Read all features for a window.
+
+        :param out: Optional preallocated float32 array of shape
+            (n_features, ysize, xsize) to read into.
+
+        :returns: Tuple (features, valid_mask).
+        :rtype: tuple
+        """
+        if out is None:
+            out = np.empty((self.n_features, ysize, xsize), dtype=np.float32)
+        for index in range(self.n_features):
+            self.read_band_window(index, xoff, yoff, xsize, ysize, out=out[index])
+        valid_mask = np.all(np.isfinite(out), axis=0)
+        return out, valid_mask
+
+    def close(self):
+        """Release the GDAL datasets and delete the aligned VRTs"""
+        self.bands = []
+        self.datasets = []
+        for vrt_path in self._vrt_paths:
+            gdal.Unlink(vrt_path)
+        self._vrt_paths = []
+
+
+def read_probability(band, xoff, yoff, xsize, ysize):
+    """Read probabilities as float64 with scale/offset applied, NaN for nodata"""
+    raw = band.ReadAsArray(xoff, yoff, xsize, ysize)
+    if raw is None:
+        raise _gdal_error("Failed to read probability window")
+    values = raw.astype(np.float64)
+    nodata = band.GetNoDataValue()
+    if nodata is not None:
+        values[raw == nodata] = np.nan
+    scale, offset = band.GetScale(), band.GetOffset()
+    if scale not in (None, 1.0) or offset not in (None, 0.0):
+        values = values * (scale or 1.0) + (offset or 0.0)
+    return values
+
+
+def create_raster(path, grid, data_type, nodata=None, bands=1, driver='GTiff', options=None):
+    """Create an output raster on ``grid``.
+
+    :param data_type: GDAL data type, e.g. gdal.GDT_Float32.
+    :param nodata: Nodata value set on every band.
+    :param options: Driver creation options, defaults to GTIFF_OPTIONS for GeoTIFF.
+
+    :returns: The open, writable dataset.
+    """
+    if options is None:
+        options = GTIFF_OPTIONS if driver == 'GTiff' else []
+    dataset = gdal.GetDriverByName(driver).Create(
+        path, grid.width, grid.height, bands, data_type, options=options)
+    if dataset is None:
+        raise _gdal_error(f"Cannot create raster {path}")
+    dataset.SetGeoTransform(grid.geotransform)
+    dataset.SetProjection(grid.projection)
+    if nodata is not None:
+        for band_number in range(1, bands + 1):
+            dataset.GetRasterBand(band_number).SetNoDataValue(nodata)
+    return dataset
+
+
+def write_window(dataset, array, xoff, yoff, band=1):
+    """Write a 2-D array into ``band`` of ``dataset`` at (xoff, yoff)"""
+    if dataset.GetRasterBand(band).WriteArray(array, xoff, yoff) != 0:
+        raise _gdal_error("Failed to write raster window")
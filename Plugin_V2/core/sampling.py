@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Point sampling
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Raster values at many points with few reads.
+
+ Sampling point by point costs one provider call (and often one block
+ decode) per point and layer. Here the raster is divided into square
+ regions; the points are grouped by region, each region is read once (with
+ a margin for the sampling kernel) and kept in a small cache, and all values
+ of a group are computed with NumPy indexing. One click and a million batch
+ points go through the same code.
+
+ Sampling methods:
+
+ * ``nearest``: value of the pixel containing the point
+ * ``bilinear``: 2x2 interpolation between pixel centres
+ * ``cubic``: 4x4 cubic convolution (Keys, a = -0.5), as GDAL's cubic
+ * ``mean``: mean of the pixels whose centre lies within ``radius`` map
+   units of the point (at least the containing pixel)
+
+ Every method is a set of pixel offsets with per-point weights. Bilinear
+ neighbours beyond the raster edge take the edge pixel, as in GDAL. Nodata
+ neighbours are dropped and the remaining weights renormalized. Cubic
+ weights have negative lobes, so renormalizing them (or repeating edge
+ pixels) extrapolates beyond the data range: a point whose 4x4 support
+ holds nodata or leaves the raster is interpolated bilinearly instead. A
+ point whose containing pixel is nodata or outside the raster gets NaN.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from .raster import RasterGrid, _gdal_error, open_raster
+
+SAMPLING_METHODS = ('nearest', 'bilinear', 'cubic', 'mean')
+
+# Points are grouped into regions of this many pixels; one read per region
+DEFAULT_REGION_SIZE = 512
+
+# Regions kept in memory per raster (about 2 MB each for 512 px regions)
+DEFAULT_CACHE_REGIONS = 16
+
+# Points evaluated together, bounds the (points x kernel) temporary arrays
+_POINT_CHUNK = 65536
+
+# Cubic convolution parameter, as in GDAL
+_CUBIC_A = -0.5
+
+
+def _cubic_weights(fraction):
+    """Weights of the offsets -1, 0, 1, 2 for fractional positions, shape (n, 4)"""
+    distances = np.abs(np.stack([1 + fraction, fraction, 1 - fraction, 2 - fraction], axis=-1))
+    a = _CUBIC_A
+    near = ((a + 2) * distances - (a + 3)) * distances ** 2 + 1
+    far = ((a * distances - 5 * a) * distances + 8 * a) * distances - 4 * a
+    return np.where(distances <= 1, near, np.where(distances < 2, far, 0.0))
+
+
+def _kernel(method, col, row, pixel_size, radius):
+    """Base pixels, pixel offsets and weights of a sampling method.
+
+    :returns: Tuple (base_cols, base_rows, offset_cols, offset_rows,
+        weights): base indices of shape (n,), offsets of shape (k,) and
+        weights of shape (n, k).
+    :rtype: tuple
+    """
+    if method == 'nearest':
+        base_cols, base_rows = np.floor(col), np.floor(row)
+        return base_cols, base_rows, np.zeros(1, int), np.zeros(1, int), np.ones((col.size, 1))
+
+    if method in ('bilinear', 'cubic'):
+        # Fractional position relative to the pixel centre up and left of the point
+        centre_col, centre_row = col - 0.5, row - 0.5
+        base_cols, base_rows = np.floor(centre_col), np.floor(centre_row)
+        fraction_col, fraction_row = centre_col - base_cols, centre_row - base_rows
+        if method == 'bilinear':
+            steps = np.array([0, 1])
+            weights_col = np.stack([1 - fraction_col, fraction_col], axis=-1)
+            weights_row = np.stack([1 - fraction_row, fraction_row], axis=-1)
+        else:
+            steps = np.array([-1, 0, 1, 2])
+            weights_col = _cubic_weights(fraction_col)
+            weights_row = _cubic_weights(fraction_row)
+        offset_rows, offset_cols = (grid.ravel() for grid in np.meshgrid(steps, steps, indexing='ij'))
+        weights = (weights_row[:, :, np.newaxis] * weights_col[:, np.newaxis, :]).reshape(col.size, -1)
+        return base_cols, base_rows, offset_cols, offset_rows, weights
+
+    if method == 'mean':
+        pixel_width, pixel_height = pixel_size
+        reach_cols = int(np.ceil(radius / pixel_width))
+        reach_rows = int(np.ceil(radius / pixel_height))
+        base_cols, base_rows = np.floor(col), np.floor(row)
+        offset_rows, offset_cols = (grid.ravel() for grid in np.meshgrid(
+            np.arange(-reach_rows, reach_rows + 1), np.arange(-reach_cols, reach_cols + 1), indexing='ij'))
+        # Map distance from the point to every candidate pixel centre
+        distance_x = (base_cols[:, np.newaxis] + offset_cols + 0.5 - col[:, np.newaxis]) * pixel_width
+        distance_y = (base_rows[:, np.newaxis] + offset_rows + 0.5 - row[:, np.newaxis]) * pixel_height
+        weights = (np.hypot(distance_x, distance_y) <= radius).astype(np.float64)
+        weights[:, (offset_cols == 0) & (offset_rows == 0)] = 1.0
+        return base_cols, base_rows, offset_cols, offset_rows, weights
+
+    raise ValueError(f"Unknown sampling method '{method}'; expected one of {', '.join(SAMPLING_METHODS)}")
+
+
+class RasterSampler:
+    """Samples one raster band at points, reading whole cached regions.
+
+    Keep a sampler for repeated clicks on the same layer: nearby points
+    are answered from the cache without another read.
+    """
+
+    def __init__(self, path, band=1, region_size=DEFAULT_REGION_SIZE, cache_regions=DEFAULT_CACHE_REGIONS):
+        """Constructor.
+
+        :param path: GDAL-readable raster.
+        :type path: str
+
+        :param band: Band number (1-based).
+        :type band: int
+
+        :param region_size: Region edge in pixels.
+        :type region_size: int
+
+        :param cache_regions: Regions kept in memory.
+        :type cache_regions: int
+        """
+        self.path = path
+        self.dataset = open_raster(path)
+        self.grid = RasterGrid.from_dataset(self.dataset)
+        self.band = self.dataset.GetRasterBand(band)
+        self.nodata = self.band.GetNoDataValue()
+        self.region_size = int(region_size)
+        self.cache_regions = int(cache_regions)
+        self._cache = OrderedDict()
+
+    def _region(self, region_row, region_col, margin):
+        """Region values with ``margin`` extra pixels per side; NaN for nodata and outside"""
+        key = (region_row, region_col, margin)
+        block = self._cache.get(key)
+        if block is not None:
+            self._cache.move_to_end(key)
+            return block
+
+        size = self.region_size + 2 * margin
+        xoff = region_col * self.region_size - margin
+        yoff = region_row * self.region_size - margin
+        block = np.full((size, size), np.nan)
+        # Read only the part inside the raster
+        x0, y0 = max(xoff, 0), max(yoff, 0)
+        x1, y1 = min(xoff + size, self.grid.width), min(yoff + size, self.grid.height)
+        if x1 > x0 and y1 > y0:
+            data = self.band.ReadAsArray(int(x0), int(y0), int(x1 - x0), int(y1 - y0))
+            if data is None:
+                raise _gdal_error(f"Failed to read window from {self.path}")
+            data = data.astype(np.float64)
+            if self.nodata is not None:
+                data[data == self.nodata] = np.nan
+            block[y0 - yoff:y1 - yoff, x0 - xoff:x1 - xoff] = data
+
+        self._cache[key] = block
+        if len(self._cache) > self.cache_regions:
+            self._cache.popitem(last=False)
+        return block
+
+    def sample(self, x, y, method='nearest', radius=0.0):
+        """Values at points given in the raster CRS.
+
+        :param x: Point x coordinates.
+        :param y: Point y coordinates.
+
+        :param method: One of SAMPLING_METHODS.
+        :type method: str
+
+        :param radius: Radius in map units for ``mean``.
+        :type radius: float
+
+        :returns: float64 values in point order, NaN where the point's pixel
+            is nodata or outside the raster.
+        :rtype: numpy.ndarray
+        """
+        col, row = self.grid.to_pixel(np.atleast_1d(x), np.atleast_1d(y))
+        col, row = col.ravel(), row.ravel()
+        values = np.full(col.shape, np.nan)
+
+        # Points whose containing pixel is inside the raster
+        inside = np.flatnonzero((col >= 0) & (col < self.grid.width) & (row >= 0) & (row < self.grid.height))
+        if inside.size == 0:
+            return values
+
+        for first in range(0, inside.size, _POINT_CHUNK):
+            chunk = inside[first:first + _POINT_CHUNK]
+            values[chunk] = self._sample_inside(col[chunk], row[chunk], method, radius)
+        return values
+
+    def _sample_inside(self, col, row, method, radius):
+        base_cols, base_rows, offset_cols, offset_rows, weights = _kernel(
+            method, col, row, self.grid.pixel_size, radius)
+        base_cols, base_rows = base_cols.astype(np.int64), base_rows.astype(np.int64)
+        margin = int(max(np.abs(offset_cols).max(), np.abs(offset_rows).max()))
+        # Interpolation kernels repeat the edge pixels, the mean only counts pixels inside
+        clamp = method in ('bilinear', 'cubic')
+
+        # Group points by the region of their base pixel
+        region_rows = base_rows // self.region_size
+        region_cols = base_cols // self.region_size
+        keys = region_rows << 32 | (region_cols & 0xFFFFFFFF)
+        order = np.argsort(keys, kind='stable')
+        boundaries = np.flatnonzero(np.diff(keys[order])) + 1
+
+        result = np.full(col.shape, np.nan)
+        incomplete = np.zeros(col.shape, dtype=bool)
+        for group in np.split(order, boundaries):
+            region_row, region_col = int(region_rows[group[0]]), int(region_cols[group[0]])
+            block = self._region(region_row, region_col, margin)
+            neighbour_rows = base_rows[group, np.newaxis] + offset_rows
+            neighbour_cols = base_cols[group, np.newaxis] + offset_cols
+            if clamp:
+                # Stays within the margin: the base pixel is at most one pixel outside
+                clamped_rows = np.clip(neighbour_rows, 0, self.grid.height - 1)
+                clamped_cols = np.clip(neighbour_cols, 0, self.grid.width - 1)
+                if method == 'cubic':
+                    outside = (clamped_rows != neighbour_rows) | (clamped_cols != neighbour_cols)
+                    incomplete[group] = outside.any(axis=1)
+                neighbour_rows, neighbour_cols = clamped_rows, clamped_cols
+            neighbours = block[neighbour_rows - region_row * self.region_size + margin,
+                               neighbour_cols - region_col * self.region_size + margin]
+
+            valid = np.isfinite(neighbours)
+            if method == 'cubic':
+                incomplete[group] |= ~valid.all(axis=1)
+            group_weights = np.where(valid, weights[group], 0.0)
+            weight_sums = group_weights.sum(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                group_values = (group_weights * np.where(valid, neighbours, 0.0)).sum(axis=1) / weight_sums
+
+            # The pixel containing the point decides whether there is data
+            own = block[row[group].astype(np.int64) - region_row * self.region_size + margin,
+                        col[group].astype(np.int64) - region_col * self.region_size + margin]
+            group_values[~np.isfinite(own) | (weight_sums <= 0)] = np.nan
+            result[group] = group_values
+
+        # Renormalized signed weights would extrapolate beyond the data range
+        fallback = np.flatnonzero(incomplete)
+        if fallback.size:
+            result[fallback] = self._sample_inside(col[fallback], row[fallback], 'bilinear', radius)
+        return result
+
+    def close(self):
+        """Release the dataset and the cached regions"""
+        self._cache.clear()
+        self.band = None
+        self.dataset = None
+
+
+def sample_raster(path, x, y, band=1, method='nearest', radius=0.0, region_size=DEFAULT_REGION_SIZE):
+    """Values of one raster band at many points (see RasterSampler.sample).
+
+    :param path: GDAL-readable raster.
+    :type path: str
+
+    :param x: Point x coordinates in the raster CRS.
+    :param y: Point y coordinates in the raster CRS.
+
+    :returns: float64 values in point order; NaN outside the raster and
+        on nodata.
+    :rtype: numpy.ndarray
+    """
+    sampler = RasterSampler(path, band, region_size)
+    try:
+        return sampler.sample(x, y, method, radius)
+    finally:
+        sampler.close()
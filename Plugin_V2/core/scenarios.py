@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Multi-temporal scenarios
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Flood prediction for a series of timesteps (forecast hours, scenarios).
+
+ Terrain features (DEM, slope, TWI, SPI, flow accumulation, ...) are static;
+ only some inputs (rainfall, soil moisture) change per timestep. For every
+ tile the static features are read and extracted once. Only the dynamic
+ rasters are read per timestep, and the model is evaluated on all timesteps
+ of the tile together. The probability and class outputs get one band per
+ timestep.
+"""
+
+import time
+
+import numpy as np
+from osgeo import gdal
+
+from .area import DEFAULT_TILE_SIZE, is_canceled, report_progress
+from .cog import QUANTIZED_MAX, QUANTIZED_NODATA, TiledRasterWriter, quantize_probability
+from .inference import DEFAULT_THRESHOLD, PROBABILITY_NODATA, CLASS_NODATA, classify, predict_probabilities
+from .raster import FeatureStack, iter_windows
+
+# Upper bound of rows per model call; timesteps are grouped to stay below it
+DEFAULT_MAX_ROWS = 1 << 20
+
+
+class ScenarioStack:
+    """Static and per-timestep feature rasters on one grid.
+
+    ``features`` lists the model features in model order. A static feature
+    is one raster path. A dynamic feature is a list with one raster path
+    per timestep; all dynamic features need the same number of timesteps.
+    """
+
+    def __init__(self, features, timestep_names=None, band=1, resample='bilinear'):
+        """Constructor.
+
+        :param features: One path (static) or list of paths (dynamic) per feature.
+        :type features: list
+
+        :param timestep_names: Names of the timesteps, used as band descriptions.
+        :type timestep_names: list
+
+        :param band: Band to read from every raster (1-based).
+        :type band: int
+
+        :param resample: Resampling used when aligning rasters to the grid.
+        :type resample: str
+        """
+        self.n_features = len(features)
+        self.static_columns = [i for i, feature in enumerate(features) if isinstance(feature, str)]
+        self.dynamic_columns = [i for i, feature in enumerate(features) if not isinstance(feature, str)]
+        if not self.dynamic_columns:
+            raise ValueError("A scenario needs at least one dynamic (per-timestep) feature")
+
+        timestep_counts = {len(features[i]) for i in self.dynamic_columns}
+        if len(timestep_counts) != 1 or 0 in timestep_counts:
+            raise ValueError("Every dynamic feature needs the same, non-zero number of timestep rasters")
+        self.n_timesteps = timestep_counts.pop()
+
+        self.timestep_names = list(timestep_names) if timestep_names else [f"t{t + 1}" for t in range(self.n_timesteps)]
+        if len(self.timestep_names) != self.n_timesteps:
+            raise ValueError(f"Expected {self.n_timesteps} timestep names, got {len(self.timestep_names)}")
+
+        # One stack on one grid: static rasters first, then timestep by timestep
+        paths = [features[i] for i in self.static_columns]
+        for t in range(self.n_timesteps):
+            paths += [features[i][t] for i in self.dynamic_columns]
+        self.stack = FeatureStack(paths, band=band, resample=resample)
+        self.grid = self.stack.grid
+
+    def _read(self, indices, window):
+        xoff, yoff, xsize, ysize = window
+        block = np.empty((len(indices), ysize, xsize), dtype=np.float32)
+        for row, index in enumerate(indices):
+            self.stack.read_band_window(index, xoff, yoff, xsize, ysize, out=block[row])
+        return block
+
+    def read_static(self, window):
+        """Static features for a window, shape (n_static, rows, cols)"""
+        return self._read(range(len(self.static_columns)), window)
+
+    def read_dynamic(self, timestep, window):
+        """Dynamic features of one timestep, shape (n_dynamic, rows, cols)"""
+        first = len(self.static_columns) + timestep * len(self.dynamic_columns)
+        return self._read(range(first, first + len(self.dynamic_columns)), window)
+
+    def close(self):
+        """Release the GDAL datasets"""
+        self.stack.close()
+
+
+def predict_scenario_tile(model, scenario, window, threshold=DEFAULT_THRESHOLD, max_rows=DEFAULT_MAX_ROWS):
+    """Predict every timestep of one tile.
+
+    :returns: Tuple (probabilities, labels, valid_pixels): float32 and uint8
+        arrays of shape (n_timesteps, rows, cols) with nodata where any
+        input is missing, and the number of pixels with valid static inputs.
+    :rtype: tuple
+    """
+    _, _, xsize, ysize = window
+    n_timesteps = scenario.n_timesteps
+    probabilities = np.full((n_timesteps, ysize * xsize), PROBABILITY_NODATA, dtype=np.float32)
+    labels = np.full((n_timesteps, ysize * xsize), CLASS_NODATA, dtype=np.uint8)
+
+    # Static columns: read and extracted once for all timesteps
+    static = scenario.read_static(window).reshape(len(scenario.static_columns), ysize * xsize)
+    pixels = np.flatnonzero(np.all(np.isfinite(static), axis=0))
+    if pixels.size:
+        static_rows = static[:, pixels].T
+
+        group_size = max(1, min(n_timesteps, max_rows // pixels.size))
+        for first in range(0, n_timesteps, group_size):
+            timesteps = range(first, min(first + group_size, n_timesteps))
+            rows = np.empty((len(timesteps), pixels.size, scenario.n_features), dtype=np.float32)
+            rows[:, :, scenario.static_columns] = static_rows
+            for row_block, timestep in zip(rows, timesteps):
+                dynamic = scenario.read_dynamic(timestep, window).reshape(len(scenario.dynamic_columns), ysize * xsize)
+                row_block[:, scenario.dynamic_columns] = dynamic[:, pixels].T
+
+            rows = rows.reshape(-1, scenario.n_features)
+            valid = np.all(np.isfinite(rows), axis=1)
+            group_probabilities = np.full(rows.shape[0], PROBABILITY_NODATA, dtype=np.float32)
+            group_labels = np.full(rows.shape[0], CLASS_NODATA, dtype=np.uint8)
+            if valid.any():
+                # One model call for all timesteps of the group
+                probability = predict_probabilities(model, rows[valid])
+                group_probabilities[valid] = probability
+                group_labels[valid] = classify(probability, threshold)
+
+            probabilities[timesteps.start:timesteps.stop, pixels] = group_probabilities.reshape(len(timesteps), -1)
+            labels[timesteps.start:timesteps.stop, pixels] = group_labels.reshape(len(timesteps), -1)
+
+    return (probabilities.reshape(n_timesteps, ysize, xsize),
+            labels.reshape(n_timesteps, ysize, xsize),
+            int(pixels.size))
+
+
+def predict_scenarios(model, scenario, probability_path, class_path=None,
+                      threshold=DEFAULT_THRESHOLD, tile_size=DEFAULT_TILE_SIZE, feedback=None,
+                      cog=False, quantize=False, max_rows=DEFAULT_MAX_ROWS):
+    """Predict time-stacked flood probability (and class) rasters.
+
+    :param model: A fitted model or ModelEnsemble (mean probability).
+
+    :param scenario: Static and dynamic feature rasters.
+    :type scenario: ScenarioStack
+
+    :param probability_path: Output GeoTIFF, one probability band per timestep.
+    :type probability_path: str
+
+    :param class_path: Optional output GeoTIFF, one class band per timestep.
+    :type class_path: str
+
+    :param threshold: Decision threshold for the flood class.
+    :type threshold: float
+
+    :param tile_size: Tile edge in pixels.
+    :type tile_size: int
+
+    :param feedback: Progress/cancellation object (QgsFeedback interface).
+
+    :param cog: Write Cloud-Optimized GeoTIFFs (see core.cog).
+    :type cog: bool
+
+    :param quantize: Store probabilities as uint8 (scale 1/254).
+    :type quantize: bool
+
+    :param max_rows: Upper bound of rows per model call.
+    :type max_rows: int
+
+    :returns: Run summary; ``flood_pixels`` holds one count per timestep.
+    :rtype: dict
+    """
+    start_time = time.perf_counter()
+    grid = scenario.grid
+    band_names = [f"probability_{name}" for name in scenario.timestep_names]
+    windows = list(iter_windows(grid.width, grid.height, tile_size))
+
+    if quantize:
+        probability_out = TiledRasterWriter(
+            probability_path, grid, gdal.GDT_Byte, QUANTIZED_NODATA, scenario.n_timesteps, band_names,
+            cog=cog, tile_size=tile_size, scale=1.0 / QUANTIZED_MAX)
+    else:
+        probability_out = TiledRasterWriter(
+            probability_path, grid, gdal.GDT_Float32, PROBABILITY_NODATA, scenario.n_timesteps, band_names,
+            cog=cog, tile_size=tile_size)
+    class_out = None
+    if class_path:
+        class_out = TiledRasterWriter(
+            class_path, grid, gdal.GDT_Byte, CLASS_NODATA, scenario.n_timesteps,
+            [f"class_{name}" for name in scenario.timestep_names],
+            cog=cog, tile_size=tile_size, resampling='nearest')
+
+    summary = {
+        'tiles': len(windows),
+        'tiles_done': 0,
+        'timesteps': list(scenario.timestep_names),
+        'valid_pixels': 0,
+        'flood_pixels': [0] * scenario.n_timesteps,
+        'workers': 1,
+        'canceled': False,
+    }
+
+    try:
+        for window in windows:
+            probabilities, labels, valid_pixels = predict_scenario_tile(model, scenario, window, threshold, max_rows)
+            xoff, yoff, _, _ = window
+            if quantize:
+                probabilities = quantize_probability(probabilities, PROBABILITY_NODATA)
+            probability_out.write(probabilities, xoff, yoff)
+            if class_out is not None:
+                class_out.write(labels, xoff, yoff)
+
+            summary['tiles_done'] += 1
+            summary['valid_pixels'] += valid_pixels
+            for timestep, count in enumerate((labels == 1).sum(axis=(1, 2))):
+                summary['flood_pixels'][timestep] += int(count)
+            report_progress(feedback, summary['tiles_done'], len(windows))
+
+            if is_canceled(feedback):
+                summary['canceled'] = summary['tiles_done'] < len(windows)
+                break
+    finally:
+        probability_out.close()
+        if class_out is not None:
+            class_out.close()
+
+    summary['seconds'] = time.perf_counter() - start_time
+    return summary
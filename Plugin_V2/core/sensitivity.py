@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Sensitivity sweeps
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ What-if analysis: how does the flood probability respond to one or two
+ features?
+
+ All perturbed feature rows are built at once with NumPy broadcasting and
+ evaluated in a single model call:
+
+ * point_response() gives a response curve (one swept feature) or surface
+   (two swept features) for one feature vector
+ * predict_critical_values() writes, for every pixel of an area, the
+   lowest swept value (e.g. rainfall) at which the pixel becomes flooded
+"""
+
+import time
+
+import numpy as np
+from osgeo import gdal
+
+from .area import DEFAULT_TILE_SIZE, is_canceled, report_progress
+from .cog import TiledRasterWriter
+from .inference import DEFAULT_THRESHOLD, PROBABILITY_NODATA, predict_probabilities
+from .raster import iter_windows
+
+# Upper bound of rows per model call for area sweeps
+DEFAULT_MAX_ROWS = 1 << 20
+
+
+def sweep_values(start, stop, steps):
+    """Evenly spaced values from ``start`` to ``stop`` inclusive"""
+    if steps < 2:
+        raise ValueError("A sweep needs at least 2 steps")
+    return np.linspace(start, stop, int(steps))
+
+
+def sweep_rows(base_features, sweeps):
+    """Feature rows for every combination of swept values.
+
+    :param base_features: Feature vector the sweep starts from, shape (n_features,).
+    :type base_features: numpy.ndarray
+
+    :param sweeps: One or two (feature_index, values) pairs.
+    :type sweeps: list
+
+    :returns: Rows of shape (n_1, [n_2,] n_features); the swept columns vary
+        along the leading axes, every other column keeps its base value.
+    :rtype: numpy.ndarray
+    """
+    if not 1 <= len(sweeps) <= 2:
+        raise ValueError("Sweep one or two features")
+    base_features = np.asarray(base_features, dtype=np.float64)
+    shape = tuple(len(values) for _, values in sweeps)
+
+    rows = np.broadcast_to(base_features, shape + base_features.shape).copy()
+    for axis, (index, values) in enumerate(sweeps):
+        # Values along their own axis, broadcast along the other one
+        axis_shape = [1] * len(sweeps)
+        axis_shape[axis] = len(values)
+        rows[..., index] = np.asarray(values, dtype=np.float64).reshape(axis_shape)
+    return rows
+
+
+def point_response(model, base_features, sweeps):
+    """Flood probability response of one feature vector to swept features.
+
+    :param model: A fitted model or ModelEnsemble.
+
+    :param base_features: Feature vector, shape (n_features,).
+
+    :param sweeps: One or two (feature_index, values) pairs.
+    :type sweeps: list
+
+    :returns: Probabilities of shape (n_1,) for a curve or (n_1, n_2) for a
+        surface, computed with one model call.
+    :rtype: numpy.ndarray
+    """
+    rows = sweep_rows(base_features, sweeps)
+    n_features = rows.shape[-1]
+    probabilities = predict_probabilities(model, rows.reshape(-1, n_features))
+    return probabilities.reshape(rows.shape[:-1])
+
+
+def critical_values(probabilities, values, threshold=DEFAULT_THRESHOLD, nodata=PROBABILITY_NODATA):
+    """First swept value at which the probability reaches ``threshold``.
+
+    :param probabilities: Shape (n_values, n_samples), in sweep order.
+    :param values: Swept values, shape (n_values,).
+
+    :returns: Shape (n_samples,); ``nodata`` where the threshold is never reached.
+    :rtype: numpy.ndarray
+    """
+    reached = np.asarray(probabilities) >= threshold
+    first = np.argmax(reached, axis=0)
+    result = np.asarray(values, dtype=np.float64)[first]
+    result[~reached.any(axis=0)] = nodata
+    return result
+
+
+def predict_critical_values(model, stack, feature_index, values, output_path,
+                            threshold=DEFAULT_THRESHOLD, tile_size=DEFAULT_TILE_SIZE, feedback=None,
+                            cog=False, max_rows=DEFAULT_MAX_ROWS):
+    """Raster of the swept value at which every pixel becomes flooded.
+
+    For a rainfall sweep this is a "rainfall needed to flood" map. The
+    input raster of the swept feature only defines which pixels are valid;
+    its values are replaced by the swept values. Values should be sorted in
+    the direction of increasing risk.
+
+    :param model: A fitted model or ModelEnsemble.
+
+    :param stack: Feature rasters in model feature order.
+    :type stack: FeatureStack
+
+    :param feature_index: Index of the swept feature.
+    :type feature_index: int
+
+    :param values: Swept values, in sweep order.
+
+    :param output_path: Output GeoTIFF; PROBABILITY_NODATA where the
+        threshold is not reached within the sweep.
+    :type output_path: str
+
+    :returns: Run summary with tile, pixel and timing counts.
+    :rtype: dict
+    """
+    start_time = time.perf_counter()
+    values = np.asarray(values, dtype=np.float64)
+    grid = stack.grid
+    windows = list(iter_windows(grid.width, grid.height, tile_size))
+
+    output = TiledRasterWriter(output_path, grid, gdal.GDT_Float32, PROBABILITY_NODATA, 1,
+                               [f"critical_{stack.names[feature_index]}"], cog=cog, tile_size=tile_size)
+    summary = {
+        'tiles': len(windows),
+        'tiles_done': 0,
+        'valid_pixels': 0,
+        'flooding_pixels': 0,
+        'canceled': False,
+    }
+
+    try:
+        for xoff, yoff, xsize, ysize in windows:
+            features, valid_mask = stack.read_window(xoff, yoff, xsize, ysize)
+            result = np.full((ysize, xsize), PROBABILITY_NODATA, dtype=np.float32)
+
+            if valid_mask.any():
+                pixel_rows = features[:, valid_mask].T
+                probabilities = np.empty((len(values), pixel_rows.shape[0]))
+                group_size = max(1, min(len(values), max_rows // pixel_rows.shape[0]))
+                for first in range(0, len(values), group_size):
+                    group = values[first:first + group_size]
+                    # (n_group, n_pixels, n_features) by broadcasting the pixel rows
+                    rows = np.broadcast_to(pixel_rows, (len(group),) + pixel_rows.shape).copy()
+                    rows[:, :, feature_index] = group[:, np.newaxis]
+                    probabilities[first:first + len(group)] = predict_probabilities(
+                        model, rows.reshape(-1, pixel_rows.shape[1])).reshape(len(group), -1)
+
+                critical = critical_values(probabilities, values, threshold)
+                result[valid_mask] = critical
+                summary['valid_pixels'] += int(valid_mask.sum())
+                summary['flooding_pixels'] += int((critical != PROBABILITY_NODATA).sum())
+
+            output.write(result, xoff, yoff)
+            summary['tiles_done'] += 1
+            report_progress(feedback, summary['tiles_done'], len(windows))
+            if is_canceled(feedback):
+                summary['canceled'] = summary['tiles_done'] < len(windows)
+                break
+    finally:
+        output.close()
+
+    summary['seconds'] = time.perf_counter() - start_time
+    return summary
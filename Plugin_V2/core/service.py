@@ -0,0 +1,468 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Local prediction service
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Headless HTTP service answering flood predictions for points.
+
+ The service samples the feature rasters (core.sampling) and runs the model
+ (core.inference / core.ensemble) exactly like the plugin's point queue.
+ Requests that arrive within ``window`` seconds of each other are merged
+ into one micro-batch: one read per raster region and one vectorized model
+ call serve all of them. Model calls run in a single background thread, so
+ the event loop keeps accepting requests meanwhile.
+
+ Endpoints (JSON in, JSON out):
+
+ * ``POST /predict`` with ``{"x": 1.0, "y": 2.0}``, ``{"x": [...], "y": [...]}``
+   or ``{"points": [[x, y], ...]}``; coordinates in the rasters' CRS.
+   Returns ``probability``, ``label`` and ``valid`` lists in point order
+   (null where a raster has no data); ``"features": true`` adds the
+   sampled feature values.
+ * ``GET /metrics``: request, point and batch counts, latency percentiles
+   and throughput.
+ * ``GET /health``: feature names and model type.
+
+ The server only binds loopback addresses. Run it with::
+
+     python -m <plugin package>.core.service --model model.pkl \\
+         --raster dem.tif --raster slope.tif ...
+
+ Standard library only (asyncio), besides NumPy and GDAL.
+"""
+
+import asyncio
+import ipaddress
+import json
+import socket
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .ensemble import predict_points
+from .features import order_for_model
+from .inference import DEFAULT_THRESHOLD
+from .sampling import SAMPLING_METHODS, RasterSampler
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Seconds a batch waits for further requests after the first one arrived
+DEFAULT_BATCH_WINDOW = 0.005
+
+# Points after which a batch is closed early; a larger request forms its own batch
+DEFAULT_MAX_BATCH = 65536
+
+# Largest request body accepted
+MAX_BODY_BYTES = 16 << 20
+
+# Latencies kept for the percentiles in /metrics
+LATENCY_SAMPLES = 10000
+
+_STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class ServiceError(Exception):
+    """Request error reported to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class PointPredictor:
+    """Samples feature rasters at points and predicts them in one model call"""
+
+    def __init__(self, model, raster_paths, names=None, threshold=DEFAULT_THRESHOLD, method='nearest', radius=0.0):
+        """Constructor.
+
+        :param model: Fitted model or ModelEnsemble.
+
+        :param raster_paths: One GDAL raster per model feature, in model
+            feature order unless ``names`` give the order (see
+            core.features.feature_order). All rasters must use the same CRS.
+        :type raster_paths: list
+
+        :param names: Feature names; file names by default.
+        :type names: list
+
+        :param threshold: Decision threshold for the flood class.
+        :type threshold: float
+
+        :param method: Sampling method, see core.sampling.
+        :type method: str
+
+        :param radius: Radius in map units for the ``mean`` method.
+        :type radius: float
+        """
+        if method not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown sampling method '{method}'; expected one of {', '.join(SAMPLING_METHODS)}")
+        self.model = model
+        self.paths = list(raster_paths)
+        self.names = list(names) if names else [p.replace('\\', '/').split('/')[-1] for p in self.paths]
+        self.names, self.paths = order_for_model(self.names, self.paths, model)
+        self.threshold = threshold
+        self.method = method
+        self.radius = radius
+        self.samplers = [RasterSampler(path) for path in self.paths]
+        _check_same_crs([sampler.grid for sampler in self.samplers], self.paths)
+
+    def predict(self, x, y):
+        """Features, probabilities and labels for points in the rasters' CRS.
+
+        :returns: Dictionary with ``features`` (n_points, n_features),
+            ``probability``, ``label`` and ``valid`` (all features finite).
+        :rtype: dict
+        """
+        features = np.column_stack([sampler.sample(x, y, self.method, self.radius) for sampler in self.samplers])
+        probability, label, valid = predict_points(self.model, features, self.threshold)
+        return {'features': features, 'probability': probability, 'label': label, 'valid': valid}
+
+    def close(self):
+        """Release the rasters and the model"""
+        for sampler in self.samplers:
+            sampler.close()
+        self.samplers = []
+        if hasattr(self.model, 'close'):
+            self.model.close()
+
+
+def _check_same_crs(grids, paths):
+    """Raise ValueError unless every grid uses the CRS of the first one"""
+    for grid, path in zip(grids[1:], paths[1:]):
+        if grid.projection == grids[0].projection:
+            continue
+        from osgeo import osr
+        reference, other = osr.SpatialReference(), osr.SpatialReference()
+        reference.ImportFromWkt(grids[0].projection)
+        other.ImportFromWkt(grid.projection)
+        if not reference.IsSame(other):
+            raise ValueError(f"{path} uses a different CRS than {paths[0]}; reproject the feature rasters first")
+
+
+class ServiceMetrics:
+    """Request and batch counters with recent latencies"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.points = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.predict_seconds = 0.0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def record_request(self, seconds, n_points):
+        self.requests += 1
+        self.points += n_points
+        self.latencies.append(seconds)
+
+    def record_batch(self, n_requests, seconds):
+        self.batches += 1
+        self.batched_requests += n_requests
+        self.predict_seconds += seconds
+
+    def snapshot(self):
+        """Metrics as a JSON-serializable dictionary"""
+        uptime = time.monotonic() - self.started
+        latencies = np.array(self.latencies) * 1000.0
+        percentiles = {}
+        if latencies.size:
+            for name, value in zip(('p50', 'p95', 'p99', 'max'), np.percentile(latencies, [50, 95, 99, 100])):
+                percentiles[name] = round(float(value), 3)
+        return {
+            'uptime_seconds': round(uptime, 3),
+            'requests': self.requests,
+            'errors': self.errors,
+            'points': self.points,
+            'batches': self.batches,
+            'requests_per_batch': round(self.batched_requests / self.batches, 3) if self.batches else None,
+            'predict_seconds': round(self.predict_seconds, 3),
+            'latency_ms': percentiles,
+            'requests_per_second': round(self.requests / uptime, 3) if uptime > 0 else None,
+            'points_per_second': round(self.points / uptime, 3) if uptime > 0 else None,
+        }
+
+
+class MicroBatcher:
+    """Merges concurrent point requests into one PointPredictor call"""
+
+    def __init__(self, predictor, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH, metrics=None):
+        self.predictor = predictor
+        self.window = window
+        self.max_batch = max_batch
+        self.metrics = metrics or ServiceMetrics()
+        self._queue = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='flood-service')
+        self._task = None
+
+    def start(self):
+        """Start the batching loop on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=True)
+
+    async def submit(self, x, y):
+        """Predict points; resolves once the batch containing them is done"""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((x, y, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            n_points = len(batch[0][0])
+            # Give concurrent requests a moment to join this batch
+            if n_points < self.max_batch and self.window > 0:
+                await asyncio.sleep(self.window)
+            while n_points < self.max_batch and not self._queue.empty():
+                item = self._queue.get_nowait()
+                batch.append(item)
+                n_points += len(item[0])
+
+            x = np.concatenate([item[0] for item in batch])
+            y = np.concatenate([item[1] for item in batch])
+            start = time.perf_counter()
+            try:
+                result = await loop.run_in_executor(self._executor, self.predictor.predict, x, y)
+            except Exception as error:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            self.metrics.record_batch(len(batch), time.perf_counter() - start)
+
+            offset = 0
+            for item_x, _, future in batch:
+                stop = offset + len(item_x)
+                if not future.done():
+                    future.set_result({key: values[offset:stop] for key, values in result.items()})
+                offset = stop
+
+
+def parse_points(payload):
+    """x and y arrays from a /predict request body.
+
+    :raises ServiceError: for malformed bodies.
+    """
+    if not isinstance(payload, dict):
+        raise ServiceError(400, "Request body must be a JSON object")
+    try:
+        if 'points' in payload:
+            points = np.asarray(payload['points'], dtype=np.float64)
+            if points.ndim != 2 or points.shape[1] != 2:
+                raise ValueError("'points' must be a list of [x, y] pairs")
+            x, y = points[:, 0], points[:, 1]
+        elif 'x' in payload and 'y' in payload:
+            x = np.atleast_1d(np.asarray(payload['x'], dtype=np.float64))
+            y = np.atleast_1d(np.asarray(payload['y'], dtype=np.float64))
+            if x.ndim != 1 or x.shape != y.shape:
+                raise ValueError("'x' and 'y' must be numbers or lists of the same length")
+        else:
+            raise ValueError("Expected 'points' or 'x' and 'y'")
+    except (TypeError, ValueError) as e:
+        raise ServiceError(400, str(e))
+    if not np.all(np.isfinite(x)) or not np.all(np.isfinite(y)):
+        raise ServiceError(400, "Coordinates must be finite numbers")
+    return x, y
+
+
+def _json_list(values):
+    """List for JSON, None in place of NaN"""
+    return [None if value != value else value for value in values.tolist()]
+
+
+def prediction_response(result, names, include_features=False):
+    """JSON body for one request's slice of a batch result"""
+    valid = result['valid']
+    response = {
+        'points': int(valid.size),
+        'probability': _json_list(result['probability']),
+        'label': [int(label) if ok else None for label, ok in zip(result['label'].tolist(), valid.tolist())],
+        'valid': valid.tolist(),
+    }
+    if include_features:
+        response['feature_names'] = names
+        response['features'] = [_json_list(row) for row in result['features']]
+    return response
+
+
+def ensure_loopback(host):
+    """Raise ValueError unless ``host`` resolves to a loopback address"""
+    address = ipaddress.ip_address(socket.gethostbyname(host))
+    if not address.is_loopback:
+        raise ValueError(f"The prediction service only listens on localhost, not {host}")
+
+
+class PredictionService:
+    """asyncio HTTP/1.1 server around a MicroBatcher"""
+
+    def __init__(self, predictor, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        ensure_loopback(host)
+        self.predictor = predictor
+        self.host = host
+        self.port = port
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(predictor, window, max_batch, self.metrics)
+        self.server = None
+
+    async def start(self):
+        """Start listening; with port 0 the chosen port is stored in ``port``"""
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            keep_alive = True
+            while keep_alive:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                try:
+                    parts = request_line.decode('latin-1').split()
+                    if len(parts) != 3:
+                        raise ServiceError(400, "Malformed request line")
+                    method, target, _ = parts
+                    length = int(headers.get('content-length', 0) or 0)
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise ServiceError(413, f"Request body larger than {MAX_BODY_BYTES} bytes")
+                    body = await reader.readexactly(length) if length else b''
+                    status, response = await self._dispatch(method, target.split('?')[0], body)
+                except ServiceError as e:
+                    self.metrics.errors += 1
+                    status, response = e.status, {'error': str(e)}
+                except Exception as e:
+                    self.metrics.errors += 1
+                    status, response = 500, {'error': str(e)}
+
+                payload = json.dumps(response).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {_STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        if path == '/predict':
+            if method != 'POST':
+                raise ServiceError(405, "Use POST for /predict")
+            try:
+                payload = json.loads(body or b'null')
+            except ValueError as e:
+                raise ServiceError(400, f"Invalid JSON: {e}")
+            x, y = parse_points(payload)
+            start = time.perf_counter()
+            result = await self.batcher.submit(x, y)
+            self.metrics.record_request(time.perf_counter() - start, x.size)
+            return 200, prediction_response(result, self.predictor.names, bool(payload.get('features')))
+        if path == '/metrics':
+            if method != 'GET':
+                raise ServiceError(405, "Use GET for /metrics")
+            return 200, self.metrics.snapshot()
+        if path == '/health':
+            if method != 'GET':
+                raise ServiceError(405, "Use GET for /health")
+            return 200, {'status': 'ok', 'features': self.predictor.names,
+                         'model': type(self.predictor.model).__name__,
+                         'sampling': self.predictor.method, 'threshold': self.predictor.threshold}
+        raise ServiceError(404, f"Unknown path {path}")
+
+
+def main(argv=None):
+    """Command line entry point of the headless service"""
+    import argparse
+
+    from .ensemble import load_predictor
+
+    parser = argparse.ArgumentParser(description="Local flood prediction service")
+    parser.add_argument('--model', action='append', required=True,
+                        help="Model file; repeat for an ensemble")
+    parser.add_argument('--raster', action='append', required=True,
+                        help="Feature raster, repeated in model feature order")
+    parser.add_argument('--name', action='append', help="Feature name per raster")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument('--sampling', choices=SAMPLING_METHODS, default='nearest')
+    parser.add_argument('--radius', type=float, default=0.0, help="Radius in map units for --sampling mean")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--window-ms', type=float, default=DEFAULT_BATCH_WINDOW * 1000.0,
+                        help="Time a batch waits for concurrent requests")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="Points per batch")
+    args = parser.parse_args(argv)
+    ensure_loopback(args.host)
+
+    predictor = PointPredictor(load_predictor(args.model), args.raster, args.name,
+                               args.threshold, args.sampling, args.radius)
+    try:
+        service = PredictionService(predictor, args.host, args.port, args.window_ms / 1000.0, args.max_batch)
+        print(f"Flood prediction service on http://{args.host}:{args.port} "
+              f"({len(predictor.names)} features: {', '.join(predictor.names)})")
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        predictor.close()
+
+
+if __name__ == '__main__':
+    main()
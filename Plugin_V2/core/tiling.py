@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Tile planning
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Tile size for area prediction from a memory budget.
+
+ Memory per tile grows with the tile area, the number of features and
+ output bands, and the model's scratch space per predicted pixel. The
+ planner picks the largest tile that keeps every tile in flight (pipeline
+ queues or worker slots, see core.pipeline) within the budget. Tile edges
+ are multiples of the inputs' native block sizes (GeoTIFF/COG tiles) and
+ of the output block size, so every read and write covers whole blocks.
+ Tiles stop growing once a larger size would leave fewer than
+ MIN_TILES_PER_WORKER tiles per worker; they are never shrunk below the
+ block alignment for this, so a small raster can leave workers idle. Only
+ a budget too small for the aligned size halves the tile further.
+"""
+
+import math
+
+from .cog import COG_BLOCK_SIZE
+from .ensemble import ModelEnsemble
+from .pipeline import DEFAULT_DEPTH, pipeline_memory, prediction_scratch, tile_memory
+
+# Budget when the user sets no memory limit
+DEFAULT_MEMORY_BUDGET = 1 << 30
+
+# Largest tile edge the planner picks
+MAX_TILE_SIZE = 4096
+
+# Tiles per worker the planner keeps at least, for load balancing
+MIN_TILES_PER_WORKER = 4
+
+# Model scratch bytes per pixel when nothing better is known
+DEFAULT_MODEL_SCRATCH = 64
+
+
+def native_block_sizes(stack):
+    """(width, height) blocks of the tiled inputs of a FeatureStack.
+
+    Striped rasters (blocks spanning the full width) and warped VRTs have
+    no useful block structure and are skipped.
+    """
+    sizes = []
+    for dataset, band in zip(stack.datasets, stack.bands):
+        if dataset.GetDriver().ShortName == 'VRT':
+            continue
+        block_width, block_height = band.GetBlockSize()
+        if block_width < dataset.RasterXSize:
+            sizes.append((block_width, block_height))
+    return sizes
+
+
+def tile_alignment(block_sizes, output_block=COG_BLOCK_SIZE, max_tile=MAX_TILE_SIZE):
+    """Smallest tile edge that is a multiple of every block edge.
+
+    Block sizes whose common multiple would exceed ``max_tile`` are left
+    out; the output block size is always honoured.
+    """
+    alignment = output_block
+    for size in sorted({edge for block in block_sizes for edge in block}):
+        candidate = alignment * size // math.gcd(alignment, size)
+        if candidate <= max_tile:
+            alignment = candidate
+    return alignment
+
+
+def model_scratch_per_pixel(model):
+    """Estimated bytes a model allocates per predicted pixel.
+
+    MLPs hold their hidden activations, forests one probability row per
+    parallel job; other models get DEFAULT_MODEL_SCRATCH.
+    """
+    if isinstance(model, ModelEnsemble):
+        return max((model_scratch_per_pixel(member) for member in model.models), default=DEFAULT_MODEL_SCRATCH)
+    hidden_layers = getattr(model, 'hidden_layer_sizes', None)
+    if hidden_layers is not None:
+        if isinstance(hidden_layers, int):
+            hidden_layers = [hidden_layers]
+        # Activations of the current and the next layer
+        return 16 * sum(hidden_layers)
+    if hasattr(model, 'estimators_'):
+        n_classes = len(getattr(model, 'classes_', (0, 1)))
+        n_jobs = getattr(model, 'n_jobs', None) or 1
+        if n_jobs < 0:
+            import os
+            n_jobs = os.cpu_count() or 1
+        return 8 * n_classes * (n_jobs + 1)
+    return DEFAULT_MODEL_SCRATCH
+
+
+def tile_peak_memory(tile_size, n_features, n_bands, model_scratch, workers=1):
+    """Peak bytes of area prediction with square tiles of ``tile_size``.
+
+    In the calling process this is the pipeline at DEFAULT_DEPTH (see
+    core.pipeline.pipeline_memory); with worker processes every worker has
+    two slots and predicts one tile at a time.
+    """
+    if workers > 1:
+        from .area import SLOTS_PER_WORKER
+        per_tile = tile_memory(n_features, n_bands, tile_size)
+        scratch = prediction_scratch(n_features, n_bands, tile_size, model_scratch)
+        return workers * (SLOTS_PER_WORKER * per_tile + scratch)
+    return pipeline_memory(DEFAULT_DEPTH, n_features, n_bands, tile_size, model_scratch)
+
+
+def plan_tile_size(model, stack, n_bands, memory_limit=None, workers=1):
+    """Pick the area prediction tile edge for a model, inputs and budget.
+
+    :param model: Fitted model or ModelEnsemble.
+
+    :param stack: Feature rasters.
+    :type stack: FeatureStack
+
+    :param n_bands: Probability output bands.
+    :type n_bands: int
+
+    :param memory_limit: Budget in bytes; DEFAULT_MEMORY_BUDGET if None.
+    :type memory_limit: int
+
+    :param workers: Worker processes (1 = calling process).
+    :type workers: int
+
+    :returns: Dictionary with ``tile_size``, ``alignment``, ``peak_bytes``
+        (estimate for the chosen size), ``model_scratch`` and ``tiles``.
+    :rtype: dict
+    """
+    memory_limit = memory_limit or DEFAULT_MEMORY_BUDGET
+    grid = stack.grid
+    alignment = tile_alignment(native_block_sizes(stack))
+    model_scratch = model_scratch_per_pixel(model)
+
+    def peak(size):
+        return tile_peak_memory(size, stack.n_features, n_bands, model_scratch, workers)
+
+    def tile_count(size):
+        return math.ceil(grid.width / size) * math.ceil(grid.height / size)
+
+    # Doubling keeps tile edges divisible by every overview factor (see core.cog)
+    tile_size = alignment
+    larger = tile_size * 2
+    while (larger <= MAX_TILE_SIZE and peak(larger) <= memory_limit
+           and larger < 2 * max(grid.width, grid.height)
+           and tile_count(larger) >= MIN_TILES_PER_WORKER * workers):
+        tile_size, larger = larger, larger * 2
+
+    # Below the alignment only halving is left; reads then cover part of a block
+    while peak(tile_size) > memory_limit and tile_size > 64:
+        tile_size //= 2
+
+    return {
+        'tile_size': tile_size,
+        'alignment': alignment,
+        'peak_bytes': peak(tile_size),
+        'model_scratch': model_scratch,
+        'tiles': tile_count(tile_size),
+    }
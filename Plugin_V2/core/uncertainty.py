@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Tree-ensemble uncertainty
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Per-sample uncertainty for RandomForest-style models.
+
+ A forest's predict_proba() is the mean of its trees' probabilities. Here
+ the trees are traversed once and their probabilities are accumulated into
+ a running sum, sum of squares and flood-vote count, which gives in the
+ same pass:
+
+ * the flood probability (identical to predict_proba)
+ * the standard deviation of the per-tree probabilities
+ * the inter-tree disagreement: share of trees voting for the minority
+   class (0 = unanimous, 0.5 = evenly split)
+
+ Memory stays O(n_samples) whatever the number of trees.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .inference import DEFAULT_THRESHOLD, PROBABILITY_NODATA, CLASS_NODATA, classify, positive_class_index
+
+# Bands added to area outputs when uncertainty is computed
+UNCERTAINTY_BAND_NAMES = ['tree_std', 'tree_disagreement']
+
+# Models whose predict_proba is the plain mean of estimators_ predict_proba
+_AVERAGING_ENSEMBLES = ('RandomForestClassifier', 'ExtraTreesClassifier', 'BaggingClassifier')
+
+
+def supports_tree_uncertainty(model):
+    """True if per-tree uncertainty can be computed for ``model``"""
+    return (type(model).__name__ in _AVERAGING_ENSEMBLES
+            and len(getattr(model, 'estimators_', None) or []) > 1)
+
+
+def _thread_count(model):
+    """Threads to use, following the model's own n_jobs setting"""
+    n_jobs = getattr(model, 'n_jobs', None)
+    if n_jobs is None or n_jobs == 1:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def predict_with_uncertainty(model, features):
+    """Flood probability, tree spread and tree disagreement in one traversal.
+
+    :param model: A fitted RandomForestClassifier, ExtraTreesClassifier or
+        BaggingClassifier (see supports_tree_uncertainty).
+
+    :param features: Feature matrix of shape (n_samples, n_features).
+    :type features: numpy.ndarray
+
+    :returns: Tuple (probability, std, disagreement), each (n_samples,).
+    :rtype: tuple
+
+    :raises ValueError: If the model is not a supported tree ensemble.
+    """
+    if not supports_tree_uncertainty(model):
+        raise ValueError(f"Tree uncertainty is not available for {type(model).__name__} models")
+
+    features = np.asarray(features, dtype=np.float64)
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+    n_samples = features.shape[0]
+
+    n_classes = len(model.classes_)
+    column = positive_class_index(model) % n_classes
+    estimators = model.estimators_
+    # BaggingClassifier trains every estimator on a subset of the features
+    feature_subsets = getattr(model, 'estimators_features_', None)
+    # Trees work in float32; convert once instead of once per tree
+    tree_features = np.ascontiguousarray(features, dtype=np.float32)
+
+    total = np.zeros(n_samples, dtype=np.float64)
+    total_squares = np.zeros(n_samples, dtype=np.float64)
+    flood_votes = np.zeros(n_samples, dtype=np.int64)
+    lock = threading.Lock()
+
+    def accumulate(index):
+        estimator = estimators[index]
+        if feature_subsets is not None:
+            proba = estimator.predict_proba(features[:, feature_subsets[index]])
+        else:
+            proba = estimator.predict_proba(tree_features, check_input=False)
+        proba = np.asarray(proba, dtype=np.float64)
+        if proba.shape[1] == n_classes:
+            proba = proba[:, column]
+        else:
+            # Bagging members fitted on a bootstrap sample that missed a class
+            # only know the (encoded) classes they have seen
+            member_classes = list(estimator.classes_)
+            proba = proba[:, member_classes.index(column)] if column in member_classes else np.zeros(n_samples)
+        with lock:
+            np.add(total, proba, out=total)
+            np.add(total_squares, proba * proba, out=total_squares)
+            np.add(flood_votes, proba > 0.5, out=flood_votes)
+
+    threads = _thread_count(model)
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # list() re-raises the first exception of any tree
+            list(executor.map(accumulate, range(len(estimators))))
+    else:
+        for index in range(len(estimators)):
+            accumulate(index)
+
+    n_trees = len(estimators)
+    probability = total / n_trees
+    variance = np.maximum(total_squares / n_trees - probability * probability, 0.0)
+    disagreement = np.minimum(flood_votes, n_trees - flood_votes) / n_trees
+    return probability, np.sqrt(variance), disagreement
+
+
+def predict_block_with_uncertainty(model, feature_block, valid_mask=None, threshold=DEFAULT_THRESHOLD):
+    """Probability, uncertainty and class rasters for one block of pixels.
+
+    :param feature_block: Feature values of shape (n_features, rows, cols).
+    :type feature_block: numpy.ndarray
+
+    :returns: Tuple (bands, labels). ``bands`` is float32 of shape
+        (3, rows, cols): flood probability followed by UNCERTAINTY_BAND_NAMES,
+        PROBABILITY_NODATA where invalid. ``labels`` is uint8 with
+        CLASS_NODATA where invalid.
+    :rtype: tuple
+    """
+    _, rows, cols = feature_block.shape
+    if valid_mask is None:
+        valid_mask = np.all(np.isfinite(feature_block), axis=0)
+
+    bands = np.full((1 + len(UNCERTAINTY_BAND_NAMES), rows, cols), PROBABILITY_NODATA, dtype=np.float32)
+    labels = np.full((rows, cols), CLASS_NODATA, dtype=np.uint8)
+
+    if valid_mask.any():
+        probability, std, disagreement = predict_with_uncertainty(model, feature_block[:, valid_mask].T)
+        bands[0][valid_mask] = probability
+        bands[1][valid_mask] = std
+        bands[2][valid_mask] = disagreement
+        labels[valid_mask] = classify(probability, threshold)
+
+    return bands, labels
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Zonal statistics
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Flood risk statistics per zone (ward, municipality, catchment, ...).
+
+ The zone polygons are rasterized once into a zone-ID grid aligned with the
+ probability raster. One pass over the tiles then accumulates every zone's
+ statistics with np.bincount, so thousands of zones cost a single raster
+ read instead of one clip-and-read per polygon. Each pixel belongs to at
+ most one zone; where polygons overlap the last one wins.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+from osgeo import gdal, ogr, osr
+
+from .area import DEFAULT_TILE_SIZE, is_canceled, report_progress
+from .inference import DEFAULT_THRESHOLD
+from .raster import GTIFF_OPTIONS, RasterGrid, _gdal_error, create_raster, iter_windows, open_raster, read_probability
+
+# Statistics fields added to the output layer
+ZONAL_FIELDS = [
+    ('pixels', ogr.OFTInteger64),
+    ('valid_pixels', ogr.OFTInteger64),
+    ('mean_prob', ogr.OFTReal),
+    ('max_prob', ogr.OFTReal),
+    ('flood_pixels', ogr.OFTInteger64),
+    ('flood_share', ogr.OFTReal),
+    ('flood_area', ogr.OFTReal),
+]
+
+
+def _open_zones(zones_path, zones_layer=None):
+    """Open a polygon layer with OGR; returns (datasource, layer)"""
+    source = ogr.Open(zones_path)
+    if source is None:
+        raise RuntimeError(f"Cannot open zone layer {zones_path}")
+    layer = source.GetLayerByName(zones_layer) if zones_layer else source.GetLayer(0)
+    if layer is None:
+        raise RuntimeError(f"Layer '{zones_layer}' not found in {zones_path}")
+    return source, layer
+
+
+def rasterize_zones(zones_path, grid, zone_raster_path, zones_layer=None, all_touched=False):
+    """Burn zone numbers 1..n into a UInt32 raster on ``grid``.
+
+    Geometries are reprojected to the grid CRS if needed.
+
+    :returns: FIDs of the zones; zone number i belongs to fids[i - 1].
+    :rtype: list
+    """
+    source, layer = _open_zones(zones_path, zones_layer)
+    grid_srs = osr.SpatialReference()
+    grid_srs.ImportFromWkt(grid.projection)
+    grid_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    layer_srs = layer.GetSpatialRef()
+    transform = None
+    if layer_srs is not None and not layer_srs.IsSame(grid_srs):
+        layer_srs = layer_srs.Clone()
+        layer_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        transform = osr.CoordinateTransformation(layer_srs, grid_srs)
+
+    # Zone numbers as an attribute of a light in-memory copy of the polygons
+    memory = ogr.GetDriverByName('Memory').CreateDataSource('zones')
+    zone_layer = memory.CreateLayer('zones', grid_srs, ogr.wkbMultiPolygon)
+    zone_layer.CreateField(ogr.FieldDefn('zone', ogr.OFTInteger64))
+    definition = zone_layer.GetLayerDefn()
+    fids = []
+    for feature in layer:
+        geometry = feature.GetGeometryRef()
+        if geometry is None:
+            continue
+        geometry = geometry.Clone()
+        if transform is not None:
+            geometry.Transform(transform)
+        fids.append(feature.GetFID())
+        zone = ogr.Feature(definition)
+        zone.SetGeometryDirectly(geometry)
+        zone.SetField(0, len(fids))
+        zone_layer.CreateFeature(zone)
+
+    zone_ds = create_raster(zone_raster_path, grid, gdal.GDT_UInt32, 0, options=GTIFF_OPTIONS)
+    options = ['ATTRIBUTE=zone']
+    if all_touched:
+        options.append('ALL_TOUCHED=TRUE')
+    if gdal.RasterizeLayer(zone_ds, [1], zone_layer, options=options) != 0:
+        raise _gdal_error("Failed to rasterize the zone layer")
+    zone_ds.FlushCache()
+    zone_ds = None
+    return fids
+
+
+def zonal_statistics(probability_path, zones_path, zones_layer=None, threshold=DEFAULT_THRESHOLD, band=1,
+                     tile_size=DEFAULT_TILE_SIZE, all_touched=False, feedback=None):
+    """Flood statistics of every zone polygon over a probability raster.
+
+    :param probability_path: Probability raster (float32 or quantized uint8).
+    :type probability_path: str
+
+    :param zones_path: OGR-readable polygon file.
+    :type zones_path: str
+
+    :param zones_layer: Layer name inside ``zones_path``; first layer if None.
+    :type zones_layer: str
+
+    :param threshold: Probability at or above which a pixel counts as flooded.
+    :type threshold: float
+
+    :param all_touched: Count every pixel a polygon touches, not only
+        pixels whose centre is inside.
+    :type all_touched: bool
+
+    :param feedback: Progress/cancellation object (QgsFeedback interface).
+
+    :returns: Dictionary of per-zone arrays in zone order: ``fids``,
+        ``pixels``, ``valid_pixels``, ``mean_prob``, ``max_prob``,
+        ``flood_pixels``, ``flood_share`` and ``flood_area``, plus
+        ``canceled`` and ``seconds``. Statistics of zones without valid
+        pixels are NaN.
+    :rtype: dict
+    """
+    start_time = time.perf_counter()
+    source = open_raster(probability_path)
+    grid = RasterGrid.from_dataset(source)
+    probability_band = source.GetRasterBand(band)
+    pixel_width, pixel_height = grid.pixel_size
+
+    handle, zone_raster_path = tempfile.mkstemp(suffix='.tif', prefix='flood_zones_')
+    os.close(handle)
+    try:
+        fids = rasterize_zones(zones_path, grid, zone_raster_path, zones_layer, all_touched)
+        n_bins = len(fids) + 1
+        pixels = np.zeros(n_bins, dtype=np.int64)
+        valid_pixels = np.zeros(n_bins, dtype=np.int64)
+        flood_pixels = np.zeros(n_bins, dtype=np.int64)
+        sums = np.zeros(n_bins, dtype=np.float64)
+        maxima = np.full(n_bins, -np.inf)
+
+        zone_ds = open_raster(zone_raster_path)
+        zone_band = zone_ds.GetRasterBand(1)
+        windows = list(iter_windows(grid.width, grid.height, tile_size))
+        canceled = False
+        for done, (xoff, yoff, xsize, ysize) in enumerate(windows, start=1):
+            zones = zone_band.ReadAsArray(xoff, yoff, xsize, ysize).ravel()
+            if zones.any():
+                probability = read_probability(probability_band, xoff, yoff, xsize, ysize).ravel()
+                valid = np.isfinite(probability)
+                valid_zones = zones[valid]
+                valid_probability = probability[valid]
+
+                pixels += np.bincount(zones, minlength=n_bins)
+                valid_pixels += np.bincount(valid_zones, minlength=n_bins)
+                sums += np.bincount(valid_zones, weights=valid_probability, minlength=n_bins)
+                flood_pixels += np.bincount(valid_zones[valid_probability >= threshold], minlength=n_bins)
+                np.maximum.at(maxima, valid_zones, valid_probability)
+
+            report_progress(feedback, done, len(windows))
+            if is_canceled(feedback):
+                canceled = done < len(windows)
+                break
+        zone_ds = None
+    finally:
+        source = None
+        gdal.GetDriverByName('GTiff').Delete(zone_raster_path)
+
+    # Bin 0 collects pixels outside every zone
+    pixels, valid_pixels, flood_pixels, sums, maxima = (
+        values[1:] for values in (pixels, valid_pixels, flood_pixels, sums, maxima))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = sums / valid_pixels
+        share = flood_pixels / valid_pixels
+    maxima[valid_pixels == 0] = np.nan
+
+    return {
+        'fids': fids,
+        'pixels': pixels,
+        'valid_pixels': valid_pixels,
+        'mean_prob': mean,
+        'max_prob': maxima,
+        'flood_pixels': flood_pixels,
+        'flood_share': share,
+        'flood_area': flood_pixels * abs(pixel_width * pixel_height),
+        'canceled': canceled,
+        'seconds': time.perf_counter() - start_time,
+    }
+
+
+def write_zonal_layer(zones_path, output_path, statistics, zones_layer=None):
+    """Copy the zone polygons with their statistics to a GeoPackage.
+
+    :param statistics: Result of zonal_statistics().
+    :type statistics: dict
+
+    :returns: Number of features written.
+    :rtype: int
+    """
+    source, layer = _open_zones(zones_path, zones_layer)
+    row_of_fid = {fid: row for row, fid in enumerate(statistics['fids'])}
+
+    driver = ogr.GetDriverByName('GPKG')
+    if os.path.exists(output_path):
+        driver.DeleteDataSource(output_path)
+    output = driver.CreateDataSource(output_path)
+    if output is None:
+        raise RuntimeError(f"Cannot create GeoPackage {output_path}")
+
+    out_layer = output.CreateLayer('zonal_statistics', layer.GetSpatialRef(), layer.GetGeomType())
+    source_definition = layer.GetLayerDefn()
+    for index in range(source_definition.GetFieldCount()):
+        out_layer.CreateField(source_definition.GetFieldDefn(index))
+    for name, field_type in ZONAL_FIELDS:
+        out_layer.CreateField(ogr.FieldDefn(name, field_type))
+    definition = out_layer.GetLayerDefn()
+    n_source_fields = source_definition.GetFieldCount()
+
+    written = 0
+    out_layer.StartTransaction()
+    for feature in layer:
+        out_feature = ogr.Feature(definition)
+        out_feature.SetFrom(feature)
+        row = row_of_fid.get(feature.GetFID())
+        if row is not None:
+            for offset, (name, _) in enumerate(ZONAL_FIELDS):
+                value = statistics[name][row]
+                if np.isfinite(value):
+                    out_feature.SetField(n_source_fields + offset, value.item())
+        out_layer.CreateFeature(out_feature)
+        written += 1
+    out_layer.CommitTransaction()
+    output = None
+    return written
@@ -23,32 +23,21 @@
 
 # Standard library imports
 import os.path
-import pickle
 import math
+import re
+import time
+import functools
+import importlib.util
+from contextlib import contextmanager
 
-# ML library imports with fallbacks
-try:
-    import lightgbm as lgb
-    LIGHTGBM_AVAILABLE = True
-except ImportError:
-    LIGHTGBM_AVAILABLE = False
-    
-try:
-    import xgboost as xgb
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    XGBOOST_AVAILABLE = False
-    
-try:
-    import numpy as np
-    NUMPY_AVAILABLE = True
-except ImportError:
-    NUMPY_AVAILABLE = False
+# ML libraries (numpy, lightgbm, xgboost) are NOT imported here. Importing them
+# costs hundreds of milliseconds to seconds on every QGIS start, so they are
+# imported on first use in load_model/predict_flood instead.
 
 # QGIS imports - following official documentation patterns
-from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication, Qt, QVariant
+from qgis.PyQt.QtCore import QSettings, QTranslator, QCoreApplication, Qt
 from qgis.PyQt.QtGui import QIcon
-from qgis.PyQt.QtWidgets import QAction, QFileDialog, QMessageBox, QCheckBox, QLabel, QTableWidgetItem
+from qgis.PyQt.QtWidgets import QAction, QApplication, QFileDialog, QMessageBox, QCheckBox, QLabel, QTableWidgetItem, QInputDialog
 
 from qgis.core import (
     QgsProject,
@@ -60,17 +49,14 @@ from qgis.core import (
     QgsRaster,
     QgsMessageLog,
     Qgis,
-    QgsGeometry,
-    QgsFeature,
-    QgsField,
-    QgsMarkerSymbol,
-    QgsSingleSymbolRenderer,
     QgsSymbol,
     QgsWkbTypes,
     QgsRectangle,
     QgsRasterDataProvider,
     QgsApplication,
-    QgsSettings
+    QgsSettings,
+    QgsTask,
+    QgsProviderRegistry
 )
 
 from qgis.gui import QgsMapToolEmitPoint
@@ -78,9 +64,46 @@ from qgis.utils import iface
 
 # Initialize Qt resources from file resources.py
 from .resources import *
+from .prediction_layer import PredictionLayer
 
-# Import the dialog class
-from .flood_prediction_plugin_v2_dialog import FloodPredictionPluginV2Dialog
+
+def library_available(module_name):
+    """Check whether an optional library is installed without importing it.
+
+    :param module_name: Top-level module name, e.g. 'lightgbm'.
+    :type module_name: str
+
+    :returns: True if the module can be imported.
+    :rtype: bool
+    """
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# QgsSettings key of the plugin log level (debug, info, warning, critical)
+LOG_LEVEL_KEY = 'flood_prediction_v2/log_level'
+
+
+def parse_coordinate_list(text):
+    """Numbers in a pasted coordinate list (comma, semicolon or whitespace separated)"""
+    return [float(token) for token in re.split(r'[,;\s]+', text.strip()) if token]
+
+
+def profiled_run(run_name):
+    """Decorator for dialog actions: time the whole action as '<run_name>.total'.
+
+    See FloodPredictionPluginV2.run_profile(); the action also runs under
+    cProfile when 'cProfile next run' is checked in the Profiling tab.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            with self.run_profile(run_name):
+                return method(self)
+        return wrapper
+    return decorate
 
 
 class FloodPredictionPluginV2:
@@ -124,8 +147,27 @@ class FloodPredictionPluginV2:
         self.selected_point = None
         self.model = None
         self.point_tool = None
-        self.point_layer = None  # Layer to store the selected point
+        self.prediction_layer = PredictionLayer()  # Persistent layer of selected/predicted points
+        self.selected_point_id = None  # Feature id of the selected point in prediction_layer
+        self.selected_point_predicted = False  # Whether the selected point already has a prediction
+        self.prediction_records = {}  # Feature id -> (feature names, feature values, label, model id) for export
+        self.point_queue = []  # (canvas point, feature id) of points waiting for a batch prediction
         self.expected_feature_count = None  # Expected number of features for the model
+        self.area_task = None  # Running whole-raster prediction task
+        self.model_paths = []  # Files of the loaded model(s), reloaded by worker processes
+        self.model_task = None  # Running model loading task
+        self.provider = None  # Processing provider, see initProcessing()
+        self.samplers = {}  # Layer source -> core.sampling.RasterSampler, reused across clicks
+        
+        # Stage timings of extraction and prediction, shown in the Profiling tab
+        from .core.profiling import StageTimer
+        self.stage_timer = StageTimer()
+        self.last_profile = None  # (run name, cProfile report) of the last profiled run
+        
+        # Per-sample details are debug events: formatted only when the level
+        # is enabled, otherwise kept in a ring buffer that is dumped on errors
+        from .core.log import StructuredLogger, parse_level
+        self.log = StructuredLogger(self._log_sink, parse_level(QgsSettings().value(LOG_LEVEL_KEY, 'info')))
 
     # noinspection PyMethodMayBeStatic
     def tr(self, message):
@@ -216,8 +258,15 @@ class FloodPredictionPluginV2:
 
         return action
 
+    def initProcessing(self):
+        """Register the Processing provider (also called by qgis_process, without a GUI)"""
+        from .flood_prediction_plugin_v2_provider import FloodPredictionProvider
+        self.provider = FloodPredictionProvider()
+        QgsApplication.processingRegistry().addProvider(self.provider)
+
     def initGui(self):
         """Create the menu entries and toolbar icons inside the QGIS GUI."""
+        self.initProcessing()
 
         icon_path = ':/plugins/flood_prediction_plugin_v2/icon.png'
         self.add_action(
@@ -236,6 +285,14 @@ class FloodPredictionPluginV2:
                 self.tr(u'&Flood Prediction V2'),
                 action)
             self.iface.removeToolBarIcon(action)
+        
+        # Stop worker processes of a loaded ensemble
+        self.close_model()
+        self.close_samplers()
+        
+        if self.provider is not None:
+            QgsApplication.processingRegistry().removeProvider(self.provider)
+            self.provider = None
 
     def run(self):
         """Run method that performs all the real work"""
@@ -244,15 +301,34 @@ class FloodPredictionPluginV2:
         # Only create GUI ONCE in callback, so that it will only load when the plugin is started
         if self.first_start == True:
             self.first_start = False
+            # Import the dialog class here so that building the widget tree
+            # is not part of QGIS startup
+            from .flood_prediction_plugin_v2_dialog import FloodPredictionPluginV2Dialog
             self.dlg = FloodPredictionPluginV2Dialog()
             
             # Connect dialog buttons to their functions
             self.dlg.pushButton_select_point.clicked.connect(self.select_point_on_map)
             self.dlg.pushButton_load_model.clicked.connect(self.load_model)
+            self.dlg.pushButton_load_ensemble.clicked.connect(self.load_ensemble)
             self.dlg.pushButton_refresh_layers.clicked.connect(self.refresh_layers)
             self.dlg.pushButton_extract_data.clicked.connect(self.extract_data)
             self.dlg.pushButton_predict.clicked.connect(self.predict_flood)
             self.dlg.pushButton_clear_point.clicked.connect(self.clear_point)
+            self.dlg.pushButton_predict_area.clicked.connect(self.predict_area)
+            self.dlg.pushButton_predict_scenarios.clicked.connect(self.predict_scenarios)
+            self.dlg.pushButton_sensitivity.clicked.connect(self.sensitivity_sweep)
+            self.dlg.pushButton_polygonize.clicked.connect(self.polygonize_extent)
+            self.dlg.pushButton_zonal.clicked.connect(self.zonal_statistics)
+            self.dlg.pushButton_export_predictions.clicked.connect(self.export_predictions)
+            self.dlg.pushButton_queue_coordinates.clicked.connect(self.queue_coordinates)
+            self.dlg.pushButton_predict_queue.clicked.connect(self.predict_queue)
+            self.dlg.pushButton_clear_queue.clicked.connect(self.clear_queue)
+            self.dlg.pushButton_profile_refresh.clicked.connect(self.refresh_profile_panel)
+            self.dlg.pushButton_profile_reset.clicked.connect(self.reset_profile)
+            self.dlg.pushButton_profile_export.clicked.connect(self.export_profile)
+            self.dlg.comboBox_log_level.setCurrentIndex(
+                max(self.dlg.comboBox_log_level.findData(QgsSettings().value(LOG_LEVEL_KEY, 'info')), 0))
+            self.dlg.comboBox_log_level.currentIndexChanged.connect(self.set_log_level)
             
             # Initialize UI
             self.refresh_layers()
@@ -280,7 +356,7 @@ class FloodPredictionPluginV2:
             
             # Set the tool
             self.iface.mapCanvas().setMapTool(self.point_tool)
-            self.dlg.label_status.setText("Click on the map to select a point...")
+            self.dlg.label_status.setText("Click on the map to select a point (shift-click to queue several)...")
             
         except Exception as e:
             QgsMessageLog.logMessage(f"Error activating point tool: {str(e)}", "Flood Prediction V2", Qgis.Critical)
@@ -289,6 +365,12 @@ class FloodPredictionPluginV2:
     def point_selected(self, point, button):
         """Handle point selection - create visible point on map"""
         try:
+            if QApplication.keyboardModifiers() & Qt.ShiftModifier:
+                # Shift-click queues the point; the tool stays active for more clicks
+                self.queue_points([QgsPointXY(point)])
+                self.dlg.label_status.setText(f"Point queued at {point.x():.6f}, {point.y():.6f} - shift-click more points or press Predict Queue")
+                return
+            
             self.selected_point = point
             QgsMessageLog.logMessage(f"Point selected: {point.x()}, {point.y()}", "Flood Prediction V2", Qgis.Info)
             
@@ -308,48 +390,26 @@ class FloodPredictionPluginV2:
             QMessageBox.critical(self.dlg, "Error", f"Failed to handle point selection: {str(e)}")
 
     def create_point_on_map(self, point):
-        """Create a visible point marker on the map - following V1 pattern"""
+        """Add the selected point to the persistent prediction layer.
+
+        Every predicted point is kept; a selection that was not predicted yet
+        is moved instead of leaving an orphan marker behind.
+        """
         try:
-            # Remove existing point layer if it exists
-            if self.point_layer:
-                QgsProject.instance().removeMapLayer(self.point_layer)
-            
-            # Get current map canvas CRS (like V1)
-            crs = self.iface.mapCanvas().mapSettings().destinationCrs().authid()
-            self.point_layer = QgsVectorLayer(f'Point?crs={crs}', 'Selected Point', 'memory')
-            
-            # Add attributes like V1
-            provider = self.point_layer.dataProvider()
-            provider.addAttributes([
-                QgsField('x_coord', QVariant.Double),
-                QgsField('y_coord', QVariant.Double),
-                QgsField('prediction', QVariant.String),
-                QgsField('probability', QVariant.Double)
-            ])
-            self.point_layer.updateFields()
-            
-            # Create point feature
-            feature = QgsFeature()
-            feature.setGeometry(QgsGeometry.fromPointXY(point))
-            feature.setAttributes([point.x(), point.y(), 'Not predicted', 0.0])
-            
-            # Add feature to layer
-            provider.addFeature(feature)
-            
-            # Style the point like V1 (red circle with black outline)
-            symbol = QgsMarkerSymbol.createSimple({
-                'name': 'circle',
-                'color': 'red',
-                'size': '6',
-                'outline_color': 'black',
-                'outline_width': '1'
-            })
-            
-            renderer = QgsSingleSymbolRenderer(symbol)
-            self.point_layer.setRenderer(renderer)
-            
-            # Add layer to project
-            QgsProject.instance().addMapLayer(self.point_layer)
+            crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+            
+            # A removed layer is recreated with new feature ids
+            if not self.prediction_layer.is_alive():
+                self.prediction_records.clear()
+                self.selected_point_id = None
+            
+            if (self.selected_point_id is not None and not self.selected_point_predicted
+                    and self.prediction_layer.move_point(self.selected_point_id, point, crs)):
+                QgsMessageLog.logMessage("Point marker moved on map", "Flood Prediction V2", Qgis.Info)
+                return
+            
+            self.selected_point_id = self.prediction_layer.add_points([point], crs)[0]
+            self.selected_point_predicted = False
             
             QgsMessageLog.logMessage("Point marker created on map", "Flood Prediction V2", Qgis.Info)
             
@@ -366,10 +426,11 @@ class FloodPredictionPluginV2:
             self.dlg.lineEdit_x_coord.clear()
             self.dlg.lineEdit_y_coord.clear()
             
-            # Remove point layer from map
-            if self.point_layer:
-                QgsProject.instance().removeMapLayer(self.point_layer)
-                self.point_layer = None
+            # Remove the selection marker; predicted points stay on the layer
+            if self.selected_point_id is not None and not self.selected_point_predicted:
+                self.prediction_layer.delete_points([self.selected_point_id])
+            self.selected_point_id = None
+            self.selected_point_predicted = False
             
             # Update status
             self.dlg.label_status.setText("Point cleared - select a new point")
@@ -382,136 +443,562 @@ class FloodPredictionPluginV2:
         except Exception as e:
             QgsMessageLog.logMessage(f"Error clearing point: {str(e)}", "Flood Prediction V2", Qgis.Critical)
 
+    def queue_points(self, points):
+        """Add points (canvas CRS) to the point queue and show them on the prediction layer"""
+        crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+        
+        # A removed layer is recreated with new feature ids
+        if not self.prediction_layer.is_alive():
+            self.prediction_records.clear()
+            self.point_queue.clear()
+            self.selected_point_id = None
+        
+        feature_ids = self.prediction_layer.add_points(points, crs)
+        self.point_queue.extend(zip(points, feature_ids))
+        self.dlg.label_queue.setText(f"Queued points: {len(self.point_queue)}")
+        QgsMessageLog.logMessage(f"Queued {len(points)} point(s), {len(self.point_queue)} waiting", "Flood Prediction V2", Qgis.Info)
+
+    def queue_coordinates(self):
+        """Queue the coordinates typed or pasted into the X/Y fields"""
+        try:
+            x_values = parse_coordinate_list(self.dlg.lineEdit_x_coord.text())
+            y_values = parse_coordinate_list(self.dlg.lineEdit_y_coord.text())
+        except ValueError as e:
+            QMessageBox.warning(self.dlg, "Warning", f"Invalid coordinate: {str(e)}")
+            return
+        
+        try:
+            if not x_values or len(x_values) != len(y_values):
+                QMessageBox.warning(self.dlg, "Warning", "Enter the same number of X and Y coordinates (map CRS)")
+                return
+            
+            self.queue_points([QgsPointXY(x, y) for x, y in zip(x_values, y_values)])
+            self.dlg.label_status.setText(f"Queued {len(x_values)} point(s) from coordinates")
+            
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error queueing coordinates: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Error", f"Failed to queue coordinates: {str(e)}")
+
+    def clear_queue(self):
+        """Empty the point queue and remove its markers that were not predicted"""
+        try:
+            if self.prediction_layer.is_alive():
+                waiting = [feature_id for _, feature_id in self.point_queue if feature_id not in self.prediction_records]
+                self.prediction_layer.delete_points(waiting)
+            self.point_queue.clear()
+            self.dlg.label_queue.setText("Queued points: 0")
+            self.dlg.tableWidget_points.setRowCount(0)
+            self.dlg.label_status.setText("Point queue cleared")
+            
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error clearing queue: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+
+    def sampling_settings(self):
+        """Sampling method and mean radius (layer CRS units) chosen in the dialog"""
+        return self.dlg.comboBox_sampling.currentData(), self.dlg.doubleSpinBox_sampling_radius.value()
+
+    def layer_sampler(self, layer):
+        """Cached RasterSampler for a GDAL layer; keeps recently read regions between calls"""
+        from .core.sampling import RasterSampler
+        
+        sampler = self.samplers.get(layer.source())
+        if sampler is None:
+            sampler = RasterSampler(layer.source())
+            self.samplers[layer.source()] = sampler
+        return sampler
+
+    def close_samplers(self):
+        """Drop the cached samplers so changed rasters are read again"""
+        for sampler in self.samplers.values():
+            sampler.close()
+        self.samplers.clear()
+
+    def sample_layer_points(self, layer, points, points_crs):
+        """Band 1 values of a raster layer at many points (NaN where there is no data).
+
+        GDAL layers are read with core.sampling using the dialog's sampling
+        method, one read per region of points; other providers fall back to
+        nearest-pixel provider.sample per point.
+        """
+        import numpy as np
+        
+        if points_crs != layer.crs():
+            with self.stage_timer.span('sample.transform'):
+                transform = QgsCoordinateTransform(points_crs, layer.crs(), QgsProject.instance())
+                points = [transform.transform(point) for point in points]
+        
+        method, radius = self.sampling_settings()
+        if layer.providerType() == 'gdal':
+            with self.stage_timer.span('sample.read'):
+                return self.layer_sampler(layer).sample([point.x() for point in points], [point.y() for point in points],
+                                                        method, radius)
+        
+        if method != 'nearest':
+            self.log.warning("%s is not a GDAL layer, sampling the nearest pixel instead of %s", layer.name(), method)
+        provider = layer.dataProvider()
+        values = np.full(len(points), np.nan)
+        with self.stage_timer.span('sample.read'):
+            for index, point in enumerate(points):
+                value, success = provider.sample(point, 1)
+                if success:
+                    values[index] = value
+        return values
+
+    def table_feature_names(self):
+        """Layer name -> feature name as edited in the data table"""
+        names = {}
+        for row in range(self.dlg.tableWidget_data.rowCount()):
+            layer_item = self.dlg.tableWidget_data.item(row, 0)
+            feature_name_item = self.dlg.tableWidget_data.item(row, 2)
+            if layer_item and feature_name_item:
+                names[layer_item.text()] = feature_name_item.text()
+        return names
+
+    @profiled_run('queue')
+    def predict_queue(self):
+        """Extract and predict all queued points at once, one table row per point"""
+        try:
+            if not self.model:
+                QMessageBox.warning(self.dlg, "Warning", "Please load a model first")
+                return
+            
+            if not self.prediction_layer.is_alive():
+                self.point_queue.clear()
+                self.dlg.label_queue.setText("Queued points: 0")
+            if not self.point_queue:
+                QMessageBox.warning(self.dlg, "Warning", "The point queue is empty - shift-click on the map or add coordinates")
+                return
+            
+            layers = [self.get_layer_by_name(name) for name in self.get_selected_layer_names()]
+            layers = [layer for layer in layers if layer is not None]
+            if not layers:
+                QMessageBox.warning(self.dlg, "Warning", "Please select at least one layer")
+                return
+            
+            if self.expected_feature_count and len(layers) != self.expected_feature_count:
+                QMessageBox.warning(self.dlg, "Feature Count Mismatch",
+                                    f"The model expects {self.expected_feature_count} features but {len(layers)} layers are selected")
+                return
+            
+            import numpy as np
+            from .core.ensemble import predict_points
+            
+            canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+            points = [point for point, _ in self.point_queue]
+            run = self.log.run('queue', points=len(points), layers=len(layers))
+            from .core.features import suggest_feature_name
+            edited_names = self.table_feature_names()
+            feature_names = [edited_names.get(layer.name(), suggest_feature_name(layer.name())) for layer in layers]
+            
+            # (n_points, n_features): one column per layer, then in model feature order
+            from .core.features import assemble_features
+            values = np.column_stack([self.sample_layer_points(layer, points, canvas_crs) for layer in layers])
+            feature_names, values = assemble_features(feature_names, values, self.model)
+            
+            # One model call for every point with complete data
+            threshold = self.dlg.doubleSpinBox_threshold.value()
+            with self.stage_timer.span('queue.model'):
+                probabilities, labels, valid = predict_points(self.model, values, threshold)
+            
+            model_id = self.current_model_id()
+            results = {}
+            remaining = []
+            with self.stage_timer.span('queue.layer'):
+                for (point, feature_id), row_values, probability, label, ok in zip(self.point_queue, values, probabilities, labels, valid):
+                    if not ok:
+                        remaining.append((point, feature_id))
+                        continue
+                    prediction_text = "Flood Risk" if label == 1 else "No Flood Risk"
+                    results[feature_id] = (prediction_text, float(probability))
+                    self.prediction_records[feature_id] = (tuple(feature_names), row_values.tolist(), int(label), model_id)
+                self.prediction_layer.set_predictions(results)
+            
+            with self.stage_timer.span('queue.table'):
+                self._fill_points_table(points, feature_names, values, probabilities, labels, valid)
+            self.point_queue = remaining
+            self.dlg.label_queue.setText(f"Queued points: {len(self.point_queue)}")
+            
+            status_text = (f"Predicted {int(valid.sum())} of {len(points)} queued points in one model call, "
+                           f"{int(labels[valid].sum())} at flood risk")
+            if remaining:
+                status_text += f" - {len(remaining)} without data on every layer stay queued"
+            self.dlg.label_status.setText(status_text)
+            run.set(predicted=int(valid.sum()), flood=int(labels[valid].sum()), no_data=len(remaining))
+            run.finish()
+            
+        except Exception as e:
+            self.log.critical("Error predicting queued points: %s", e)
+            self.log.dump_recent()
+            QMessageBox.critical(self.dlg, "Error", f"Failed to predict queued points: {str(e)}")
+
+    def _fill_points_table(self, points, feature_names, values, probabilities, labels, valid):
+        """One row per queued point: coordinates, features and result"""
+        table = self.dlg.tableWidget_points
+        headers = ["X", "Y"] + list(feature_names) + ["Prediction", "Probability"]
+        table.setRowCount(0)
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setRowCount(len(points))
+        
+        for row, point in enumerate(points):
+            cells = [f"{point.x():.6f}", f"{point.y():.6f}"]
+            cells += ["" if math.isnan(value) else f"{value:.6f}" for value in values[row]]
+            if valid[row]:
+                cells += ["Flood Risk" if labels[row] == 1 else "No Flood Risk", f"{probabilities[row]:.4f}"]
+            else:
+                cells += ["No data", ""]
+            for column, text in enumerate(cells):
+                table.setItem(row, column, QTableWidgetItem(text))
+
+    def _log_sink(self, level, message):
+        """core.log sink: write to the plugin's QgsMessageLog tab"""
+        from .core.log import DEBUG, WARNING, CRITICAL
+        
+        if level >= CRITICAL:
+            qgis_level = Qgis.Critical
+        elif level >= WARNING:
+            qgis_level = Qgis.Warning
+        else:
+            qgis_level = Qgis.Info
+        if level <= DEBUG:
+            message = f"[debug] {message}"
+        QgsMessageLog.logMessage(message, "Flood Prediction V2", qgis_level)
+
+    def set_log_level(self):
+        """Apply and remember the log level chosen in the Profiling tab"""
+        from .core.log import parse_level
+        
+        name = self.dlg.comboBox_log_level.currentData()
+        QgsSettings().setValue(LOG_LEVEL_KEY, name)
+        self.log.level = parse_level(name)
+
+    @contextmanager
+    def run_profile(self, run_name):
+        """Time a dialog action as '<run_name>.total', under cProfile if requested.
+
+        The 'cProfile next run' check box applies to one run only and is
+        cleared once the report is shown.
+        """
+        from .core.profiling import ProfileCapture
+        
+        capture = ProfileCapture(self.dlg.checkBox_cprofile.isChecked())
+        try:
+            with capture, self.stage_timer.span(f"{run_name}.total"):
+                yield
+        finally:
+            if capture.enabled:
+                self.dlg.checkBox_cprofile.setChecked(False)
+                self.show_profile_report(run_name, capture.report())
+            self.refresh_profile_panel()
+
+    def show_profile_report(self, run_name, report):
+        """Show a cProfile report in the Profiling tab and keep it for export"""
+        self.last_profile = (run_name, report)
+        self.dlg.textEdit_profile.setPlainText(f"cProfile of '{run_name}' run\n{report}")
+
+    def refresh_profile_panel(self):
+        """Fill the Profiling tab with the current stage statistics"""
+        from .core.profiling import HISTOGRAM_EDGES
+        
+        bars = " ▁▂▃▄▅▆▇█"
+        table = self.dlg.tableWidget_profile
+        stages = self.stage_timer.summary()
+        table.setRowCount(len(stages))
+        for row, (stage, stats) in enumerate(stages.items()):
+            peak = max(stats['histogram']) or 1
+            histogram = "".join(bars[math.ceil(count * (len(bars) - 1) / peak)] for count in stats['histogram'])
+            cells = [stage, str(stats['count'])] + [
+                "" if stats[key] is None else f"{stats[key]:.3f}"
+                for key in ('total_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms')] + [histogram]
+            for column, text in enumerate(cells):
+                table.setItem(row, column, QTableWidgetItem(text))
+            
+            # Bucket ranges and counts in the tooltip of the histogram cell
+            edges = ("0",) + tuple(f"{edge * 1000:.3g} ms" for edge in HISTOGRAM_EDGES) + ("inf",)
+            table.item(row, len(cells) - 1).setToolTip("\n".join(
+                f"{low} - {high}: {count}"
+                for low, high, count in zip(edges[:-1], edges[1:], stats['histogram']) if count))
+
+    def reset_profile(self):
+        """Clear the stage statistics and the last cProfile report"""
+        self.stage_timer.reset()
+        self.last_profile = None
+        self.dlg.textEdit_profile.clear()
+        self.refresh_profile_panel()
+
+    def export_profile(self):
+        """Save the stage statistics (and the last cProfile report) as JSON"""
+        try:
+            path, _ = QFileDialog.getSaveFileName(self.dlg, "Export Stage Timings", "", "JSON (*.json)")
+            if not path:
+                return
+            if not path.lower().endswith('.json'):
+                path += '.json'
+            
+            extra = None
+            if self.last_profile is not None:
+                extra = {'cprofile': {'run': self.last_profile[0], 'report': self.last_profile[1]}}
+            self.stage_timer.write_json(path, extra)
+            self.dlg.label_status.setText(f"Stage timings saved to {path}")
+            
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error exporting stage timings: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Error", f"Failed to export stage timings: {str(e)}")
+
     def load_model(self):
-        """Load ML model with comprehensive UI updates"""
+        """Choose a model file and load it in a background task"""
         try:
+            if self.model_task is not None:
+                QMessageBox.warning(self.dlg, "Warning", "A model is already being loaded")
+                return
+            
             # Open file dialog
             model_path, _ = QFileDialog.getOpenFileName(
                 self.dlg,
                 "Select Trained Flood Model",
                 "",
-                "Pickle Files (*.pkl);;All Files (*)"
+                "Model Files (*.pkl *.joblib);;Pickle Files (*.pkl);;Joblib Files (*.joblib);;All Files (*)"
             )
             
             if model_path:
                 QgsMessageLog.logMessage(f"Loading model from: {model_path}", "Flood Prediction V2", Qgis.Info)
                 
-                # Load the model using standard pickle
-                with open(model_path, 'rb') as f:
-                    self.model = pickle.load(f)
+                # Unpickling large models takes seconds; keep QGIS responsive meanwhile
+                self.model_task = QgsTask.fromFunction(
+                    f"Load flood model {os.path.basename(model_path)}",
+                    self._run_load_model,
+                    model_path,
+                    on_finished=self._load_model_finished
+                )
+                self._set_model_loading(True)
+                QgsApplication.taskManager().addTask(self.model_task)
+                self.dlg.label_status.setText(f"Loading model {os.path.basename(model_path)}...")
                 
-                # Validate loaded model immediately
-                if self.model is None:
-                    raise ValueError("Model loaded as None - the file may be corrupted")
-                
-                # Check if model has required methods
-                if not hasattr(self.model, 'predict'):
-                    raise AttributeError(f"Loaded model (type: {type(self.model).__name__}) does not have a predict method")
-                
-                if not callable(self.model.predict):
-                    raise TypeError(f"Model predict attribute is not callable (type: {type(self.model.predict)})")
+        except Exception as e:
+            self._set_model_loading(False)
+            QgsMessageLog.logMessage(f"Error starting model loading: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Model Loading Error", f"Failed to load model:\n\n{str(e)}")
+
+    def _set_model_loading(self, loading):
+        """Disable the model buttons while a model task runs"""
+        self.dlg.pushButton_load_model.setEnabled(not loading)
+        self.dlg.pushButton_load_ensemble.setEnabled(not loading)
+        if not loading:
+            self.model_task = None
+
+    def _run_load_model(self, task, model_path):
+        """Model loading task body - runs in a worker thread, must not touch widgets"""
+        from .core.models import is_joblib_file, load_model_file
+        
+        start = time.perf_counter()
+        model = load_model_file(model_path)
+        seconds = time.perf_counter() - start
+        
+        # Test model functionality with a simple prediction
+        try:
+            # Expected number of features, 10 if the model does not say
+            from .core.features import model_feature_count
+            test_features = model_feature_count(model) or 10
+            
+            # Create test data
+            if library_available('numpy'):
+                import numpy as np
+                test_data = np.zeros((1, test_features))
+                model.predict(test_data)
+                QgsMessageLog.logMessage(f"Model test prediction successful with {test_features} features", "Flood Prediction V2", Qgis.Info)
+            else:
+                QgsMessageLog.logMessage("Skipping model test - NumPy not available", "Flood Prediction V2", Qgis.Warning)
                 
-                # Test model functionality with a simple prediction
-                try:
-                    # Try to determine the expected number of features
-                    test_features = 10  # Default test size
-                    if hasattr(self.model, 'n_features_in_'):
-                        test_features = self.model.n_features_in_
-                    elif hasattr(self.model, 'n_features_'):
-                        test_features = self.model.n_features_
-                    
-                    # Create test data
-                    if NUMPY_AVAILABLE:
-                        test_data = np.zeros((1, test_features))
-                        test_prediction = self.model.predict(test_data)
-                        QgsMessageLog.logMessage(f"Model test prediction successful with {test_features} features", "Flood Prediction V2", Qgis.Info)
-                    else:
-                        QgsMessageLog.logMessage("Skipping model test - NumPy not available", "Flood Prediction V2", Qgis.Warning)
-                        
-                except Exception as test_error:
-                    QgsMessageLog.logMessage(f"Model test prediction failed: {str(test_error)}", "Flood Prediction V2", Qgis.Warning)
-                    # Don't fail loading for test issues, just warn
+        except Exception as test_error:
+            QgsMessageLog.logMessage(f"Model test prediction failed: {str(test_error)}", "Flood Prediction V2", Qgis.Warning)
+            # Don't fail loading for test issues, just warn
+        
+        return {'model': model, 'model_path': model_path, 'seconds': seconds, 'joblib': is_joblib_file(model_path)}
+
+    def _load_model_finished(self, exception, result=None):
+        """Install the loaded model and show its details"""
+        self._set_model_loading(False)
+        try:
+            if exception is not None:
+                raise exception
+            if not result:
+                self.dlg.label_status.setText("Model loading canceled")
+                return
+            
+            model_path = result['model_path']
+            self.close_model()
+            self.model = result['model']
+            self.model_paths = [model_path]
+            
+            # Log successful validation
+            QgsMessageLog.logMessage(f"Model validation passed: {type(self.model).__name__}", "Flood Prediction V2", Qgis.Info)
+            
+            # Update UI
+            model_name = os.path.basename(model_path)
+            self.dlg.lineEdit_model_path.setText(model_path)
+            
+            # Try to get model information
+            try:
+                model_type = type(self.model).__name__
+                self.dlg.label_model_info.setText(f"Model type: {model_type}")
                 
-                # Log successful validation
-                QgsMessageLog.logMessage(f"Model validation passed: {type(self.model).__name__}", "Flood Prediction V2", Qgis.Info)
+                # Check model dependencies after loading
+                self._check_model_dependencies(model_type)
                 
-                # Update UI
-                model_name = os.path.basename(model_path)
-                self.dlg.lineEdit_model_path.setText(model_path)
+                # Feature names stored by scikit-learn, CatBoost or LightGBM models
+                from .core.features import model_feature_count, model_feature_names
+                features = model_feature_names(self.model)
+                feature_count = model_feature_count(self.model) or 0
                 
-                # Try to get model information
-                try:
-                    model_type = type(self.model).__name__
-                    self.dlg.label_model_info.setText(f"Model type: {model_type}")
-                    
-                    # Check model dependencies after loading
-                    self._check_model_dependencies(model_type)
-                    
-                    # Try multiple ways to get feature information
-                    feature_info = ""
-                    feature_count = 0
-                    
-                    if hasattr(self.model, 'feature_names_in_'):
-                        features = list(self.model.feature_names_in_)
-                        feature_count = len(features)
-                        
-                        # Check if features are generic (Column_0, Column_1, etc.)
-                        if all(f.startswith('Column_') for f in features):
-                            feature_info = f"Expected features: {feature_count} features (generic names: {', '.join(features[:3])}{'...' if len(features) > 3 else ''})"
-                            feature_info += f"\n⚠️ Model trained with generic column names - ensure feature order matches training data"
-                        else:
-                            feature_info = f"Expected features: {', '.join(features)}"
-                            
-                    elif hasattr(self.model, 'feature_names_'):
-                        features = list(self.model.feature_names_)
-                        feature_count = len(features)
-                        feature_info = f"Expected features: {', '.join(features)}"
-                        
-                    elif hasattr(self.model, 'booster_') and hasattr(self.model.booster_, 'feature_names'):
-                        # For LightGBM models
-                        features = list(self.model.booster_.feature_names)
-                        feature_count = len(features)
-                        feature_info = f"Expected features: {', '.join(features)}"
-                        
-                    elif hasattr(self.model, 'n_features_in_'):
-                        feature_count = self.model.n_features_in_
-                        feature_info = f"Expected features: {feature_count} features (names unknown)"
-                        
-                    elif hasattr(self.model, 'n_features_'):
-                        feature_count = self.model.n_features_
-                        feature_info = f"Expected features: {feature_count} features (names unknown)"
-                        
+                if features:
+                    # Check if features are generic (Column_0, Column_1, etc.)
+                    if all(f.startswith('Column_') for f in features):
+                        feature_info = f"Expected features: {feature_count} features (generic names: {', '.join(features[:3])}{'...' if len(features) > 3 else ''})"
+                        feature_info += f"\n⚠️ Model trained with generic column names - ensure feature order matches training data"
                     else:
-                        feature_info = "Expected features: Cannot determine"
-                    
-                    self.dlg.label_model_features.setText(feature_info)
-                    
-                    # Store feature count for validation
-                    self.expected_feature_count = feature_count if feature_count > 0 else None
-                    
-                except Exception:
-                    self.dlg.label_model_features.setText("Expected features: Cannot determine")
-                    self.dlg.label_model_info.setText("Model info: Basic model loaded")
+                        feature_info = f"Expected features: {', '.join(features)}"
+                elif feature_count:
+                    feature_info = f"Expected features: {feature_count} features (names unknown)"
+                else:
+                    feature_info = "Expected features: Cannot determine"
                 
-                self.dlg.label_status.setText(f"Model loaded: {model_name}")
-                QgsMessageLog.logMessage("Model loaded successfully", "Flood Prediction V2", Qgis.Info)
+                self.dlg.label_model_features.setText(feature_info)
                 
-        except Exception as e:
-            error_msg = str(e)
+                # Store feature count for validation
+                self.expected_feature_count = feature_count if feature_count > 0 else None
+                
+            except Exception:
+                self.dlg.label_model_features.setText("Expected features: Cannot determine")
+                self.dlg.label_model_info.setText("Model info: Basic model loaded")
+            
+            load_text = f"Model file read in {result['seconds']:.2f}s"
+            if result['joblib']:
+                load_text += " (joblib; uncompressed arrays memory-mapped)"
+            QgsMessageLog.logMessage(load_text, "Flood Prediction V2", Qgis.Info)
             
-            # Provide specific error messages for common dependency issues
-            if "No module named 'lightgbm'" in error_msg:
-                error_msg = "LightGBM library required but not installed.\n\nPlease install using:\npip install lightgbm\n\nOr in QGIS Python Console:\n!pip install lightgbm"
-            elif "No module named 'xgboost'" in error_msg:
-                error_msg = "XGBoost library required but not installed.\n\nPlease install using:\npip install xgboost\n\nOr in QGIS Python Console:\n!pip install xgboost"
-            elif "No module named 'sklearn'" in error_msg:
-                error_msg = "Scikit-learn library required but not installed.\n\nPlease install using:\npip install scikit-learn\n\nOr in QGIS Python Console:\n!pip install scikit-learn"
-            elif "No module named 'numpy'" in error_msg:
-                error_msg = "NumPy library required but not installed.\n\nPlease install using:\npip install numpy\n\nOr in QGIS Python Console:\n!pip install numpy"
+            self.dlg.label_status.setText(f"Model loaded: {model_name}")
+            QgsMessageLog.logMessage("Model loaded successfully", "Flood Prediction V2", Qgis.Info)
             
+        except Exception as e:
+            error_msg = self._dependency_error_message(str(e))
             QgsMessageLog.logMessage(f"Error loading model: {error_msg}", "Flood Prediction V2", Qgis.Critical)
             QMessageBox.critical(self.dlg, "Model Loading Error", f"Failed to load model:\n\n{error_msg}")
 
+    def _dependency_error_message(self, error_msg):
+        """Provide specific error messages for common dependency issues"""
+        if "No module named 'lightgbm'" in error_msg:
+            error_msg = "LightGBM library required but not installed.\n\nPlease install using:\npip install lightgbm\n\nOr in QGIS Python Console:\n!pip install lightgbm"
+        elif "No module named 'xgboost'" in error_msg:
+            error_msg = "XGBoost library required but not installed.\n\nPlease install using:\npip install xgboost\n\nOr in QGIS Python Console:\n!pip install xgboost"
+        elif "No module named 'sklearn'" in error_msg:
+            error_msg = "Scikit-learn library required but not installed.\n\nPlease install using:\npip install scikit-learn\n\nOr in QGIS Python Console:\n!pip install scikit-learn"
+        elif "No module named 'joblib'" in error_msg:
+            error_msg = "Joblib library required to load joblib model files but not installed.\n\nPlease install using:\npip install joblib\n\nOr in QGIS Python Console:\n!pip install joblib"
+        elif "No module named 'numpy'" in error_msg:
+            error_msg = "NumPy library required but not installed.\n\nPlease install using:\npip install numpy\n\nOr in QGIS Python Console:\n!pip install numpy"
+        return error_msg
+
+    def load_ensemble(self):
+        """Load several models that are evaluated together on the same features"""
+        try:
+            if self.model_task is not None:
+                QMessageBox.warning(self.dlg, "Warning", "A model is already being loaded")
+                return
+            
+            model_paths, _ = QFileDialog.getOpenFileNames(
+                self.dlg,
+                "Select Trained Flood Models for the Ensemble",
+                "",
+                "Model Files (*.pkl *.joblib);;Pickle Files (*.pkl);;Joblib Files (*.joblib);;All Files (*)"
+            )
+            
+            if not model_paths:
+                return
+            
+            QgsMessageLog.logMessage(f"Loading ensemble of {len(model_paths)} models", "Flood Prediction V2", Qgis.Info)
+            
+            # Worker spin box: 1 = evaluate in QGIS, 0 = one process per core
+            workers = self.dlg.spinBox_workers.value()
+            self.model_task = QgsTask.fromFunction(
+                f"Load ensemble of {len(model_paths)} flood models",
+                self._run_load_ensemble,
+                list(model_paths), None if workers == 1 else workers,
+                on_finished=self._load_ensemble_finished
+            )
+            self._set_model_loading(True)
+            QgsApplication.taskManager().addTask(self.model_task)
+            self.dlg.label_status.setText(f"Loading ensemble of {len(model_paths)} models...")
+            
+        except Exception as e:
+            self._set_model_loading(False)
+            QgsMessageLog.logMessage(f"Error starting ensemble loading: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Model Loading Error", f"Failed to load ensemble:\n\n{str(e)}")
+
+    def _run_load_ensemble(self, task, model_paths, workers):
+        """Ensemble loading task body - runs in a worker thread, must not touch widgets"""
+        from .core.ensemble import ModelEnsemble
+        
+        ensemble = ModelEnsemble.from_files(model_paths, workers=workers)
+        
+        # All members must take the same feature vector
+        from .core.features import model_feature_count
+        feature_counts = {model_feature_count(model) for model in ensemble.models} - {None}
+        if len(feature_counts) > 1:
+            ensemble.close()
+            raise ValueError(f"Ensemble models expect different feature counts: {sorted(feature_counts)}")
+        
+        return {'ensemble': ensemble, 'model_paths': model_paths,
+                'feature_count': feature_counts.pop() if feature_counts else None}
+
+    def _load_ensemble_finished(self, exception, result=None):
+        """Install the loaded ensemble and show its members"""
+        self._set_model_loading(False)
+        try:
+            if exception is not None:
+                raise exception
+            if not result:
+                self.dlg.label_status.setText("Ensemble loading canceled")
+                return
+            
+            ensemble = result['ensemble']
+            model_paths = result['model_paths']
+            self.close_model()
+            self.model = ensemble
+            self.model_paths = list(model_paths)
+            self.expected_feature_count = result['feature_count']
+            
+            # Update UI
+            self.dlg.lineEdit_model_path.setText("; ".join(model_paths))
+            model_types = ", ".join(f"{model_id} ({type(model).__name__})" for model_id, model in zip(ensemble.model_ids, ensemble.models))
+            self.dlg.label_model_info.setText(f"Ensemble of {len(ensemble)} models: {model_types}")
+            if self.expected_feature_count:
+                self.dlg.label_model_features.setText(f"Expected features: {self.expected_feature_count} features (same order for all models)")
+            else:
+                self.dlg.label_model_features.setText("Expected features: Cannot determine")
+            
+            for model in ensemble.models:
+                self._check_model_dependencies(type(model).__name__)
+            
+            self.dlg.label_status.setText(f"Ensemble loaded: {len(ensemble)} models")
+            QgsMessageLog.logMessage("Ensemble loaded successfully", "Flood Prediction V2", Qgis.Info)
+            
+        except Exception as e:
+            error_msg = self._dependency_error_message(str(e))
+            QgsMessageLog.logMessage(f"Error loading ensemble: {error_msg}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Model Loading Error", f"Failed to load ensemble:\n\n{error_msg}")
+
+    def close_model(self):
+        """Release the current model (shuts down ensemble worker processes)"""
+        if self.model is not None and hasattr(self.model, 'close'):
+            self.model.close()
+        self.model = None
+        self.model_paths = []
+
+    def current_model_id(self):
+        """Identifier of the loaded model(s) stored with exported predictions"""
+        from .core.models import model_id_from_path
+        return '+'.join(model_id_from_path(path) for path in self.model_paths) or type(self.model).__name__
+
     def _check_model_dependencies(self, model_type):
         """Check if required dependencies are available for the model type"""
         missing_deps = []
@@ -519,18 +1006,18 @@ class FloodPredictionPluginV2:
         
         # Check for LightGBM models
         if 'LGB' in model_type.upper() or 'LIGHTGBM' in model_type.upper():
-            if not LIGHTGBM_AVAILABLE:
+            if not library_available('lightgbm'):
                 missing_deps.append("lightgbm")
                 warnings.append("LightGBM models require the lightgbm library")
         
         # Check for XGBoost models  
         if 'XGB' in model_type.upper() or 'XGBOOST' in model_type.upper():
-            if not XGBOOST_AVAILABLE:
+            if not library_available('xgboost'):
                 missing_deps.append("xgboost")
                 warnings.append("XGBoost models require the xgboost library")
         
         # Check for NumPy (required by most models)
-        if not NUMPY_AVAILABLE:
+        if not library_available('numpy'):
             missing_deps.append("numpy")
             warnings.append("Most ML models require NumPy for predictions")
         
@@ -588,6 +1075,7 @@ class FloodPredictionPluginV2:
         """Refresh the list of available layers with checkboxes"""
         try:
             QgsMessageLog.logMessage("Refreshing layer list", "Flood Prediction V2", Qgis.Info)
+            self.close_samplers()
             
             # Clear existing checkboxes
             for checkbox in self.dlg.layer_checkboxes.values():
@@ -630,6 +1118,7 @@ class FloodPredictionPluginV2:
             QgsMessageLog.logMessage(f"Error refreshing layers: {str(e)}", "Flood Prediction V2", Qgis.Critical)
             QMessageBox.critical(self.dlg, "Error", f"Failed to refresh layers: {str(e)}")
 
+    @profiled_run('extract')
     def extract_data(self):
         """Extract raster data from selected layers with editable feature names"""
         try:
@@ -637,18 +1126,17 @@ class FloodPredictionPluginV2:
                 QMessageBox.warning(self.dlg, "Warning", "Please select a point first")
                 return
             
-            QgsMessageLog.logMessage("Starting data extraction", "Flood Prediction V2", Qgis.Info)
-            
             # Get selected layers from checkboxes
-            selected_layers = []
-            for layer_name, checkbox in self.dlg.layer_checkboxes.items():
-                if layer_name != '__no_layers__' and isinstance(checkbox, QCheckBox) and checkbox.isChecked():
-                    selected_layers.append(layer_name)
+            selected_layers = self.get_selected_layer_names()
             
             if not selected_layers:
                 QMessageBox.warning(self.dlg, "Warning", "Please select at least one layer")
                 return
             
+            # One summary line per extraction, per-layer details are debug events
+            from .core.log import INFO, WARNING
+            run = self.log.run('extract', layers=len(selected_layers), method=self.sampling_settings()[0])
+            
             # Clear previous data
             self.dlg.tableWidget_data.setRowCount(0)
             
@@ -656,63 +1144,85 @@ class FloodPredictionPluginV2:
             successful_extractions = 0
             row = 0
             
+            from .core.features import suggest_feature_name
+            canvas_crs = self.iface.mapCanvas().mapSettings().destinationCrs()
+            
             # Extract data from each selected layer
             for layer_name in selected_layers:
                 layer = self.get_layer_by_name(layer_name)
                 
                 if not layer:
-                    QgsMessageLog.logMessage(f"Layer not found: {layer_name}", "Flood Prediction V2", Qgis.Warning)
+                    self.log.warning("Layer not found: %s", layer_name)
+                    run.count('missing', note=layer_name)
                     continue
                 
-                QgsMessageLog.logMessage(f"Processing layer: {layer_name}", "Flood Prediction V2", Qgis.Info)
+                self.log.debug("Processing layer", layer=layer_name, provider=layer.providerType())
                 
-                # Extract value using official documentation pattern
-                value = self.extract_raster_value_official(layer, self.selected_point)
+                if layer.providerType() == 'gdal':
+                    # Same sampler as the batch queue, with the chosen interpolation
+                    value = float(self.sample_layer_points(layer, [self.selected_point], canvas_crs)[0])
+                    value = None if math.isnan(value) else value
+                else:
+                    # Extract value using official documentation pattern
+                    value = self.extract_raster_value_official(layer, self.selected_point)
                 
                 if value is not None:
                     successful_extractions += 1
                     
                     # Create feature name suggestion
-                    feature_name = self.suggest_feature_name(layer_name)
+                    feature_name = suggest_feature_name(layer_name)
                     original_attr = layer_name
                     
-                    # Add to table with 4 columns like V1
-                    self.dlg.tableWidget_data.insertRow(row)
-                    
-                    # Column 0: Layer Name (read-only)
-                    self.dlg.tableWidget_data.setItem(row, 0, self.create_readonly_item(layer_name))
-                    
-                    # Column 1: Original Attribute (read-only)
-                    self.dlg.tableWidget_data.setItem(row, 1, self.create_readonly_item(original_attr))
-                    
-                    # Column 2: Feature Name (editable)
-                    feature_item = self.create_table_item(feature_name)
-                    self.dlg.tableWidget_data.setItem(row, 2, feature_item)
-                    
-                    # Column 3: Value (read-only)
-                    value_item = self.create_readonly_item(f"{value:.6f}")
-                    self.dlg.tableWidget_data.setItem(row, 3, value_item)
+                    with self.stage_timer.span('extract.table'):
+                        # Add to table with 4 columns like V1
+                        self.dlg.tableWidget_data.insertRow(row)
+                        
+                        # Column 0: Layer Name (read-only)
+                        self.dlg.tableWidget_data.setItem(row, 0, self.create_readonly_item(layer_name))
+                        
+                        # Column 1: Original Attribute (read-only)
+                        self.dlg.tableWidget_data.setItem(row, 1, self.create_readonly_item(original_attr))
+                        
+                        # Column 2: Feature Name (editable)
+                        feature_item = self.create_table_item(feature_name)
+                        self.dlg.tableWidget_data.setItem(row, 2, feature_item)
+                        
+                        # Column 3: Value (read-only); the float itself is kept for prediction
+                        value_item = self.create_readonly_item(f"{value:.6f}")
+                        value_item.setData(Qt.UserRole, float(value))
+                        self.dlg.tableWidget_data.setItem(row, 3, value_item)
                     
                     # Store extracted data
                     extracted_data[feature_name] = value
                     
-                    QgsMessageLog.logMessage(f"Extracted {layer_name}: {value}", "Flood Prediction V2", Qgis.Info)
+                    self.log.debug("Extracted value", layer=layer_name, value=value)
+                    run.count('extracted')
                     row += 1
                 else:
-                    QgsMessageLog.logMessage(f"Failed to extract from {layer_name}", "Flood Prediction V2", Qgis.Warning)
+                    self.log.debug("No value extracted", layer=layer_name)
+                    run.count('failed', note=layer_name)
             
             # Update status
             status_text = f"Extracted data from {successful_extractions}/{len(selected_layers)} selected layers"
             self.dlg.label_status.setText(status_text)
-            QgsMessageLog.logMessage(status_text, "Flood Prediction V2", Qgis.Info)
+            run.finish(WARNING if run.counts['failed'] or run.counts['missing'] else INFO)
             
             # Store extracted data for prediction
             self.extracted_data = extracted_data
             
         except Exception as e:
-            QgsMessageLog.logMessage(f"Error extracting data: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            self.log.critical("Error extracting data: %s", e)
+            self.log.dump_recent()
             QMessageBox.critical(self.dlg, "Error", f"Failed to extract data: {str(e)}")
 
+    def get_selected_layer_names(self):
+        """Names of the layers checked in the layer list, in list order"""
+        selected_layers = []
+        for layer_name, checkbox in self.dlg.layer_checkboxes.items():
+            if layer_name != '__no_layers__' and isinstance(checkbox, QCheckBox) and checkbox.isChecked():
+                selected_layers.append(layer_name)
+        return selected_layers
+
     def get_layer_by_name(self, name):
         """Get layer by name from project"""
         project = QgsProject.instance()
@@ -722,43 +1232,6 @@ class FloodPredictionPluginV2:
                 return layer
         return None
 
-    def suggest_feature_name(self, layer_name):
-        """Suggest a feature name based on layer name (like V1)"""
-        # Clean the name
-        clean_name = layer_name.lower().replace(' ', '_').replace('-', '_')
-        
-        # Common mappings for flood modeling features
-        # Updated to match user's actual training feature names
-        mappings = {
-            'dem': 'dem1',
-            'elevation': 'dem1',
-            'slope': 'slope1', 
-            'aspect': 'aspect1',
-            'twi': 'twi1',
-            'spi': 'spi1',
-            'ndvi': 'ndvi1',
-            'flow': 'flow_accumulation1',
-            'accumulation': 'flow_accumulation1',
-            'weight': 'weights',
-            'weights': 'weights',
-            # Fallback mappings
-            'curvature': 'curvature',
-            'drainage': 'drainage_density',
-            'distance': 'distance_to_water',
-            'soil': 'soil_type',
-            'geology': 'geology',
-            'land': 'landuse',
-            'cover': 'landcover'
-        }
-        
-        # Try to find a mapping
-        for key, value in mappings.items():
-            if key in clean_name:
-                return value
-        
-        # Return cleaned original name if no mapping found
-        return clean_name
-
     def extract_raster_value_official(self, raster_layer, point):
         """
         Extract raster value using OFFICIAL QGIS documentation pattern
@@ -766,15 +1239,17 @@ class FloodPredictionPluginV2:
         Based on: https://api.qgis.org/api/classQgsRasterDataProvider.html
         Pattern: value, success = provider.sample(point, band)
         """
+        from .core.log import DEBUG
+        
         try:
             if not raster_layer or not raster_layer.isValid():
-                QgsMessageLog.logMessage("Invalid raster layer", "Flood Prediction V2", Qgis.Warning)
+                self.log.warning("Invalid raster layer")
                 return None
             
             # Get data provider
             provider = raster_layer.dataProvider()
             if not provider or not provider.isValid():
-                QgsMessageLog.logMessage("Invalid raster data provider", "Flood Prediction V2", Qgis.Warning)
+                self.log.warning("Invalid raster data provider", layer=raster_layer.name())
                 return None
             
             # Transform point to layer CRS if needed
@@ -782,9 +1257,11 @@ class FloodPredictionPluginV2:
             layer_crs = raster_layer.crs()
             
             if canvas_crs != layer_crs:
-                transform = QgsCoordinateTransform(canvas_crs, layer_crs, QgsProject.instance())
-                transformed_point = transform.transform(point)
-                QgsMessageLog.logMessage(f"Transformed point from {canvas_crs.authid()} to {layer_crs.authid()}", "Flood Prediction V2", Qgis.Info)
+                with self.stage_timer.span('extract.transform'):
+                    transform = QgsCoordinateTransform(canvas_crs, layer_crs, QgsProject.instance())
+                    transformed_point = transform.transform(point)
+                if self.log.is_enabled(DEBUG):
+                    self.log.debug("Transformed point from %s to %s", canvas_crs.authid(), layer_crs.authid())
             else:
                 transformed_point = point
             
@@ -792,26 +1269,27 @@ class FloodPredictionPluginV2:
             # Returns tuple (value, success) as documented
             band_number = 1  # Sample from band 1 (1-based index)
             
-            QgsMessageLog.logMessage(f"Sampling at point: {transformed_point.x()}, {transformed_point.y()}", "Flood Prediction V2", Qgis.Info)
-            
             # This is the EXACT pattern from official QGIS documentation
-            value, success = provider.sample(transformed_point, band_number)
+            with self.stage_timer.span('extract.read'):
+                value, success = provider.sample(transformed_point, band_number)
             
-            QgsMessageLog.logMessage(f"Sample result: value={value}, success={success}", "Flood Prediction V2", Qgis.Info)
+            # Point and result as one debug event, formatted only if shown or dumped
+            self.log.debug("Sampled", layer=raster_layer.name(), x=transformed_point.x(), y=transformed_point.y(),
+                           value=value, success=success)
             
             if success:
                 # Check for NaN values as recommended in documentation
                 if not math.isnan(value):
                     return float(value)
                 else:
-                    QgsMessageLog.logMessage("Sampled value is NaN", "Flood Prediction V2", Qgis.Warning)
+                    self.log.debug("Sampled value is NaN", layer=raster_layer.name())
                     return None
             else:
-                QgsMessageLog.logMessage("Sampling failed - point outside extent or invalid band", "Flood Prediction V2", Qgis.Warning)
+                self.log.debug("Sampling failed - point outside extent or invalid band", layer=raster_layer.name())
                 return None
                 
         except Exception as e:
-            QgsMessageLog.logMessage(f"Exception in extract_raster_value_official: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            self.log.critical("Exception in extract_raster_value_official: %s", e)
             return None
 
     def create_table_item(self, text):
@@ -824,6 +1302,35 @@ class FloodPredictionPluginV2:
         item.setFlags(item.flags() & ~Qt.ItemIsEditable)
         return item
 
+    def read_table_features(self):
+        """Feature names and values from the data table.
+
+        Values are the floats stored with the items at extraction, not the
+        rounded text shown in the table.
+
+        :returns: Tuple (feature_names, values); rows without a value are skipped.
+        :rtype: tuple
+        """
+        features = []
+        feature_names = []
+        
+        for row in range(self.dlg.tableWidget_data.rowCount()):
+            # Column 2 contains the editable feature name
+            feature_name_item = self.dlg.tableWidget_data.item(row, 2)
+            # Column 3 contains the value
+            value_item = self.dlg.tableWidget_data.item(row, 3)
+            
+            if feature_name_item and value_item:
+                value = value_item.data(Qt.UserRole)
+                if value is None:
+                    QgsMessageLog.logMessage(f"No value for {feature_name_item.text()} in table", "Flood Prediction V2", Qgis.Warning)
+                    continue
+                features.append(float(value))
+                feature_names.append(feature_name_item.text())
+        
+        return feature_names, features
+
+    @profiled_run('predict')
     def predict_flood(self):
         """Make flood prediction using data from editable table"""
         try:
@@ -832,24 +1339,8 @@ class FloodPredictionPluginV2:
                 return
             
             # Read data from table (using editable feature names)
-            features = []
-            feature_names = []
-            
-            for row in range(self.dlg.tableWidget_data.rowCount()):
-                # Column 2 contains the editable feature name
-                feature_name_item = self.dlg.tableWidget_data.item(row, 2)
-                # Column 3 contains the value
-                value_item = self.dlg.tableWidget_data.item(row, 3)
-                
-                if feature_name_item and value_item:
-                    feature_name = feature_name_item.text()
-                    try:
-                        value = float(value_item.text())
-                        features.append(value)
-                        feature_names.append(feature_name)
-                    except ValueError:
-                        QgsMessageLog.logMessage(f"Invalid value in table: {value_item.text()}", "Flood Prediction V2", Qgis.Warning)
-                        continue
+            with self.stage_timer.span('predict.read_table'):
+                feature_names, features = self.read_table_features()
             
             if not features:
                 QMessageBox.warning(self.dlg, "Warning", "No valid data found in table")
@@ -871,80 +1362,57 @@ Your features: {', '.join(feature_names)}
 Please ensure you have exactly {self.expected_feature_count} features in the correct order."""
                 
                 QMessageBox.warning(self.dlg, "Feature Count Mismatch", warning_msg)
-                QgsMessageLog.logMessage(f"Feature count mismatch: expected {self.expected_feature_count}, got {len(features)}", "Flood Prediction V2", Qgis.Warning)
+                self.log.warning("Feature count mismatch", expected=self.expected_feature_count, provided=len(features))
                 # Don't return - allow user to proceed if they want to try anyway
             
-            QgsMessageLog.logMessage(f"Making prediction with {len(features)} features", "Flood Prediction V2", Qgis.Info)
-            QgsMessageLog.logMessage(f"Feature names: {feature_names}", "Flood Prediction V2", Qgis.Info)
-            QgsMessageLog.logMessage(f"Feature values: {features}", "Flood Prediction V2", Qgis.Info)
+            run = self.log.run('predict', features=len(features))
+            # The full vectors only in debug output (or the dump after an error)
+            self.log.debug("Feature names: %s", feature_names)
+            self.log.debug("Feature values: %s", features)
             
             # Validate model before prediction
-            if not self.model:
-                raise ValueError("Model is None - please reload the model")
+            from .core.models import validate_model
+            validate_model(self.model)
+            
+            # One row in the model's feature order (reordered if the table
+            # names are the model's names in another order)
+            from .core.features import assemble_features
+            with self.stage_timer.span('predict.assemble'):
+                feature_names, features_array = assemble_features(feature_names, features, self.model)
+            features = features_array[0].tolist()
+            run.set(model=type(self.model).__name__)
+            self.log.debug("Features array shape: %s", features_array.shape)
+            
+            # Single model call: the probability is computed once and the
+            # label is derived from it with the user's decision threshold
+            from .core.inference import predict_batch, is_lightgbm_model
+            threshold = self.dlg.doubleSpinBox_threshold.value()
+            
+            from .core.ensemble import ModelEnsemble
+            from .core.uncertainty import supports_tree_uncertainty, predict_with_uncertainty
+            from .core.inference import classify
+            ensemble_result = None
+            tree_uncertainty = None
             
-            # Check if model has predict method
-            if not hasattr(self.model, 'predict'):
-                raise AttributeError(f"Model of type {type(self.model).__name__} does not have a predict method")
-            
-            if not callable(self.model.predict):
-                raise TypeError(f"Model predict attribute is not callable: {type(self.model.predict)}")
-            
-            # Make prediction using model
-            # Reshape for sklearn models that expect 2D input
-            if not NUMPY_AVAILABLE:
-                raise ImportError("NumPy is required for predictions but not installed")
-            
-            features_array = np.array(features).reshape(1, -1)
-            QgsMessageLog.logMessage(f"Features array shape: {features_array.shape}", "Flood Prediction V2", Qgis.Info)
-            QgsMessageLog.logMessage(f"Model type: {type(self.model).__name__}", "Flood Prediction V2", Qgis.Info)
-            
-            # Attempt prediction with detailed error handling
             try:
-                # Special handling for LightGBM models
-                model_type = type(self.model).__name__
-                if 'LGB' in model_type.upper() or 'LIGHTGBM' in model_type.upper():
-                    QgsMessageLog.logMessage("Using LightGBM-specific prediction method", "Flood Prediction V2", Qgis.Info)
-                    
-                    # Check LightGBM specific attributes
-                    if hasattr(self.model, 'booster_') and self.model.booster_ is not None:
-                        QgsMessageLog.logMessage(f"LightGBM booster available: {type(self.model.booster_)}", "Flood Prediction V2", Qgis.Info)
+                with self.stage_timer.span('predict.model'):
+                    if isinstance(self.model, ModelEnsemble):
+                        # All ensemble members see the same feature vector
+                        ensemble_result = self.model.evaluate(features_array, threshold)
+                        probabilities = ensemble_result['mean_probability']
+                        labels = ensemble_result['labels']
+                    elif supports_tree_uncertainty(self.model):
+                        # Same tree traversal gives probability and tree spread
+                        probabilities, tree_std, tree_disagreement = predict_with_uncertainty(self.model, features_array)
+                        labels = classify(probabilities, threshold)
+                        tree_uncertainty = (float(tree_std[0]), float(tree_disagreement[0]))
                     else:
-                        QgsMessageLog.logMessage("LightGBM booster not available or None", "Flood Prediction V2", Qgis.Warning)
-                    
-                    # Try multiple LightGBM prediction approaches
-                    try:
-                        # Method 1: Standard sklearn interface
-                        prediction = self.model.predict(features_array)
-                        QgsMessageLog.logMessage("LightGBM prediction successful with standard method", "Flood Prediction V2", Qgis.Info)
-                    except Exception as lgb_error1:
-                        QgsMessageLog.logMessage(f"LightGBM standard method failed: {str(lgb_error1)}", "Flood Prediction V2", Qgis.Warning)
-                        try:
-                            # Method 2: With explicit parameters
-                            prediction = self.model.predict(features_array, num_iteration=None)
-                            QgsMessageLog.logMessage("LightGBM prediction successful with explicit parameters", "Flood Prediction V2", Qgis.Info)
-                        except Exception as lgb_error2:
-                            QgsMessageLog.logMessage(f"LightGBM explicit parameters failed: {str(lgb_error2)}", "Flood Prediction V2", Qgis.Warning)
-                            try:
-                                # Method 3: Direct booster prediction (if available)
-                                if hasattr(self.model, 'booster_') and self.model.booster_ is not None:
-                                    prediction = self.model.booster_.predict(features_array)
-                                    QgsMessageLog.logMessage("LightGBM prediction successful with booster method", "Flood Prediction V2", Qgis.Info)
-                                else:
-                                    raise Exception("No valid LightGBM prediction method available")
-                            except Exception as lgb_error3:
-                                QgsMessageLog.logMessage(f"All LightGBM methods failed: {str(lgb_error3)}", "Flood Prediction V2", Qgis.Critical)
-                                raise lgb_error1  # Raise the original error
-                else:
-                    # Standard prediction for other models
-                    prediction = self.model.predict(features_array)
-                
-                QgsMessageLog.logMessage(f"Raw prediction result: {prediction}, type: {type(prediction)}", "Flood Prediction V2", Qgis.Info)
-                
+                        probabilities, labels = predict_batch(self.model, features_array, threshold)
             except Exception as pred_error:
-                QgsMessageLog.logMessage(f"Model prediction failed: {str(pred_error)}", "Flood Prediction V2", Qgis.Critical)
+                self.log.critical("Model prediction failed: %s", pred_error)
                 
                 # Enhanced error information for LightGBM
-                if 'LGB' in type(self.model).__name__.upper():
+                if is_lightgbm_model(self.model):
                     lgb_info = []
                     lgb_info.append(f"LightGBM version check required")
                     if hasattr(self.model, 'booster_'):
@@ -952,40 +1420,48 @@ Please ensure you have exactly {self.expected_feature_count} features in the cor
                         lgb_info.append(f"Booster is None: {self.model.booster_ is None}")
                     
                     lgb_details = "\n".join(lgb_info)
-                    QgsMessageLog.logMessage(f"LightGBM diagnostic info: {lgb_details}", "Flood Prediction V2", Qgis.Info)
+                    self.log.info("LightGBM diagnostic info: %s", lgb_details)
                 
-                raise RuntimeError(f"Model prediction failed: {str(pred_error)}")
-            
-            # Handle prediction result safely
-            if hasattr(prediction, '__len__') and len(prediction) > 0:
-                prediction_value = prediction[0]
-            else:
-                prediction_value = prediction
+                raise
             
-            # Get probability if available
-            try:
-                probabilities = self.model.predict_proba(features_array)
-                if hasattr(probabilities, '__len__') and len(probabilities) > 0:
-                    probs = probabilities[0]
-                    if hasattr(probs, '__len__') and len(probs) > 1:
-                        flood_probability = probs[1]  # Probability of flood class (class 1)
-                    else:
-                        flood_probability = 0.5
-                else:
-                    flood_probability = 0.5
-            except:
-                flood_probability = 0.5
+            flood_probability = float(probabilities[0])
+            prediction_value = int(labels[0])
+            # Result labels and point layer update, timed as one stage
+            display_start = time.perf_counter()
             
             # Update results
             prediction_text = "Flood Risk" if prediction_value == 1 else "No Flood Risk"
             self.dlg.label_prediction_result.setText(f"Prediction: {prediction_text}")
-            self.dlg.label_probability.setText(f"Flood Probability: {flood_probability:.4f}")
+            self.dlg.label_probability.setText(f"Flood Probability: {flood_probability:.4f} (threshold {threshold:.2f})")
+            
+            if tree_uncertainty is not None:
+                self.dlg.label_probability.setText(
+                    f"Flood Probability: {flood_probability:.4f} (threshold {threshold:.2f}) | "
+                    f"Tree spread (std): {tree_uncertainty[0]:.4f} | Tree disagreement: {tree_uncertainty[1]:.0%}")
+            
+            if ensemble_result is not None:
+                agreement = float(ensemble_result['agreement'][0])
+                per_model = ", ".join(
+                    f"{model_id}: {probability:.4f}"
+                    for model_id, probability in zip(self.model.model_ids, ensemble_result['model_probabilities'][:, 0]))
+                self.dlg.label_probability.setText(
+                    f"Mean Flood Probability: {flood_probability:.4f} (threshold {threshold:.2f}) | "
+                    f"Model agreement: {agreement:.0%}\n{per_model}")
             
             # Create features summary for status
             features_summary = f"Used {len(features)} features: {', '.join(feature_names[:3])}{'...' if len(feature_names) > 3 else ''}"
             self.dlg.label_status.setText(f"Prediction: {prediction_text} | {features_summary}")
             
-            QgsMessageLog.logMessage(f"Prediction: {prediction_text}, Probability: {flood_probability:.4f}", "Flood Prediction V2", Qgis.Info)
+            # Store the result on the point; the layer style follows the probability
+            if self.selected_point_id is not None:
+                self.prediction_layer.set_predictions({self.selected_point_id: (prediction_text, flood_probability)})
+                self.selected_point_predicted = True
+                self.prediction_records[self.selected_point_id] = (
+                    tuple(feature_names), list(features), prediction_value, self.current_model_id())
+            self.stage_timer.record('predict.display', time.perf_counter() - display_start)
+            
+            run.set(prediction=prediction_text, probability=f"{flood_probability:.4f}", threshold=threshold)
+            run.finish()
             
         except Exception as e:
             error_msg = str(e)
@@ -994,8 +1470,9 @@ Please ensure you have exactly {self.expected_feature_count} features in the cor
             diagnosis = self.diagnose_model()
             detailed_error = f"Prediction Error: {error_msg}\n\nModel Diagnosis:\n{diagnosis}"
             
-            QgsMessageLog.logMessage(f"Error making prediction: {error_msg}", "Flood Prediction V2", Qgis.Critical)
-            QgsMessageLog.logMessage(f"Model diagnosis: {diagnosis}", "Flood Prediction V2", Qgis.Info)
+            self.log.critical("Error making prediction: %s", error_msg)
+            self.log.info("Model diagnosis: %s", diagnosis)
+            self.log.dump_recent()
             
             # Show user-friendly error with option to see details
             msg_box = QMessageBox()
@@ -1005,3 +1482,663 @@ Please ensure you have exactly {self.expected_feature_count} features in the cor
             msg_box.setDetailedText(detailed_error)
             msg_box.setStandardButtons(QMessageBox.Ok)
             msg_box.exec_()
+
+    def export_predictions(self):
+        """Stream the predicted points to a GeoPackage, Parquet or Feather file"""
+        try:
+            if not self.prediction_layer.is_alive() or not self.prediction_records:
+                QMessageBox.warning(self.dlg, "Warning", "No predictions to export - predict at least one point first")
+                return
+            
+            file_filters = ["GeoPackage (*.gpkg)"]
+            if library_available('pyarrow'):
+                file_filters += ["Parquet (*.parquet)", "Feather (*.feather)"]
+            path, selected_filter = QFileDialog.getSaveFileName(
+                self.dlg,
+                "Export Predictions",
+                "",
+                ";;".join(file_filters)
+            )
+            if not path:
+                return
+            if not os.path.splitext(path)[1]:
+                path += selected_filter[selected_filter.index('*') + 1:-1] if '*' in selected_filter else '.gpkg'
+            
+            from .core.export import DEFAULT_CHUNK_SIZE, open_prediction_writer
+            
+            layer = self.prediction_layer.layer
+            # Rows must share one feature layout; use the latest prediction's
+            feature_names = next(reversed(self.prediction_records.values()))[0]
+            skipped = 0
+            rows = []
+            
+            def flush(writer):
+                x, y, values, labels, probabilities, model_ids = zip(*rows)
+                writer.write(x, y, values, labels, probabilities, model_ids)
+                rows.clear()
+            
+            with open_prediction_writer(path, feature_names, crs_wkt=layer.crs().toWkt()) as writer:
+                for feature in layer.getFeatures():
+                    record = self.prediction_records.get(feature.id())
+                    if record is None:
+                        continue
+                    names, values, label, model_id = record
+                    if names != feature_names:
+                        skipped += 1
+                        continue
+                    point = feature.geometry().asPoint()
+                    rows.append((point.x(), point.y(), values, label, feature['probability'], model_id))
+                    if len(rows) >= DEFAULT_CHUNK_SIZE:
+                        flush(writer)
+                if rows:
+                    flush(writer)
+                exported = writer.rows_written
+            
+            message = f"Exported {exported} predictions to {os.path.basename(path)}"
+            if skipped:
+                message += f" ({skipped} with a different feature set skipped)"
+            self.dlg.label_status.setText(message)
+            QgsMessageLog.logMessage(f"{message} ({path})", "Flood Prediction V2", Qgis.Info)
+            
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error exporting predictions: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Error", f"Failed to export predictions: {str(e)}")
+
+    def _area_feature_layers(self):
+        """Checked layers for raster-wide prediction, or None after warning the user"""
+        if self.area_task is not None:
+            QMessageBox.warning(self.dlg, "Warning", "An area prediction is already running")
+            return None
+        
+        layers = [self.get_layer_by_name(name) for name in self.get_selected_layer_names()]
+        layers = [layer for layer in layers if layer is not None]
+        if not layers:
+            QMessageBox.warning(self.dlg, "Warning", "Please select at least one layer")
+            return None
+        
+        # Area prediction reads the files directly with GDAL
+        unsupported = [layer.name() for layer in layers if layer.providerType() != 'gdal']
+        if unsupported:
+            QMessageBox.warning(self.dlg, "Warning", f"Area prediction needs file-based (GDAL) rasters. Unsupported layers: {', '.join(unsupported)}")
+            return None
+        
+        if self.expected_feature_count and len(layers) != self.expected_feature_count:
+            QMessageBox.warning(self.dlg, "Feature Count Mismatch", f"Model expects {self.expected_feature_count} features but {len(layers)} layers are selected")
+            return None
+        
+        return layers
+
+    def _ask_area_output_paths(self, title):
+        """Ask for the probability GeoTIFF; the class raster goes next to it as *_class.tif"""
+        probability_path, _ = QFileDialog.getSaveFileName(
+            self.dlg,
+            title,
+            "",
+            "GeoTIFF (*.tif *.tiff)"
+        )
+        if not probability_path:
+            return None, None
+        if not probability_path.lower().endswith(('.tif', '.tiff')):
+            probability_path += '.tif'
+        return probability_path, os.path.splitext(probability_path)[0] + '_class.tif'
+
+    def predict_area(self):
+        """Predict flood probability and class rasters over the selected layers.
+
+        The selected layers are used as model features in list order (the same
+        order as the point workflow). Prediction runs in a background task.
+        """
+        try:
+            if not self.model:
+                QMessageBox.warning(self.dlg, "Warning", "Please load a model first")
+                return
+            
+            layers = self._area_feature_layers()
+            if not layers:
+                return
+            
+            probability_path, class_path = self._ask_area_output_paths("Save Flood Probability Raster")
+            if not probability_path:
+                return
+            
+            checkpoint = self.dlg.checkBox_resumable.isChecked()
+            if checkpoint:
+                from .core.area import resumable_job
+                job = resumable_job(probability_path)
+                if job is not None:
+                    reply = QMessageBox.question(
+                        self.dlg, "Resume Area Prediction",
+                        f"An unfinished prediction into this file has {int(job.completed.sum())} of {job.n_tiles} tiles done.\n"
+                        "Resume it? It continues only if the inputs, model and settings are unchanged.\n"
+                        "Choose No to start over.",
+                        QMessageBox.Yes | QMessageBox.No)
+                    if reply != QMessageBox.Yes:
+                        job.remove()
+            
+            threshold = self.dlg.doubleSpinBox_threshold.value()
+            from .core.features import suggest_feature_name
+            paths = [layer.source() for layer in layers]
+            names = [suggest_feature_name(layer.name()) for layer in layers]
+            # Worker spin box: 1 = predict inside QGIS, 0 = one process per core
+            workers = self.dlg.spinBox_workers.value()
+            workers = None if workers == 1 else workers
+            cog = self.dlg.checkBox_cog.isChecked()
+            quantize = self.dlg.checkBox_quantize.isChecked()
+            incremental = self.dlg.checkBox_incremental.isChecked()
+            # Memory limit spin box in MB, 0 = default pipeline depth
+            memory_limit = self.dlg.spinBox_memory_limit.value() * 2 ** 20 or None
+            
+            # The cProfile capture runs inside the task thread
+            profile = self.dlg.checkBox_cprofile.isChecked()
+            self.dlg.checkBox_cprofile.setChecked(False)
+            
+            QgsMessageLog.logMessage(f"Starting area prediction with {len(paths)} features: {', '.join(names)}", "Flood Prediction V2", Qgis.Info)
+            
+            self.area_task = QgsTask.fromFunction(
+                "Flood area prediction",
+                self._run_area_prediction,
+                self.model, paths, names, probability_path, class_path, threshold,
+                workers, list(self.model_paths), cog, quantize, incremental, checkpoint, memory_limit,
+                self.stage_timer, profile,
+                on_finished=self._area_prediction_finished
+            )
+            QgsApplication.taskManager().addTask(self.area_task)
+            self.dlg.label_status.setText("Area prediction running - see task manager for progress")
+            
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error starting area prediction: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Error", f"Failed to start area prediction: {str(e)}")
+
+    def _run_area_prediction(self, task, model, paths, names, probability_path, class_path, threshold, workers, model_paths,
+                             cog=False, quantize=False, incremental=False, checkpoint=False, memory_limit=None,
+                             timer=None, profile=False):
+        """Area prediction task body - runs in a worker thread, must not touch widgets"""
+        from .core.raster import FeatureStack
+        from .core.area import predict_area
+        from .core.features import order_for_model
+        from .core.profiling import ProfileCapture
+        
+        capture = ProfileCapture(profile)
+        names, paths = order_for_model(names, paths, model)
+        stack = FeatureStack(paths, names)
+        try:
+            with capture:
+                summary = predict_area(model, stack, probability_path, class_path, threshold, feedback=task,
+                                       workers=workers, model_paths=model_paths, cog=cog, quantize=quantize,
+                                       incremental=incremental, checkpoint=checkpoint, memory_limit=memory_limit,
+                                       timer=timer)
+        finally:
+            stack.close()
+        
+        if timer is not None:
+            timer.record('area.total', summary['seconds'])
+        summary['profile'] = capture.report()
+        summary['probability_path'] = probability_path
+        summary['class_path'] = class_path
+        summary['checkpoint'] = checkpoint
+        return summary
+
+    def predict_scenarios(self):
+        """Predict a time series of flood rasters where one feature changes per timestep.
+
+        The checked layers are the model features in order. The user picks
+        the layer that changes (e.g. rainfall) and one raster per timestep for
+        it; all other features are static and read once per tile.
+        """
+        try:
+            if not self.model:
+                QMessageBox.warning(self.dlg, "Warning", "Please load a model first")
+                return
+            
+            layers = self._area_feature_layers()
+            if not layers:
+                return
+            
+            layer_names = [layer.name() for layer in layers]
+            dynamic_name, ok = QInputDialog.getItem(
+                self.dlg, "Scenario Prediction", "Feature that changes per timestep:", layer_names, 0, False)
+            if not ok:
+                return
+            dynamic_index = layer_names.index(dynamic_name)
+            
+            timestep_paths, _ = QFileDialog.getOpenFileNames(
+                self.dlg,
+                f"Select one '{dynamic_name}' raster per timestep",
+                os.path.dirname(layers[dynamic_index].source()),
+                "Raster files (*.tif *.tiff *.vrt *.img *.asc);;All files (*)"
+            )
+            if not timestep_paths:
+                return
+            # Timesteps in file name order (e.g. rain_h01.tif, rain_h02.tif, ...)
+            timestep_paths = sorted(timestep_paths)
+            timestep_names = [os.path.splitext(os.path.basename(path))[0] for path in timestep_paths]
+            
+            probability_path, class_path = self._ask_area_output_paths("Save Flood Probability Time Series")
+            if not probability_path:
+                return
+            
+            features = [layer.source() for layer in layers]
+            features[dynamic_index] = timestep_paths
+            from .core.features import order_for_model, suggest_feature_name
+            _, features = order_for_model([suggest_feature_name(name) for name in layer_names], features, self.model)
+            
+            QgsMessageLog.logMessage(f"Starting scenario prediction: {len(timestep_paths)} timesteps of '{dynamic_name}', {len(features) - 1} static features", "Flood Prediction V2", Qgis.Info)
+            
+            self.area_task = QgsTask.fromFunction(
+                "Flood scenario prediction",
+                self._run_scenario_prediction,
+                self.model, features, timestep_names, probability_path, class_path,
+                self.dlg.doubleSpinBox_threshold.value(),
+                self.dlg.checkBox_cog.isChecked(), self.dlg.checkBox_quantize.isChecked(),
+                on_finished=self._area_prediction_finished
+            )
+            QgsApplication.taskManager().addTask(self.area_task)
+            self.dlg.label_status.setText("Scenario prediction running - see task manager for progress")
+            
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error starting scenario prediction: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Error", f"Failed to start scenario prediction: {str(e)}")
+
+    def _run_scenario_prediction(self, task, model, features, timestep_names, probability_path, class_path, threshold, cog, quantize):
+        """Scenario prediction task body - runs in a worker thread, must not touch widgets"""
+        from .core.scenarios import ScenarioStack, predict_scenarios
+        
+        scenario = ScenarioStack(features, timestep_names)
+        try:
+            summary = predict_scenarios(model, scenario, probability_path, class_path, threshold, feedback=task,
+                                        cog=cog, quantize=quantize)
+        finally:
+            scenario.close()
+        
+        summary['probability_path'] = probability_path
+        summary['class_path'] = class_path
+        return summary
+
+    def _ask_sweep_range(self, title, feature_name, default_value, default_steps):
+        """Ask for start, stop and number of steps of a sweep; None if canceled"""
+        start, ok = QInputDialog.getDouble(self.dlg, title, f"'{feature_name}' from:", default_value, -1e12, 1e12, 4)
+        if not ok:
+            return None
+        stop, ok = QInputDialog.getDouble(self.dlg, title, f"'{feature_name}' to:", start, -1e12, 1e12, 4)
+        if not ok:
+            return None
+        steps, ok = QInputDialog.getInt(self.dlg, title, f"Number of '{feature_name}' values:", default_steps, 2, 10000)
+        if not ok:
+            return None
+        from .core.sensitivity import sweep_values
+        return sweep_values(start, stop, steps)
+
+    def sensitivity_sweep(self):
+        """Vary one or two features and predict all combinations in one model call"""
+        try:
+            if not self.model:
+                QMessageBox.warning(self.dlg, "Warning", "Please load a model first")
+                return
+            
+            point_mode = "Response at the extracted point"
+            area_mode = "Critical-value raster over the selected layers"
+            mode, ok = QInputDialog.getItem(self.dlg, "Sensitivity Sweep", "Sweep:", [point_mode, area_mode], 0, False)
+            if not ok:
+                return
+            if mode == point_mode:
+                self._sweep_point()
+            else:
+                self._sweep_area()
+            
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error in sensitivity sweep: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Error", f"Sensitivity sweep failed: {str(e)}")
+
+    def _sweep_point(self):
+        """Response curve or surface for the feature values in the data table"""
+        import numpy as np
+        from .core.sensitivity import point_response, critical_values
+        from .core.inference import PROBABILITY_NODATA
+        
+        title = "Sensitivity Sweep"
+        feature_names, features = self.read_table_features()
+        if not features:
+            QMessageBox.warning(self.dlg, "Warning", "No valid data found in table - extract data first")
+            return
+        # Same feature order as "Make Prediction"
+        from .core.features import assemble_features
+        feature_names, features_array = assemble_features(feature_names, features, self.model)
+        features = features_array[0].tolist()
+        
+        first_name, ok = QInputDialog.getItem(self.dlg, title, "Feature to vary:", feature_names, 0, False)
+        if not ok:
+            return
+        first_index = feature_names.index(first_name)
+        first_values = self._ask_sweep_range(title, first_name, features[first_index], 21)
+        if first_values is None:
+            return
+        sweeps = [(first_index, first_values)]
+        
+        no_second = "(none - response curve)"
+        others = [name for name in feature_names if name != first_name]
+        second_name, ok = QInputDialog.getItem(self.dlg, title, "Second feature (optional):", [no_second] + others, 0, False)
+        if not ok:
+            return
+        if second_name != no_second:
+            second_index = feature_names.index(second_name)
+            second_values = self._ask_sweep_range(title, second_name, features[second_index], 11)
+            if second_values is None:
+                return
+            sweeps.append((second_index, second_values))
+        
+        threshold = self.dlg.doubleSpinBox_threshold.value()
+        probabilities = point_response(self.model, np.array(features), sweeps)
+        
+        if len(sweeps) == 1:
+            lines = [f"{first_name}\tprobability"]
+            lines += [f"{value:.4f}\t{probability:.4f}" for value, probability in zip(first_values, probabilities)]
+            critical = critical_values(probabilities[:, np.newaxis], first_values, threshold)[0]
+            summary = f"Flood probability ranges from {probabilities.min():.4f} to {probabilities.max():.4f} over {len(first_values)} values of '{first_name}'."
+            if critical != PROBABILITY_NODATA:
+                summary += f"\nIt reaches the threshold {threshold:.2f} at {first_name} = {critical:.4f}."
+            else:
+                summary += f"\nIt does not reach the threshold {threshold:.2f} in this range."
+        else:
+            lines = [f"{first_name} / {second_name}\t" + "\t".join(f"{value:.4f}" for value in sweeps[1][1])]
+            lines += [f"{value:.4f}\t" + "\t".join(f"{probability:.4f}" for probability in row)
+                      for value, row in zip(first_values, probabilities)]
+            flooded = probabilities >= threshold
+            summary = (f"Flood probability surface over {probabilities.shape[0]} x {probabilities.shape[1]} combinations "
+                       f"of '{first_name}' and '{second_name}': {probabilities.min():.4f} to {probabilities.max():.4f}, "
+                       f"{flooded.mean():.0%} of combinations at or above the threshold {threshold:.2f}.")
+        
+        QgsMessageLog.logMessage(summary, "Flood Prediction V2", Qgis.Info)
+        msg_box = QMessageBox(self.dlg)
+        msg_box.setIcon(QMessageBox.Information)
+        msg_box.setWindowTitle("Sensitivity Sweep Result")
+        msg_box.setText(summary)
+        msg_box.setDetailedText("\n".join(lines))
+        msg_box.setStandardButtons(QMessageBox.Ok)
+        msg_box.exec_()
+        self.dlg.label_status.setText(summary.split("\n")[-1])
+
+    def _sweep_area(self):
+        """Raster of the swept value at which each pixel becomes flooded"""
+        title = "Critical-Value Raster"
+        layers = self._area_feature_layers()
+        if not layers:
+            return
+        
+        layer_names = [layer.name() for layer in layers]
+        feature_name, ok = QInputDialog.getItem(self.dlg, title, "Feature to vary (e.g. rainfall):", layer_names, 0, False)
+        if not ok:
+            return
+        feature_index = layer_names.index(feature_name)
+        values = self._ask_sweep_range(title, feature_name, 0.0, 21)
+        if values is None:
+            return
+        
+        output_path, _ = self._ask_area_output_paths(f"Save Critical '{feature_name}' Raster")
+        if not output_path:
+            return
+        
+        from .core.features import suggest_feature_name
+        self.area_task = QgsTask.fromFunction(
+            "Flood critical-value sweep",
+            self._run_sensitivity_area,
+            self.model, [layer.source() for layer in layers],
+            [suggest_feature_name(name) for name in layer_names],
+            feature_index, values, output_path, self.dlg.doubleSpinBox_threshold.value(),
+            self.dlg.checkBox_cog.isChecked(),
+            on_finished=self._sensitivity_area_finished
+        )
+        QgsApplication.taskManager().addTask(self.area_task)
+        self.dlg.label_status.setText("Critical-value sweep running - see task manager for progress")
+
+    def _run_sensitivity_area(self, task, model, paths, names, feature_index, values, output_path, threshold, cog):
+        """Critical-value sweep task body - runs in a worker thread, must not touch widgets"""
+        from .core.features import order_for_model
+        from .core.raster import FeatureStack
+        from .core.sensitivity import predict_critical_values
+        
+        feature_name = names[feature_index]
+        names, paths = order_for_model(names, paths, model)
+        feature_index = names.index(feature_name)
+        stack = FeatureStack(paths, names)
+        try:
+            summary = predict_critical_values(model, stack, feature_index, values, output_path, threshold,
+                                              feedback=task, cog=cog)
+        finally:
+            stack.close()
+        
+        summary['output_path'] = output_path
+        summary['feature_name'] = names[feature_index]
+        return summary
+
+    def _sensitivity_area_finished(self, exception, result=None):
+        """Add the critical-value raster to the project once the task is done"""
+        self.area_task = None
+        
+        if exception is not None:
+            QgsMessageLog.logMessage(f"Critical-value sweep failed: {str(exception)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Sweep Error", f"Critical-value sweep failed: {str(exception)}")
+            return
+        
+        if not result or result['canceled']:
+            self.dlg.label_status.setText("Critical-value sweep canceled")
+            return
+        
+        layer = QgsRasterLayer(result['output_path'], f"Critical {result['feature_name']}")
+        if layer.isValid():
+            QgsProject.instance().addMapLayer(layer)
+        
+        share = result['flooding_pixels'] / result['valid_pixels'] if result['valid_pixels'] else 0.0
+        status_text = f"Critical-value sweep done: {share:.1%} of pixels reach the threshold within the sweep, {result['seconds']:.1f}s"
+        self.dlg.label_status.setText(status_text)
+        QgsMessageLog.logMessage(status_text, "Flood Prediction V2", Qgis.Info)
+
+    def _ask_probability_layer(self, title):
+        """Let the user pick a file-based probability raster from the project"""
+        layers = [layer for layer in QgsProject.instance().mapLayers().values()
+                  if isinstance(layer, QgsRasterLayer) and layer.providerType() == 'gdal']
+        if not layers:
+            QMessageBox.warning(self.dlg, "Warning", "No file-based raster layers in the project - run an area prediction first")
+            return None
+        names = [layer.name() for layer in layers]
+        # Prefer the output of the last area prediction
+        default = names.index('Flood Probability') if 'Flood Probability' in names else 0
+        name, ok = QInputDialog.getItem(self.dlg, title, "Probability raster:", names, default, False)
+        return layers[names.index(name)] if ok else None
+
+    def polygonize_extent(self):
+        """Vectorize the flood extent (probability >= threshold) of a probability raster"""
+        try:
+            if self.area_task is not None:
+                QMessageBox.warning(self.dlg, "Warning", "An area prediction is already running")
+                return
+            
+            title = "Flood Extent Polygons"
+            layer = self._ask_probability_layer(title)
+            if layer is None:
+                return
+            
+            pixel_area = layer.rasterUnitsPerPixelX() * layer.rasterUnitsPerPixelY()
+            min_area, ok = QInputDialog.getDouble(
+                self.dlg, title, "Minimum polygon area (map units squared):", 10 * pixel_area, 0.0, 1e15, 2)
+            if not ok:
+                return
+            
+            output_path, _ = QFileDialog.getSaveFileName(self.dlg, "Save Flood Extent", "", "GeoPackage (*.gpkg)")
+            if not output_path:
+                return
+            if not output_path.lower().endswith('.gpkg'):
+                output_path += '.gpkg'
+            
+            threshold = self.dlg.doubleSpinBox_threshold.value()
+            self.area_task = QgsTask.fromFunction(
+                "Flood extent polygons",
+                self._run_polygonize,
+                layer.source(), output_path, threshold, min_area,
+                on_finished=self._polygonize_finished
+            )
+            QgsApplication.taskManager().addTask(self.area_task)
+            self.dlg.label_status.setText("Flood extent polygonization running - see task manager for progress")
+            
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error starting polygonization: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Error", f"Failed to start polygonization: {str(e)}")
+
+    def _run_polygonize(self, task, probability_path, output_path, threshold, min_area):
+        """Polygonization task body - runs in a worker thread, must not touch widgets"""
+        from .core.polygonize import polygonize_extent
+        
+        summary = polygonize_extent(probability_path, output_path, threshold, min_area, feedback=task)
+        summary['output_path'] = output_path
+        return summary
+
+    def _polygonize_finished(self, exception, result=None):
+        """Add the flood extent layer to the project once the task is done"""
+        self.area_task = None
+        
+        if exception is not None:
+            QgsMessageLog.logMessage(f"Polygonization failed: {str(exception)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Polygonization Error", f"Flood extent polygonization failed: {str(exception)}")
+            return
+        
+        if not result or result['canceled']:
+            self.dlg.label_status.setText("Flood extent polygonization canceled")
+            return
+        
+        from .core.polygonize import EXTENT_LAYER_NAME
+        layer = QgsVectorLayer(f"{result['output_path']}|layername={EXTENT_LAYER_NAME}", 'Flood Extent', 'ogr')
+        if layer.isValid():
+            QgsProject.instance().addMapLayer(layer)
+        
+        status_text = (f"Flood extent: {result['polygons']} polygons from {result['kept_components']} of "
+                       f"{result['components']} components, area {result['flood_area']:.1f}, {result['seconds']:.1f}s")
+        self.dlg.label_status.setText(status_text)
+        QgsMessageLog.logMessage(status_text, "Flood Prediction V2", Qgis.Info)
+
+    def zonal_statistics(self):
+        """Flood statistics per polygon of a zone layer over a probability raster"""
+        try:
+            if self.area_task is not None:
+                QMessageBox.warning(self.dlg, "Warning", "An area prediction is already running")
+                return
+            
+            title = "Zonal Flood Statistics"
+            raster_layer = self._ask_probability_layer(title)
+            if raster_layer is None:
+                return
+            
+            zone_layers = [layer for layer in QgsProject.instance().mapLayers().values()
+                           if isinstance(layer, QgsVectorLayer) and layer.providerType() == 'ogr'
+                           and layer.geometryType() == QgsWkbTypes.PolygonGeometry]
+            if not zone_layers:
+                QMessageBox.warning(self.dlg, "Warning", "No file-based polygon layers in the project")
+                return
+            names = [layer.name() for layer in zone_layers]
+            name, ok = QInputDialog.getItem(self.dlg, title, "Zone polygons:", names, 0, False)
+            if not ok:
+                return
+            zone_layer = zone_layers[names.index(name)]
+            zone_source = QgsProviderRegistry.instance().decodeUri('ogr', zone_layer.source())
+            
+            output_path, _ = QFileDialog.getSaveFileName(self.dlg, "Save Zonal Statistics", "", "GeoPackage (*.gpkg)")
+            if not output_path:
+                return
+            if not output_path.lower().endswith('.gpkg'):
+                output_path += '.gpkg'
+            
+            self.area_task = QgsTask.fromFunction(
+                "Zonal flood statistics",
+                self._run_zonal_statistics,
+                raster_layer.source(), zone_source['path'], zone_source.get('layerName') or None,
+                output_path, self.dlg.doubleSpinBox_threshold.value(),
+                on_finished=self._zonal_statistics_finished
+            )
+            QgsApplication.taskManager().addTask(self.area_task)
+            self.dlg.label_status.setText("Zonal statistics running - see task manager for progress")
+            
+        except Exception as e:
+            QgsMessageLog.logMessage(f"Error starting zonal statistics: {str(e)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Error", f"Failed to start zonal statistics: {str(e)}")
+
+    def _run_zonal_statistics(self, task, probability_path, zones_path, zones_layer, output_path, threshold):
+        """Zonal statistics task body - runs in a worker thread, must not touch widgets"""
+        from .core.zonal import zonal_statistics, write_zonal_layer
+        
+        statistics = zonal_statistics(probability_path, zones_path, zones_layer, threshold, feedback=task)
+        if statistics['canceled']:
+            return {'canceled': True}
+        written = write_zonal_layer(zones_path, output_path, statistics, zones_layer)
+        return {
+            'canceled': False,
+            'output_path': output_path,
+            'zones': written,
+            'flooded_zones': int((statistics['flood_pixels'] > 0).sum()),
+            'seconds': statistics['seconds'],
+        }
+
+    def _zonal_statistics_finished(self, exception, result=None):
+        """Add the zonal statistics layer to the project once the task is done"""
+        self.area_task = None
+        
+        if exception is not None:
+            QgsMessageLog.logMessage(f"Zonal statistics failed: {str(exception)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Zonal Statistics Error", f"Zonal statistics failed: {str(exception)}")
+            return
+        
+        if not result or result['canceled']:
+            self.dlg.label_status.setText("Zonal statistics canceled")
+            return
+        
+        layer = QgsVectorLayer(f"{result['output_path']}|layername=zonal_statistics", 'Zonal Flood Statistics', 'ogr')
+        if layer.isValid():
+            QgsProject.instance().addMapLayer(layer)
+        
+        status_text = f"Zonal statistics: {result['flooded_zones']} of {result['zones']} zones with flood risk, {result['seconds']:.1f}s"
+        self.dlg.label_status.setText(status_text)
+        QgsMessageLog.logMessage(status_text, "Flood Prediction V2", Qgis.Info)
+
+    def _area_prediction_finished(self, exception, result=None):
+        """Add the area prediction outputs to the project once the task is done"""
+        self.area_task = None
+        
+        if exception is not None:
+            QgsMessageLog.logMessage(f"Area prediction failed: {str(exception)}", "Flood Prediction V2", Qgis.Critical)
+            QMessageBox.critical(self.dlg, "Area Prediction Error", f"Area prediction failed: {str(exception)}")
+            return
+        
+        if result and result.get('profile'):
+            self.show_profile_report('area', result['profile'])
+        self.refresh_profile_panel()
+        
+        if not result or result['canceled']:
+            status_text = "Area prediction canceled"
+            if result and result.get('checkpoint'):
+                status_text += f" - {result['tiles_done']} of {result['tiles']} tiles kept, run it again to resume"
+            self.dlg.label_status.setText(status_text)
+            QgsMessageLog.logMessage(status_text, "Flood Prediction V2", Qgis.Warning)
+            return
+        
+        for path, name in ((result['probability_path'], 'Flood Probability'), (result['class_path'], 'Flood Class')):
+            layer = QgsRasterLayer(path, name)
+            if layer.isValid():
+                QgsProject.instance().addMapLayer(layer)
+            else:
+                QgsMessageLog.logMessage(f"Could not load output raster: {path}", "Flood Prediction V2", Qgis.Warning)
+        
+        if 'timesteps' in result:
+            # Scenario run: flood share of the first and the worst timestep
+            shares = [count / result['valid_pixels'] if result['valid_pixels'] else 0.0 for count in result['flood_pixels']]
+            worst = max(range(len(shares)), key=shares.__getitem__)
+            status_text = (f"Scenario prediction done: {len(shares)} timesteps, {result['valid_pixels']} pixels, "
+                           f"flood risk {shares[0]:.1%} at {result['timesteps'][0]}, "
+                           f"max {shares[worst]:.1%} at {result['timesteps'][worst]}, {result['seconds']:.1f}s")
+        else:
+            flood_share = result['flood_pixels'] / result['valid_pixels'] if result['valid_pixels'] else 0.0
+            status_text = f"Area prediction done: {result['valid_pixels']} pixels, {flood_share:.1%} flood risk, {result['seconds']:.1f}s on {result['workers']} process(es)"
+            if result.get('tile_size'):
+                QgsMessageLog.logMessage(f"Area prediction used {result['tile_size']} px tiles ({result['tiles']} tiles)", "Flood Prediction V2", Qgis.Info)
+            if result.get('tiles_resumed'):
+                status_text += f", resumed after {result['tiles_resumed']} of {result['tiles']} tiles"
+            if result.get('tiles_reused'):
+                status_text += f", {result['tiles_reused']} of {result['tiles']} tiles unchanged"
+        self.dlg.label_status.setText(status_text)
+        QgsMessageLog.logMessage(status_text, "Flood Prediction V2", Qgis.Info)
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Flood prediction Processing algorithms
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+ Processing algorithms over the plugin core.
+
+ The algorithms take every input as a parameter and report through the
+ QgsProcessingFeedback they are given (progress, log, cancellation), so
+ they run unchanged from the toolbox, the Graphical Modeler and
+ qgis_process, in a background thread and without the plugin dialog.
+ Feature rasters must be GDAL layers; they are read with core.raster and
+ core.sampling, not through the layer providers.
+"""
+
+from qgis.PyQt.QtCore import QCoreApplication, QVariant
+from qgis.core import (
+    QgsCoordinateTransform,
+    QgsCsException,
+    QgsFeature,
+    QgsFeatureSink,
+    QgsField,
+    QgsFields,
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingException,
+    QgsProcessingOutputNumber,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterEnum,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterMultipleLayers,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterRasterDestination,
+)
+
+# Points sampled and predicted per model call
+POINT_CHUNK_SIZE = 10000
+
+
+class FloodAlgorithm(QgsProcessingAlgorithm):
+    """Shared parameters and helpers of the flood prediction algorithms"""
+
+    FEATURES = 'FEATURES'
+    MODELS = 'MODELS'
+    THRESHOLD = 'THRESHOLD'
+
+    def tr(self, string):
+        return QCoreApplication.translate('Processing', string)
+
+    def createInstance(self):
+        return type(self)()
+
+    def group(self):
+        return self.tr('Flood prediction')
+
+    def groupId(self):
+        return 'floodprediction'
+
+    def add_feature_parameter(self):
+        self.addParameter(QgsProcessingParameterMultipleLayers(
+            self.FEATURES, self.tr('Feature rasters (in model feature order)'), QgsProcessing.TypeRaster))
+
+    def add_model_parameters(self):
+        self.addParameter(QgsProcessingParameterMultipleLayers(
+            self.MODELS, self.tr('Model file(s) (.pkl or .joblib; several form an ensemble)'), QgsProcessing.TypeFile))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.THRESHOLD, self.tr('Decision threshold'), QgsProcessingParameterNumber.Double,
+            0.5, minValue=0.0, maxValue=1.0))
+
+    def feature_layers(self, parameters, context):
+        """Feature raster layers and their feature names.
+
+        :raises QgsProcessingException: for missing or non-GDAL layers.
+        """
+        from .core.features import suggest_feature_name
+
+        layers = self.parameterAsLayerList(parameters, self.FEATURES, context)
+        if not layers:
+            raise QgsProcessingException(self.tr('Select at least one feature raster'))
+        for layer in layers:
+            if layer.providerType() != 'gdal':
+                raise QgsProcessingException(
+                    self.tr('{} is not a GDAL raster; feature rasters must be files GDAL can open').format(layer.name()))
+        return layers, [suggest_feature_name(layer.name()) for layer in layers]
+
+    def load_model(self, parameters, context, feedback):
+        """Model (or in-process ensemble) and its file paths"""
+        from .core.ensemble import load_predictor
+
+        model_paths = self.parameterAsFileList(parameters, self.MODELS, context)
+        if not model_paths:
+            raise QgsProcessingException(self.tr('Select a model file'))
+        feedback.pushInfo(self.tr('Loading {} model file(s)').format(len(model_paths)))
+        try:
+            return load_predictor(model_paths), model_paths
+        except Exception as e:
+            raise QgsProcessingException(self.tr('Failed to load model: {}').format(str(e)))
+
+    def check_feature_count(self, model, layers):
+        from .core.features import model_feature_count
+
+        expected = model_feature_count(model)
+        if expected and expected != len(layers):
+            raise QgsProcessingException(
+                self.tr('The model expects {} features but {} feature rasters were given').format(expected, len(layers)))
+
+    def model_order(self, model, layers, names):
+        """Layers and names in the model's feature order (see core.features.feature_order)"""
+        from .core.features import order_for_model
+
+        names, layers = order_for_model(names, layers, model)
+        return layers, names
+
+
+class PredictPointsAlgorithm(FloodAlgorithm):
+    """Flood probability and class at every point of a layer"""
+
+    INPUT = 'INPUT'
+    SAMPLING = 'SAMPLING'
+    RADIUS = 'RADIUS'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'predictpoints'
+
+    def displayName(self):
+        return self.tr('Predict flood risk at points')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Samples the feature rasters at every point (nearest, bilinear, cubic or mean within a radius in '
+            'raster CRS units) and predicts the flood probability and class with one model call per '
+            '{} points. The output has the input attributes, one field per feature, "probability" and '
+            '"label"; both are empty where a raster has no data.').format(POINT_CHUNK_SIZE)
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Points'), [QgsProcessing.TypeVectorPoint]))
+        self.add_feature_parameter()
+        self.add_model_parameters()
+        self.addParameter(QgsProcessingParameterEnum(
+            self.SAMPLING, self.tr('Sampling'),
+            [self.tr('Nearest pixel'), self.tr('Bilinear'), self.tr('Cubic'), self.tr('Mean within radius')],
+            defaultValue=0))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.RADIUS, self.tr('Radius for mean sampling (raster CRS units)'), QgsProcessingParameterNumber.Double,
+            0.0, minValue=0.0))
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Flood predictions'), QgsProcessing.TypeVectorPoint))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        import numpy as np
+        from .core.ensemble import predict_points
+        from .core.export import field_names
+        from .core.sampling import SAMPLING_METHODS, RasterSampler
+
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+        layers, names = self.feature_layers(parameters, context)
+        model, _ = self.load_model(parameters, context, feedback)
+        self.check_feature_count(model, layers)
+        layers, names = self.model_order(model, layers, names)
+        threshold = self.parameterAsDouble(parameters, self.THRESHOLD, context)
+        method = SAMPLING_METHODS[self.parameterAsEnum(parameters, self.SAMPLING, context)]
+        radius = self.parameterAsDouble(parameters, self.RADIUS, context)
+
+        # Input attributes, then the features and the prediction
+        fields = QgsFields(source.fields())
+        existing = {field.name().lower() for field in source.fields()}
+        feature_fields = []
+        for name in field_names(names):
+            candidate, suffix = name, 1
+            while candidate in existing:
+                suffix += 1
+                candidate = f"{name}_{suffix}"
+            existing.add(candidate)
+            feature_fields.append(candidate)
+            fields.append(QgsField(candidate, QVariant.Double))
+        for name, field_type in (('probability', QVariant.Double), ('label', QVariant.Int)):
+            if name in existing:
+                raise QgsProcessingException(self.tr('The points already have a "{}" field').format(name))
+            fields.append(QgsField(name, field_type))
+
+        sink, dest_id = self.parameterAsSink(parameters, self.OUTPUT, context, fields,
+                                             source.wkbType(), source.sourceCrs())
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        samplers = [RasterSampler(layer.source()) for layer in layers]
+        transforms = [None if layer.crs() == source.sourceCrs()
+                      else QgsCoordinateTransform(source.sourceCrs(), layer.crs(), context.transformContext())
+                      for layer in layers]
+
+        def flush(chunk):
+            points = []
+            for feature in chunk:
+                geometry = feature.geometry()
+                points.append(None if geometry.isEmpty() else geometry.centroid().asPoint())
+            values = np.full((len(chunk), len(layers)), np.nan)
+            for column, (sampler, transform) in enumerate(zip(samplers, transforms)):
+                x = np.full(len(chunk), np.nan)
+                y = np.full(len(chunk), np.nan)
+                for row, point in enumerate(points):
+                    if point is None:
+                        continue
+                    if transform is not None:
+                        try:
+                            point = transform.transform(point)
+                        except QgsCsException:
+                            continue
+                    x[row], y[row] = point.x(), point.y()
+                values[:, column] = sampler.sample(x, y, method, radius)
+            probabilities, labels, valid = predict_points(model, values, threshold)
+
+            for feature, row, probability, label, ok in zip(chunk, values, probabilities, labels, valid):
+                output = QgsFeature(fields)
+                output.setGeometry(feature.geometry())
+                output.setAttributes(
+                    feature.attributes()
+                    + [None if value != value else float(value) for value in row.tolist()]
+                    + ([float(probability), int(label)] if ok else [None, None]))
+                sink.addFeature(output, QgsFeatureSink.FastInsert)
+            return int(valid.sum()), int(labels[valid].sum())
+
+        total = source.featureCount() or 0
+        done = predicted = flooded = 0
+        chunk = []
+        try:
+            for feature in source.getFeatures():
+                if feedback.isCanceled():
+                    break
+                chunk.append(feature)
+                if len(chunk) == POINT_CHUNK_SIZE:
+                    valid_count, flood_count = flush(chunk)
+                    done, predicted, flooded = done + len(chunk), predicted + valid_count, flooded + flood_count
+                    chunk = []
+                    if total:
+                        feedback.setProgress(100.0 * done / total)
+            if chunk and not feedback.isCanceled():
+                valid_count, flood_count = flush(chunk)
+                done, predicted, flooded = done + len(chunk), predicted + valid_count, flooded + flood_count
+        finally:
+            for sampler in samplers:
+                sampler.close()
+            if hasattr(model, 'close'):
+                model.close()
+
+        feedback.pushInfo(self.tr('Predicted {} of {} points, {} at flood risk').format(predicted, done, flooded))
+        return {self.OUTPUT: dest_id}
+
+
+class PredictRasterAlgorithm(FloodAlgorithm):
+    """Flood probability (and class) rasters over the feature rasters"""
+
+    TILE_SIZE = 'TILE_SIZE'
+    WORKERS = 'WORKERS'
+    COG = 'COG'
+    OUTPUT_PROBABILITY = 'OUTPUT_PROBABILITY'
+    OUTPUT_CLASS = 'OUTPUT_CLASS'
+
+    def name(self):
+        return 'predictraster'
+
+    def displayName(self):
+        return self.tr('Predict flood risk raster')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Predicts the flood probability for every pixel of the first feature raster\'s grid (other rasters '
+            'are aligned to it) tile by tile, and optionally the flood class at the decision threshold. '
+            'Pixels where any feature has no data are nodata. A tile size of 0 picks the size from the '
+            'model and the inputs\' block layout.')
+
+    def initAlgorithm(self, config=None):
+        self.add_feature_parameter()
+        self.add_model_parameters()
+        self.addParameter(QgsProcessingParameterNumber(
+            self.TILE_SIZE, self.tr('Tile size in pixels (0 = automatic)'), QgsProcessingParameterNumber.Integer,
+            0, minValue=0))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.WORKERS, self.tr('Worker processes (1 = this process, 0 = all cores)'),
+            QgsProcessingParameterNumber.Integer, 1, minValue=0))
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.COG, self.tr('Write Cloud-Optimized GeoTIFFs'), False))
+        self.addParameter(QgsProcessingParameterRasterDestination(
+            self.OUTPUT_PROBABILITY, self.tr('Flood probability')))
+        self.addParameter(QgsProcessingParameterRasterDestination(
+            self.OUTPUT_CLASS, self.tr('Flood class'), optional=True, createByDefault=False))
+        self.addOutput(QgsProcessingOutputNumber('VALID_PIXELS', self.tr('Predicted pixels')))
+        self.addOutput(QgsProcessingOutputNumber('FLOOD_PIXELS', self.tr('Flood pixels')))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        from .core.area import predict_area
+        from .core.raster import FeatureStack
+
+        layers, names = self.feature_layers(parameters, context)
+        model, model_paths = self.load_model(parameters, context, feedback)
+        self.check_feature_count(model, layers)
+        layers, names = self.model_order(model, layers, names)
+        threshold = self.parameterAsDouble(parameters, self.THRESHOLD, context)
+        tile_size = self.parameterAsInt(parameters, self.TILE_SIZE, context) or None
+        workers = self.parameterAsInt(parameters, self.WORKERS, context)
+        cog = self.parameterAsBool(parameters, self.COG, context)
+        probability_path = self.parameterAsOutputLayer(parameters, self.OUTPUT_PROBABILITY, context)
+        class_path = self.parameterAsOutputLayer(parameters, self.OUTPUT_CLASS, context) or None
+
+        stack = FeatureStack([layer.source() for layer in layers], names)
+        try:
+            summary = predict_area(model, stack, probability_path, class_path, threshold, tile_size,
+                                   feedback=feedback, workers=None if workers == 1 else workers,
+                                   model_paths=model_paths, cog=cog)
+        except ValueError as e:
+            raise QgsProcessingException(str(e))
+        finally:
+            stack.close()
+            if hasattr(model, 'close'):
+                model.close()
+
+        if summary['canceled']:
+            feedback.reportError(self.tr('Canceled after {} of {} tiles - the outputs are incomplete').format(
+                summary['tiles_done'], summary['tiles']))
+        feedback.pushInfo(self.tr('{} tiles of {} px, {} valid pixels, {} flood pixels in {:.1f}s').format(
+            summary['tiles_done'], summary['tile_size'], summary['valid_pixels'], summary['flood_pixels'],
+            summary['seconds']))
+        return {
+            self.OUTPUT_PROBABILITY: probability_path,
+            self.OUTPUT_CLASS: class_path,
+            'VALID_PIXELS': summary['valid_pixels'],
+            'FLOOD_PIXELS': summary['flood_pixels'],
+        }
+
+
+class BuildFeatureCubeAlgorithm(FloodAlgorithm):
+    """Aligned feature rasters as one multi-band GeoTIFF"""
+
+    COG = 'COG'
+    OUTPUT = 'OUTPUT'
+
+    def name(self):
+        return 'buildfeaturecube'
+
+    def displayName(self):
+        return self.tr('Build feature cube')
+
+    def shortHelpString(self):
+        return self.tr(
+            'Aligns the feature rasters to the grid of the first one and writes them as float32 bands of one '
+            'GeoTIFF, named after the features, in the given order. Pixels where any feature has no data are '
+            'nodata in every band.')
+
+    def initAlgorithm(self, config=None):
+        self.add_feature_parameter()
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.COG, self.tr('Write a Cloud-Optimized GeoTIFF'), False))
+        self.addParameter(QgsProcessingParameterRasterDestination(
+            self.OUTPUT, self.tr('Feature cube')))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        from .core.cube import build_feature_cube
+        from .core.raster import FeatureStack
+
+        layers, names = self.feature_layers(parameters, context)
+        output_path = self.parameterAsOutputLayer(parameters, self.OUTPUT, context)
+        cog = self.parameterAsBool(parameters, self.COG, context)
+
+        stack = FeatureStack([layer.source() for layer in layers], names)
+        try:
+            summary = build_feature_cube(stack, output_path, feedback=feedback, cog=cog)
+        finally:
+            stack.close()
+
+        if summary['canceled']:
+            feedback.reportError(self.tr('Canceled after {} of {} tiles - the cube is incomplete').format(
+                summary['tiles_done'], summary['tiles']))
+        feedback.pushInfo(self.tr('{} bands, {} valid pixels in {:.1f}s').format(
+            summary['bands'], summary['valid_pixels'], summary['seconds']))
+        return {self.OUTPUT: output_path}
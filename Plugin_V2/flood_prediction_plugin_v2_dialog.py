@@ -25,7 +25,7 @@ from qgis.PyQt import uic
 from qgis.PyQt.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTableWidget, 
     QTableWidgetItem, QHeaderView, QGroupBox, QScrollArea, QCheckBox, QLineEdit,
-    QSplitter, QTextEdit, QFrame
+    QSplitter, QTextEdit, QFrame, QDoubleSpinBox, QSpinBox, QComboBox, QTabWidget
 )
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt import QtWidgets
@@ -76,15 +76,30 @@ class FloodPredictionPluginV2Dialog(QDialog):
         coord_layout = QHBoxLayout()
         coord_layout.addWidget(QLabel("X:"))
         self.lineEdit_x_coord = QLineEdit()
-        self.lineEdit_x_coord.setReadOnly(True)
+        self.lineEdit_x_coord.setPlaceholderText("x or x1, x2, ...")
         coord_layout.addWidget(self.lineEdit_x_coord)
         
         coord_layout.addWidget(QLabel("Y:"))
         self.lineEdit_y_coord = QLineEdit()
-        self.lineEdit_y_coord.setReadOnly(True)
+        self.lineEdit_y_coord.setPlaceholderText("y or y1, y2, ...")
         coord_layout.addWidget(self.lineEdit_y_coord)
         
         point_layout.addLayout(coord_layout)
+        
+        # Point queue: many points extracted and predicted together
+        queue_layout = QHBoxLayout()
+        self.pushButton_queue_coordinates = QPushButton("Add to Queue")
+        self.pushButton_queue_coordinates.setToolTip("Queue the X/Y coordinates (map CRS); paste comma- or space-separated lists for many points. Shift-click on the map also queues points")
+        queue_layout.addWidget(self.pushButton_queue_coordinates)
+        self.pushButton_predict_queue = QPushButton("Predict Queue")
+        self.pushButton_predict_queue.setToolTip("Extract all queued points with one read per layer and region and predict them in one model call")
+        queue_layout.addWidget(self.pushButton_predict_queue)
+        self.pushButton_clear_queue = QPushButton("Clear Queue")
+        queue_layout.addWidget(self.pushButton_clear_queue)
+        point_layout.addLayout(queue_layout)
+        
+        self.label_queue = QLabel("Queued points: 0")
+        point_layout.addWidget(self.label_queue)
         left_layout.addWidget(point_group)
         
         # Layer Selection Group
@@ -99,6 +114,28 @@ class FloodPredictionPluginV2Dialog(QDialog):
         layer_buttons_layout.addWidget(self.pushButton_extract_data)
         layer_layout.addLayout(layer_buttons_layout)
         
+        # How raster values are read at the selected and queued points
+        sampling_layout = QHBoxLayout()
+        sampling_layout.addWidget(QLabel("Sampling:"))
+        self.comboBox_sampling = QComboBox()
+        self.comboBox_sampling.addItem("Nearest pixel", 'nearest')
+        self.comboBox_sampling.addItem("Bilinear", 'bilinear')
+        self.comboBox_sampling.addItem("Cubic", 'cubic')
+        self.comboBox_sampling.addItem("Mean within radius", 'mean')
+        self.comboBox_sampling.setToolTip("Interpolation of raster values at points; methods other than nearest need GDAL layers")
+        sampling_layout.addWidget(self.comboBox_sampling)
+        sampling_layout.addWidget(QLabel("Radius:"))
+        self.doubleSpinBox_sampling_radius = QDoubleSpinBox()
+        self.doubleSpinBox_sampling_radius.setRange(0.0, 1e6)
+        self.doubleSpinBox_sampling_radius.setDecimals(2)
+        self.doubleSpinBox_sampling_radius.setValue(30.0)
+        self.doubleSpinBox_sampling_radius.setToolTip("Radius in layer CRS units for 'Mean within radius'")
+        self.doubleSpinBox_sampling_radius.setEnabled(False)
+        sampling_layout.addWidget(self.doubleSpinBox_sampling_radius)
+        self.comboBox_sampling.currentIndexChanged.connect(
+            lambda: self.doubleSpinBox_sampling_radius.setEnabled(self.comboBox_sampling.currentData() == 'mean'))
+        layer_layout.addLayout(sampling_layout)
+        
         layer_layout.addWidget(QLabel("Available Layers (check to select):"))
         
         # Create scrollable area for layer checkboxes
@@ -127,6 +164,29 @@ class FloodPredictionPluginV2Dialog(QDialog):
         model_file_layout.addWidget(self.pushButton_load_model)
         model_layout.addLayout(model_file_layout)
         
+        # Ensemble of several models evaluated on the same features
+        ensemble_layout = QHBoxLayout()
+        self.pushButton_load_ensemble = QPushButton("Load Ensemble...")
+        self.pushButton_load_ensemble.setToolTip("Select several model files; all models are evaluated on the same extracted features")
+        ensemble_layout.addWidget(self.pushButton_load_ensemble)
+        ensemble_layout.addWidget(QLabel("Worker processes:"))
+        self.spinBox_workers = QSpinBox()
+        self.spinBox_workers.setRange(0, 256)
+        self.spinBox_workers.setValue(1)
+        self.spinBox_workers.setSpecialValueText("All cores")
+        self.spinBox_workers.setToolTip("1 evaluates models inside QGIS; more spreads ensemble members and area prediction tiles across processes")
+        ensemble_layout.addWidget(self.spinBox_workers)
+        ensemble_layout.addWidget(QLabel("Memory limit:"))
+        self.spinBox_memory_limit = QSpinBox()
+        self.spinBox_memory_limit.setRange(0, 1024 * 1024)
+        self.spinBox_memory_limit.setSingleStep(256)
+        self.spinBox_memory_limit.setValue(0)
+        self.spinBox_memory_limit.setSuffix(" MB")
+        self.spinBox_memory_limit.setSpecialValueText("Default")
+        self.spinBox_memory_limit.setToolTip("Ceiling for the raster tiles area prediction keeps in memory at once")
+        ensemble_layout.addWidget(self.spinBox_memory_limit)
+        model_layout.addLayout(ensemble_layout)
+        
         self.label_model_features = QLabel("Expected features: Not loaded")
         self.label_model_features.setWordWrap(True)
         model_layout.addWidget(self.label_model_features)
@@ -148,8 +208,61 @@ class FloodPredictionPluginV2Dialog(QDialog):
         
         self.pushButton_clear_point = QPushButton("Clear Point")
         prediction_buttons_layout.addWidget(self.pushButton_clear_point)
+        
+        self.pushButton_export_predictions = QPushButton("Export Predictions...")
+        self.pushButton_export_predictions.setToolTip("Save predicted points with their features to GeoPackage, Parquet or Feather")
+        prediction_buttons_layout.addWidget(self.pushButton_export_predictions)
+        
+        self.pushButton_sensitivity = QPushButton("Sensitivity Sweep...")
+        self.pushButton_sensitivity.setToolTip("Vary one or two features over a range and predict every combination at once")
+        prediction_buttons_layout.addWidget(self.pushButton_sensitivity)
         prediction_layout.addLayout(prediction_buttons_layout)
         
+        # Decision threshold applied to the flood probability
+        threshold_layout = QHBoxLayout()
+        threshold_layout.addWidget(QLabel("Decision threshold:"))
+        self.doubleSpinBox_threshold = QDoubleSpinBox()
+        self.doubleSpinBox_threshold.setRange(0.0, 1.0)
+        self.doubleSpinBox_threshold.setSingleStep(0.05)
+        self.doubleSpinBox_threshold.setDecimals(2)
+        self.doubleSpinBox_threshold.setValue(0.5)
+        self.doubleSpinBox_threshold.setToolTip("Probabilities at or above this value are classified as Flood Risk")
+        threshold_layout.addWidget(self.doubleSpinBox_threshold)
+        
+        # Whole-raster prediction over the selected layers
+        self.pushButton_predict_area = QPushButton("Predict Area...")
+        self.pushButton_predict_area.setToolTip("Write flood probability and class rasters for the full extent of the selected layers")
+        threshold_layout.addWidget(self.pushButton_predict_area)
+        
+        # Same, for a series of timesteps of one changing input (e.g. rainfall)
+        self.pushButton_predict_scenarios = QPushButton("Predict Scenarios...")
+        self.pushButton_predict_scenarios.setToolTip("Predict one raster band per timestep; static layers are read once per tile")
+        threshold_layout.addWidget(self.pushButton_predict_scenarios)
+        prediction_layout.addLayout(threshold_layout)
+        
+        # Area output format
+        area_output_layout = QHBoxLayout()
+        self.checkBox_cog = QCheckBox("Cloud-optimized GeoTIFF (COG)")
+        self.checkBox_cog.setToolTip("Tiled, compressed GeoTIFF with internal overviews built while the tiles are written")
+        area_output_layout.addWidget(self.checkBox_cog)
+        self.checkBox_quantize = QCheckBox("8-bit probability")
+        self.checkBox_quantize.setToolTip("Store probabilities as 0-254 (scale 1/254) instead of 32-bit float")
+        area_output_layout.addWidget(self.checkBox_quantize)
+        self.checkBox_incremental = QCheckBox("Incremental")
+        self.checkBox_incremental.setToolTip("Keep per-tile input fingerprints and, when rerun into the same file, only recompute tiles whose inputs or model changed")
+        area_output_layout.addWidget(self.checkBox_incremental)
+        self.checkBox_resumable = QCheckBox("Resumable")
+        self.checkBox_resumable.setToolTip("Checkpoint finished tiles to disk so a canceled or crashed run continues where it stopped")
+        area_output_layout.addWidget(self.checkBox_resumable)
+        area_output_layout.addStretch()
+        self.pushButton_polygonize = QPushButton("Flood Extent Polygons...")
+        self.pushButton_polygonize.setToolTip("Vectorize the area above the decision threshold of a probability raster")
+        area_output_layout.addWidget(self.pushButton_polygonize)
+        self.pushButton_zonal = QPushButton("Zonal Statistics...")
+        self.pushButton_zonal.setToolTip("Flood risk statistics per polygon (ward, municipality, ...) of a probability raster")
+        area_output_layout.addWidget(self.pushButton_zonal)
+        prediction_layout.addLayout(area_output_layout)
+        
         # Prediction results
         self.label_prediction_result = QLabel("Prediction: Not made")
         self.label_prediction_result.setStyleSheet("font-weight: bold;")
@@ -163,7 +276,8 @@ class FloodPredictionPluginV2Dialog(QDialog):
         # Add left panel to splitter
         splitter.addWidget(left_widget)
         
-        # Right panel - Data Table
+        # Right panel - Data Table and Profiling tabs
+        self.tabWidget_right = QTabWidget()
         right_widget = QtWidgets.QWidget()
         right_layout = QVBoxLayout(right_widget)
         
@@ -191,8 +305,59 @@ class FloodPredictionPluginV2Dialog(QDialog):
         data_layout.addWidget(self.tableWidget_data)
         right_layout.addWidget(data_group)
         
+        # Queued point results, one row per point
+        points_group = QGroupBox("Queued Point Predictions")
+        points_layout = QVBoxLayout(points_group)
+        self.tableWidget_points = QTableWidget()
+        self.tableWidget_points.setEditTriggers(QTableWidget.NoEditTriggers)
+        points_layout.addWidget(self.tableWidget_points)
+        right_layout.addWidget(points_group)
+        self.tabWidget_right.addTab(right_widget, "Data")
+        
+        # Profiling tab: time per stage of extraction and prediction
+        profile_widget = QtWidgets.QWidget()
+        profile_layout = QVBoxLayout(profile_widget)
+        
+        profile_buttons_layout = QHBoxLayout()
+        self.pushButton_profile_refresh = QPushButton("Refresh")
+        profile_buttons_layout.addWidget(self.pushButton_profile_refresh)
+        self.pushButton_profile_reset = QPushButton("Reset")
+        profile_buttons_layout.addWidget(self.pushButton_profile_reset)
+        self.pushButton_profile_export = QPushButton("Export JSON...")
+        self.pushButton_profile_export.setToolTip("Save the stage statistics and histograms (and the last cProfile report) as JSON")
+        profile_buttons_layout.addWidget(self.pushButton_profile_export)
+        profile_buttons_layout.addStretch()
+        profile_buttons_layout.addWidget(QLabel("Log level:"))
+        self.comboBox_log_level = QComboBox()
+        self.comboBox_log_level.addItem("Debug", 'debug')
+        self.comboBox_log_level.addItem("Info", 'info')
+        self.comboBox_log_level.addItem("Warning", 'warning')
+        self.comboBox_log_level.addItem("Critical", 'critical')
+        self.comboBox_log_level.setToolTip("Lowest level written to the log panel; debug shows every layer and sample. Recent events are written after an error at any level")
+        profile_buttons_layout.addWidget(self.comboBox_log_level)
+        self.checkBox_cprofile = QCheckBox("cProfile next run")
+        self.checkBox_cprofile.setToolTip("Run the next extraction, prediction, queue or area prediction under cProfile and show the most expensive functions below")
+        profile_buttons_layout.addWidget(self.checkBox_cprofile)
+        profile_layout.addLayout(profile_buttons_layout)
+        
+        self.tableWidget_profile = QTableWidget()
+        self.tableWidget_profile.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tableWidget_profile.setColumnCount(8)
+        self.tableWidget_profile.setHorizontalHeaderLabels(
+            ["Stage", "Count", "Total ms", "Mean ms", "p50 ms", "p95 ms", "Max ms", "Histogram (1 us - 100 s)"])
+        self.tableWidget_profile.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        profile_layout.addWidget(self.tableWidget_profile)
+        
+        self.textEdit_profile = QTextEdit()
+        self.textEdit_profile.setReadOnly(True)
+        self.textEdit_profile.setLineWrapMode(QTextEdit.NoWrap)
+        self.textEdit_profile.setStyleSheet("font-family: monospace;")
+        self.textEdit_profile.setPlaceholderText("Check 'cProfile next run' to capture a function-level profile of one run")
+        profile_layout.addWidget(self.textEdit_profile)
+        self.tabWidget_right.addTab(profile_widget, "Profiling")
+        
         # Add right panel to splitter
-        splitter.addWidget(right_widget)
+        splitter.addWidget(self.tabWidget_right)
         
         # Set splitter proportions
         splitter.setSizes([400, 400])
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ FloodPredictionProvider
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+import os
+
+from qgis.core import QgsProcessingProvider
+from qgis.PyQt.QtGui import QIcon
+
+from .flood_prediction_plugin_v2_algorithms import (
+    BuildFeatureCubeAlgorithm,
+    PredictPointsAlgorithm,
+    PredictRasterAlgorithm,
+)
+
+
+class FloodPredictionProvider(QgsProcessingProvider):
+    """Processing provider with the flood prediction algorithms.
+
+    Registered by the plugin's initProcessing(), so the algorithms are
+    available in the Processing toolbox, the Graphical Modeler and
+    qgis_process without opening the plugin dialog.
+    """
+
+    def loadAlgorithms(self):
+        """Add the algorithms of this provider"""
+        self.addAlgorithm(PredictPointsAlgorithm())
+        self.addAlgorithm(PredictRasterAlgorithm())
+        self.addAlgorithm(BuildFeatureCubeAlgorithm())
+
+    def id(self):
+        """Unique provider id, the prefix of the algorithm ids"""
+        return 'floodprediction'
+
+    def name(self):
+        """Provider name shown in the Processing toolbox"""
+        return 'Flood Prediction'
+
+    def icon(self):
+        return QIcon(os.path.join(os.path.dirname(__file__), 'icon.png'))
+
+    def longName(self):
+        return self.name()
+
+    def supportedOutputRasterLayerExtensions(self):
+        """Rasters are written as GeoTIFF by core.cog"""
+        return ['tif']
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ PredictionLayer
+                                 A QGIS plugin
+ Official Documentation-Based Flood Risk Prediction Plugin
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+"""
+
+from qgis.PyQt.QtCore import QVariant
+
+from qgis.core import (
+    QgsProject,
+    QgsVectorLayer,
+    QgsFeature,
+    QgsField,
+    QgsGeometry,
+    QgsMarkerSymbol,
+    QgsSingleSymbolRenderer,
+    QgsSymbolLayer,
+    QgsProperty,
+    QgsCoordinateTransform
+)
+
+# Marker colour: blue while not predicted, then green (0) to red (1) by probability
+COLOR_EXPRESSION = (
+    "CASE WHEN \"probability\" IS NULL THEN '51,136,255' "
+    "ELSE color_mix_rgb('0,170,0', '220,0,0', \"probability\") END"
+)
+# Marker size grows with probability, like the V1 prediction symbol
+SIZE_EXPRESSION = "6 + 4 * coalesce(\"probability\", 0)"
+
+
+class PredictionLayer:
+    """One persistent memory layer that accumulates predicted points.
+
+    The layer, its fields and its renderer are created once and registered
+    with the project once. Points and predictions are written with single
+    bulk provider calls (addFeatures / changeAttributeValues) and the style
+    is data-defined on the ``probability`` field, so adding or updating
+    thousands of points never rebuilds the renderer or the layer tree.
+    """
+
+    FIELDS = [
+        ('x_coord', QVariant.Double),
+        ('y_coord', QVariant.Double),
+        ('prediction', QVariant.String),
+        ('probability', QVariant.Double),
+    ]
+
+    def __init__(self, name='Flood Predictions'):
+        """Constructor.
+
+        :param name: Layer name shown in the layers panel.
+        :type name: str
+        """
+        self.name = name
+        self.layer = None
+        # The project deletes the C++ layer when the user removes it, so
+        # liveness is checked by id, never through the wrapper
+        self.layer_id = None
+
+    def is_alive(self):
+        """True while the layer is still part of the project"""
+        if self.layer_id is None:
+            return False
+        if QgsProject.instance().mapLayer(self.layer_id) is None:
+            # Removed from the layers panel: the wrapper is no longer usable
+            self.layer = None
+            self.layer_id = None
+            return False
+        return True
+
+    def ensure_layer(self, crs):
+        """Create and register the layer if it does not exist (or was removed).
+
+        :param crs: CRS for a newly created layer.
+        :type crs: QgsCoordinateReferenceSystem
+
+        :returns: The layer.
+        :rtype: QgsVectorLayer
+        """
+        if self.is_alive():
+            return self.layer
+
+        layer = QgsVectorLayer(f'Point?crs={crs.authid()}', self.name, 'memory')
+        provider = layer.dataProvider()
+        provider.addAttributes([QgsField(name, field_type) for name, field_type in self.FIELDS])
+        layer.updateFields()
+
+        symbol = QgsMarkerSymbol.createSimple({
+            'name': 'circle',
+            'color': 'red',
+            'size': '6',
+            'outline_color': 'black',
+            'outline_width': '1'
+        })
+        symbol_layer = symbol.symbolLayer(0)
+        symbol_layer.setDataDefinedProperty(QgsSymbolLayer.PropertyFillColor, QgsProperty.fromExpression(COLOR_EXPRESSION))
+        symbol_layer.setDataDefinedProperty(QgsSymbolLayer.PropertySize, QgsProperty.fromExpression(SIZE_EXPRESSION))
+        layer.setRenderer(QgsSingleSymbolRenderer(symbol))
+
+        QgsProject.instance().addMapLayer(layer)
+        self.layer = layer
+        self.layer_id = layer.id()
+        return layer
+
+    def _to_layer_points(self, points, crs):
+        """Transform points from ``crs`` to the layer CRS if they differ"""
+        layer_crs = self.layer.crs()
+        if crs is None or crs == layer_crs:
+            return list(points)
+        transform = QgsCoordinateTransform(crs, layer_crs, QgsProject.instance())
+        return [transform.transform(point) for point in points]
+
+    def add_points(self, points, crs, predictions=None, probabilities=None):
+        """Add many points with one provider call.
+
+        :param points: Points to add.
+        :type points: list of QgsPointXY
+
+        :param crs: CRS of the points (usually the canvas CRS).
+        :type crs: QgsCoordinateReferenceSystem
+
+        :param predictions: Optional prediction text per point.
+        :type predictions: list
+
+        :param probabilities: Optional flood probability per point.
+        :type probabilities: list
+
+        :returns: Feature ids of the added points, in input order.
+        :rtype: list
+        """
+        self.ensure_layer(crs)
+        layer_points = self._to_layer_points(points, crs)
+
+        features = []
+        for index, point in enumerate(layer_points):
+            feature = QgsFeature(self.layer.fields())
+            feature.setGeometry(QgsGeometry.fromPointXY(point))
+            prediction = predictions[index] if predictions is not None else 'Not predicted'
+            probability = float(probabilities[index]) if probabilities is not None else None
+            feature.setAttributes([point.x(), point.y(), prediction, probability])
+            features.append(feature)
+
+        success, added = self.layer.dataProvider().addFeatures(features)
+        if not success:
+            raise RuntimeError("Failed to add points to the prediction layer")
+
+        self.layer.updateExtents()
+        self.layer.triggerRepaint()
+        return [feature.id() for feature in added]
+
+    def move_point(self, feature_id, point, crs):
+        """Move an existing point (e.g. a not yet predicted selection)"""
+        if not self.is_alive():
+            return False
+        layer_point = self._to_layer_points([point], crs)[0]
+        provider = self.layer.dataProvider()
+        fields = self.layer.fields()
+        provider.changeGeometryValues({feature_id: QgsGeometry.fromPointXY(layer_point)})
+        provider.changeAttributeValues({feature_id: {
+            fields.indexOf('x_coord'): layer_point.x(),
+            fields.indexOf('y_coord'): layer_point.y(),
+        }})
+        self.layer.updateExtents()
+        self.layer.triggerRepaint()
+        return True
+
+    def set_predictions(self, results):
+        """Write predictions for many points with one provider call.
+
+        :param results: Mapping of feature id to (prediction_text, probability).
+        :type results: dict
+        """
+        if not self.is_alive() or not results:
+            return
+        fields = self.layer.fields()
+        prediction_index = fields.indexOf('prediction')
+        probability_index = fields.indexOf('probability')
+        self.layer.dataProvider().changeAttributeValues({
+            feature_id: {prediction_index: text, probability_index: float(probability)}
+            for feature_id, (text, probability) in results.items()
+        })
+        self.layer.triggerRepaint()
+
+    def delete_points(self, feature_ids):
+        """Delete points by feature id"""
+        if self.is_alive() and feature_ids:
+            self.layer.dataProvider().deleteFeatures(list(feature_ids))
+            self.layer.updateExtents()
+            self.layer.triggerRepaint()
+
+    def clear(self):
+        """Remove all points but keep the layer and its style"""
+        if self.is_alive():
+            self.layer.dataProvider().truncate()
+            self.layer.updateExtents()
+            self.layer.triggerRepaint()
+
+    def remove(self):
+        """Remove the layer from the project"""
+        if self.is_alive():
+            QgsProject.instance().removeMapLayer(self.layer_id)
+        self.layer = None
+        self.layer_id = None
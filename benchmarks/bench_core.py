@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Core benchmark
+                                 A QGIS plugin
+ Measures point, batch and area prediction speed of the flood prediction core
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+
+Generates synthetic aligned feature rasters (tiled float32 GeoTIFFs) and
+synthetic tree and linear models, then measures the Plugin_V2 core:
+
+    load    model load time from pickle and joblib files
+    click   single-click extraction + prediction (fresh sampler per click)
+    points  batch points: sampling + one model call, points/sec
+    area    whole-raster prediction, pixels/sec; fails if more tiles were
+            in flight than core.pipeline.tiles_in_flight() allows
+    startup plugin import + initGui (needs the qgis package, see
+            bench_startup.py)
+
+Every case runs in a fresh interpreter, which also gives its peak RSS.
+Generated data is cached in --workdir and reused. Results are written as
+JSON; --baseline compares them with an earlier result file and exits with
+status 1 if a metric got worse by more than --tolerance.
+
+    python benchmarks/bench_core.py --profile quick --json results.json
+    python benchmarks/bench_core.py --profile full --baseline baseline.json
+    python benchmarks/bench_core.py --sizes 2000 --features 10 --modes points area
+
+Needs NumPy, GDAL (osgeo) and scikit-learn; joblib for the joblib cases.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+MODES = ['load', 'click', 'points', 'area', 'startup']
+MODELS = ['forest', 'linear']
+
+# Raster edges (cells) and feature counts per profile
+PROFILES = {
+    'quick': {'sizes': [1000], 'features': [5]},
+    'standard': {'sizes': [1000, 5000], 'features': [5, 15]},
+    'full': {'sizes': [1000, 5000, 20000], 'features': [5, 30]},
+}
+
+CLICKS = 200
+BATCH_POINTS = 100000
+TRAINING_SAMPLES = 20000
+BLOCK_SIZE = 512
+SEED = 20261019
+
+# Relative change beyond which a metric counts as a regression
+DEFAULT_TOLERANCE = 0.15
+
+
+# Synthetic data ------------------------------------------------------------
+
+def feature_values(index, cols, rows, size, rng):
+    """Smooth field with noise for feature ``index`` at pixel (cols, rows)"""
+    import numpy as np
+    frequency = 2 * np.pi * (index + 1) / size
+    phase = 0.7 * index
+    noise = rng.standard_normal(np.broadcast(cols, rows).shape) * 0.1
+    return (np.sin(cols * frequency + phase) + np.cos(rows * frequency * 0.5 - phase) + noise).astype(np.float32)
+
+
+def make_rasters(workdir, size, n_features):
+    """Tiled float32 GeoTIFFs on one grid; cached by size and feature count"""
+    import numpy as np
+    from osgeo import gdal, osr
+
+    directory = os.path.join(workdir, f"rasters_{size}_{n_features}")
+    paths = [os.path.join(directory, f"feature_{index:02d}.tif") for index in range(n_features)]
+    if all(os.path.exists(path) for path in paths):
+        return paths
+    os.makedirs(directory, exist_ok=True)
+
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(32643)
+    driver = gdal.GetDriverByName('GTiff')
+    rng = np.random.default_rng(SEED)
+    for index, path in enumerate(paths):
+        dataset = driver.Create(path + '.tmp', size, size, 1, gdal.GDT_Float32,
+                                ['TILED=YES', f'BLOCKXSIZE={BLOCK_SIZE}', f'BLOCKYSIZE={BLOCK_SIZE}', 'BIGTIFF=IF_SAFER'])
+        dataset.SetGeoTransform((500000.0, 10.0, 0.0, 2500000.0, 0.0, -10.0))
+        dataset.SetProjection(srs.ExportToWkt())
+        band = dataset.GetRasterBand(1)
+        band.SetNoDataValue(-9999.0)
+        cols = np.arange(size)[np.newaxis, :]
+        for yoff in range(0, size, BLOCK_SIZE):
+            rows = np.arange(yoff, min(yoff + BLOCK_SIZE, size))[:, np.newaxis]
+            band.WriteArray(feature_values(index, cols, rows, size, rng), 0, yoff)
+        dataset = None
+        os.replace(path + '.tmp', path)
+    return paths
+
+
+def make_models(workdir, n_features):
+    """Forest and linear models trained on the synthetic features, as .pkl and .joblib"""
+    import numpy as np
+
+    paths = {name: {fmt: os.path.join(workdir, f"model_{name}_{n_features}.{fmt}") for fmt in ('pkl', 'joblib')}
+             for name in MODELS}
+    if all(os.path.exists(path) for formats in paths.values() for path in formats.values()):
+        return paths
+
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(SEED)
+    size = 1000
+    cols = rng.integers(0, size, TRAINING_SAMPLES)
+    rows = rng.integers(0, size, TRAINING_SAMPLES)
+    features = np.column_stack([feature_values(index, cols, rows, size, rng) for index in range(n_features)])
+    weights = rng.standard_normal(n_features)
+    labels = (features @ weights > 0).astype(int)
+
+    models = {
+        'forest': RandomForestClassifier(n_estimators=100, max_depth=12, random_state=SEED),
+        'linear': LogisticRegression(max_iter=1000),
+    }
+    for name, model in models.items():
+        model.fit(features, labels)
+        with open(paths[name]['pkl'], 'wb') as f:
+            pickle.dump(model, f)
+        try:
+            import joblib
+            joblib.dump(model, paths[name]['joblib'])
+        except ImportError:
+            paths[name].pop('joblib')
+    return paths
+
+
+def random_points(paths, count, rng):
+    """Map coordinates of ``count`` random points inside the rasters"""
+    from Plugin_V2.core.raster import RasterGrid, open_raster
+    grid = RasterGrid.from_dataset(open_raster(paths[0]))
+    cols = rng.uniform(0, grid.width, count)
+    rows = rng.uniform(0, grid.height, count)
+    return grid.to_map(cols, rows)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, None where unknown"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+# Cases (run in a child interpreter) ----------------------------------------
+
+def case_load(spec):
+    from Plugin_V2.core.models import load_model_file
+
+    # The first load includes importing sklearn, the second is unpickling only
+    start = time.perf_counter()
+    load_model_file(spec['model_path'])
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    load_model_file(spec['model_path'])
+    return {'seconds': cold, 'warm_seconds': time.perf_counter() - start}
+
+
+def case_click(spec):
+    import numpy as np
+    from Plugin_V2.core.ensemble import predict_points
+    from Plugin_V2.core.models import load_model_file
+    from Plugin_V2.core.sampling import RasterSampler
+
+    model = load_model_file(spec['model_path'])
+    x, y = random_points(spec['rasters'], CLICKS, np.random.default_rng(SEED))
+    latencies = []
+    for point_x, point_y in zip(x, y):
+        start = time.perf_counter()
+        # A click opens the layers, reads one region per layer and predicts one row
+        samplers = [RasterSampler(path) for path in spec['rasters']]
+        features = np.column_stack([sampler.sample([point_x], [point_y]) for sampler in samplers])
+        predict_points(model, features)
+        for sampler in samplers:
+            sampler.close()
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies)
+    return {
+        'clicks_per_second': len(latencies) / latencies.sum(),
+        'latency_ms_p50': float(np.percentile(latencies, 50) * 1000),
+        'latency_ms_p95': float(np.percentile(latencies, 95) * 1000),
+    }
+
+
+def case_points(spec):
+    import numpy as np
+    from Plugin_V2.core.ensemble import predict_points
+    from Plugin_V2.core.models import load_model_file
+    from Plugin_V2.core.sampling import RasterSampler
+
+    model = load_model_file(spec['model_path'])
+    x, y = random_points(spec['rasters'], BATCH_POINTS, np.random.default_rng(SEED))
+    start = time.perf_counter()
+    samplers = [RasterSampler(path) for path in spec['rasters']]
+    features = np.column_stack([sampler.sample(x, y) for sampler in samplers])
+    sampled = time.perf_counter()
+    predict_points(model, features)
+    seconds = time.perf_counter() - start
+    return {
+        'points_per_second': BATCH_POINTS / seconds,
+        'sampling_seconds': sampled - start,
+        'seconds': seconds,
+    }
+
+
+def case_area(spec):
+    from Plugin_V2.core.area import predict_area
+    from Plugin_V2.core.models import load_model_file
+    from Plugin_V2.core.pipeline import DEFAULT_DEPTH, tiles_in_flight
+    from Plugin_V2.core.raster import FeatureStack
+
+    model = load_model_file(spec['model_path'])
+    stack = FeatureStack(spec['rasters'])
+    output = os.path.join(spec['workdir'], f"probability_{os.getpid()}.tif")
+    try:
+        summary = predict_area(model, stack, output, uncertainty=False)
+    finally:
+        stack.close()
+        if os.path.exists(output):
+            os.remove(output)
+    limit = tiles_in_flight(DEFAULT_DEPTH)
+    if summary['tiles_in_flight'] > limit:
+        raise RuntimeError(f"{summary['tiles_in_flight']} tiles were in flight, the pipeline allows {limit}")
+    pixels = stack.grid.width * stack.grid.height
+    return {
+        'pixels_per_second': pixels / summary['seconds'],
+        'seconds': summary['seconds'],
+        'tile_size': summary['tile_size'],
+        'tiles_in_flight': summary['tiles_in_flight'],
+    }
+
+
+CASES = {'load': case_load, 'click': case_click, 'points': case_points, 'area': case_area}
+
+
+def run_child(spec):
+    """Run one case in a fresh interpreter; returns its metrics"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', json.dumps(spec)],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def child_main(spec_json):
+    spec = json.loads(spec_json)
+    metrics = CASES[spec['mode']](spec)
+    metrics['peak_rss_mb'] = peak_rss_mb()
+    print(json.dumps(metrics))
+    return 0
+
+
+# Baseline comparison -------------------------------------------------------
+
+def higher_is_better(metric):
+    return metric.endswith('_per_second')
+
+
+def compare(results, baseline, tolerance):
+    """Regressions of ``results`` against ``baseline``.
+
+    Throughput metrics (``*_per_second``) regress when they drop by more
+    than ``tolerance``; times, latencies and memory when they grow by more.
+
+    :returns: List of (case, metric, baseline value, new value, change).
+    :rtype: list
+    """
+    previous = {entry['case']: entry['metrics'] for entry in baseline.get('results', [])}
+    regressions = []
+    for entry in results:
+        old_metrics = previous.get(entry['case'])
+        if not old_metrics:
+            continue
+        for metric, value in entry['metrics'].items():
+            old = old_metrics.get(metric)
+            if metric in ('tile_size', 'tiles_in_flight') or not isinstance(value, (int, float)) or not old:
+                continue
+            change = (value - old) / old
+            worse = -change if higher_is_better(metric) else change
+            if worse > tolerance:
+                regressions.append((entry['case'], metric, old, value, change))
+    return regressions
+
+
+# Driver --------------------------------------------------------------------
+
+def environment():
+    import numpy as np
+    info = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+    }
+    try:
+        from osgeo import gdal
+        info['gdal'] = gdal.__version__
+    except ImportError:
+        pass
+    try:
+        import sklearn
+        info['sklearn'] = sklearn.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def plan(args):
+    """(case name, child spec) for every selected combination"""
+    cases = []
+    for n_features in args.features:
+        models = make_models(args.workdir, n_features)
+        for size in args.sizes:
+            rasters = make_rasters(args.workdir, size, n_features) if set(args.modes) - {'load', 'startup'} else []
+            for model_name in args.models:
+                for mode in args.modes:
+                    if mode == 'startup':
+                        continue
+                    formats = models[model_name] if mode == 'load' else {'pkl': models[model_name]['pkl']}
+                    if mode == 'load' and size != args.sizes[0]:
+                        # Load time does not depend on the raster size
+                        continue
+                    for fmt, model_path in formats.items():
+                        name = f"{mode}/{model_name}/{n_features}f" if mode == 'load' else \
+                            f"{mode}/{model_name}/{size}px/{n_features}f"
+                        if mode == 'load':
+                            name += f"/{fmt}"
+                        cases.append((name, {'mode': mode, 'model_path': model_path, 'rasters': rasters,
+                                             'workdir': args.workdir}))
+    return cases
+
+
+def startup_result(plugin):
+    """Startup timings from bench_startup, or None without the qgis package"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import bench_startup
+    try:
+        run = bench_startup.run_once(plugin)
+    except (subprocess.CalledProcessError, ValueError) as e:
+        print(f"startup: skipped ({e.__class__.__name__}; is the qgis package importable?)")
+        return None
+    return {'seconds': run['total_s'], 'import_seconds': run['import_s'], 'init_gui_seconds': run['init_gui_s']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Flood prediction core benchmark')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick',
+                        help='Preset raster sizes and feature counts')
+    parser.add_argument('--sizes', type=int, nargs='+', help='Raster edges in cells (overrides the profile)')
+    parser.add_argument('--features', type=int, nargs='+', help='Feature counts (overrides the profile)')
+    parser.add_argument('--models', nargs='+', choices=MODELS, default=MODELS)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--workdir', default=os.path.join(tempfile.gettempdir(), 'flood_benchmark'),
+                        help='Directory for the generated rasters and models (reused between runs)')
+    parser.add_argument('--json', dest='json_path', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Earlier results JSON to compare with')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Relative change that counts as a regression')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child_main(args.child)
+
+    args.sizes = args.sizes or PROFILES[args.profile]['sizes']
+    args.features = args.features or PROFILES[args.profile]['features']
+    os.makedirs(args.workdir, exist_ok=True)
+
+    results = []
+    if 'startup' in args.modes:
+        metrics = startup_result('Plugin_V2')
+        if metrics:
+            results.append({'case': 'startup/Plugin_V2', 'metrics': metrics})
+
+    for name, spec in plan(args):
+        metrics = run_child(spec)
+        results.append({'case': name, 'metrics': metrics})
+        shown = ", ".join(f"{key}={value:.4g}" for key, value in metrics.items() if isinstance(value, (int, float)))
+        print(f"{name:36s} {shown}")
+
+    report = {'environment': environment(), 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for case, metric, old, new, change in regressions:
+            print(f"REGRESSION {case} {metric}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
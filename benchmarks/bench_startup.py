@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+/***************************************************************************
+ Startup benchmark
+                                 A QGIS plugin
+ Measures plugin import and initGui time for the flood prediction plugins
+                             -------------------
+        begin                : 2026-10-19
+        copyright            : (C) 2026 by Krushna Parmar
+        email                : contact@krushnaparmar.dev
+ ***************************************************************************/
+
+/***************************************************************************
+ *                                                                         *
+ *   This program is free software; you can redistribute it and/or modify  *
+ *   it under the terms of the GNU General Public License as published by  *
+ *   the Free Software Foundation; either version 2 of the License, or     *
+ *   (at your option) any later version.                                   *
+ *                                                                         *
+ ***************************************************************************/
+
+Every run happens in a fresh interpreter so that module caches from a
+previous run cannot hide import cost. Run it with the Python interpreter
+that ships with QGIS (the qgis package must be importable):
+
+    python benchmarks/bench_startup.py --plugin Plugin_V2 --runs 10
+    python benchmarks/bench_startup.py --plugin Plugin_V1 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must NOT be loaded just by starting QGIS with the plugin
+HEAVY_MODULES = ['numpy', 'pandas', 'lightgbm', 'xgboost', 'sklearn']
+
+# Executed in a child interpreter; prints one JSON line with the timings
+CHILD_SCRIPT = r'''
+import json
+import sys
+import time
+
+from qgis.core import QgsApplication
+from qgis.PyQt.QtCore import QCoreApplication, QSettings
+
+QCoreApplication.setOrganizationName('FloodPredictionStartupBenchmark')
+app = QgsApplication([], False)
+app.initQgis()
+QSettings().setValue('locale/userLocale', 'en_US')
+
+
+class _Canvas:
+    def mapSettings(self):
+        return None
+
+
+class _Iface:
+    """Minimal stand-in for QgisInterface, enough for initGui/unload."""
+
+    def mainWindow(self):
+        return None
+
+    def mapCanvas(self):
+        return _Canvas()
+
+    def addToolBarIcon(self, action):
+        pass
+
+    def removeToolBarIcon(self, action):
+        pass
+
+    def addPluginToMenu(self, menu, action):
+        pass
+
+    def removePluginMenu(self, menu, action):
+        pass
+
+
+heavy_before = set(m for m in HEAVY if m in sys.modules)
+
+t0 = time.perf_counter()
+package = __import__(PLUGIN)
+t1 = time.perf_counter()
+plugin = package.classFactory(_Iface())
+t2 = time.perf_counter()
+plugin.initGui()
+t3 = time.perf_counter()
+plugin.unload()
+
+print(json.dumps({
+    'import_s': t1 - t0,
+    'class_factory_s': t2 - t1,
+    'init_gui_s': t3 - t2,
+    'total_s': t3 - t0,
+    'heavy_modules_loaded': sorted(set(m for m in HEAVY if m in sys.modules) - heavy_before),
+}))
+app.exitQgis()
+'''
+
+
+def run_once(plugin):
+    """Run one cold-start measurement in a child interpreter.
+
+    :param plugin: Plugin package directory name, e.g. 'Plugin_V2'.
+    :type plugin: str
+
+    :returns: Timings reported by the child process.
+    :rtype: dict
+    """
+    script = f"PLUGIN = {plugin!r}\nHEAVY = {HEAVY_MODULES!r}\n" + CHILD_SCRIPT
+    env = dict(os.environ)
+    env['PYTHONPATH'] = REPO_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    output = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=REPO_ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    # The last line is ours, anything before it is QGIS start-up noise
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Plugin startup benchmark')
+    parser.add_argument('--plugin', default='Plugin_V2', help='Plugin package to benchmark (Plugin_V1 or Plugin_V2)')
+    parser.add_argument('--runs', type=int, default=5, help='Number of cold starts to measure')
+    parser.add_argument('--json', dest='json_path', help='Write raw results to this JSON file')
+    args = parser.parse_args()
+
+    runs = [run_once(args.plugin) for _ in range(args.runs)]
+
+    summary = {'plugin': args.plugin, 'runs': runs}
+    for key in ('import_s', 'class_factory_s', 'init_gui_s', 'total_s'):
+        values = [r[key] for r in runs]
+        summary[key] = {'median': statistics.median(values), 'min': min(values), 'max': max(values)}
+        print(f"{key:16s} median={summary[key]['median'] * 1000:8.2f} ms  "
+              f"min={summary[key]['min'] * 1000:8.2f} ms  max={summary[key]['max'] * 1000:8.2f} ms")
+
+    loaded = sorted(set(m for r in runs for m in r['heavy_modules_loaded']))
+    summary['heavy_modules_loaded'] = loaded
+    if loaded:
+        print(f"WARNING: heavy modules imported at startup: {', '.join(loaded)}")
+    else:
+        print("No heavy ML libraries imported at startup")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    return 1 if loaded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())